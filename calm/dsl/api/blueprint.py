@@ -1,9 +1,20 @@
 from .resource import ResourceAPI
 from .connection import REQUEST
-from .util import strip_secrets, patch_secrets
+from .util import (
+    strip_secrets,
+    patch_secrets,
+    log_request_count,
+    get_resources_hash,
+    get_client_attrs_hash,
+    set_client_attrs_hash,
+    mark_upload_skipped,
+)
 from calm.dsl.config import get_config
+from calm.dsl.log import get_logging_handle
 from .project import ProjectAPI
 
+LOG = get_logging_handle(__name__)
+
 
 class BlueprintAPI(ResourceAPI):
     def __init__(self, connection):
@@ -28,6 +39,7 @@ class BlueprintAPI(ResourceAPI):
             request_json=payload,
             method=REQUEST.METHOD.POST,
             timeout=(5, 300),
+            compress=True,
         )
 
     def launch(self, uuid, payload):
@@ -84,34 +96,17 @@ class BlueprintAPI(ResourceAPI):
 
         return bp_payload
 
+    @log_request_count("Blueprint upload")
     def upload_with_secrets(
-        self, bp_name, bp_desc, bp_resources, categories=None, force_create=False
+        self,
+        bp_name,
+        bp_desc,
+        bp_resources,
+        categories=None,
+        force_create=False,
+        force_upload=False,
     ):
 
-        # check if bp with the given name already exists
-        params = {"filter": "name=={};state!=DELETED".format(bp_name)}
-        res, err = self.list(params=params)
-        if err:
-            return None, err
-
-        response = res.json()
-        entities = response.get("entities", None)
-        if entities:
-            if len(entities) > 0:
-                if not force_create:
-                    err_msg = "Blueprint {} already exists. Use --force to first delete existing blueprint before create.".format(
-                        bp_name
-                    )
-                    # ToDo: Add command to edit Blueprints
-                    err = {"error": err_msg, "code": -1}
-                    return None, err
-
-                # --force option used in create. Delete existing blueprint with same name.
-                bp_uuid = entities[0]["metadata"]["uuid"]
-                _, err = self.delete(bp_uuid)
-                if err:
-                    return None, err
-
         secret_map = {}
         secret_variables = []
         object_lists = [
@@ -163,49 +158,92 @@ class BlueprintAPI(ResourceAPI):
             if (obj["type"] == "VMWARE_VM") and (obj["os_type"] == "Windows"):
                 strip_vmware_secrets(["substrate_definition_list", obj_index], obj)
 
-        upload_payload = self._make_blueprint_payload(bp_name, bp_desc, bp_resources)
-
         config = get_config()
         project_name = config["PROJECT"]["name"]
-        projectObj = ProjectAPI(self.connection)
 
-        # Fetch project details
-        params = {"filter": "name=={}".format(project_name)}
-        res, err = projectObj.list(params=params)
+        # Populating the categories at runtime
+        config_categories = dict(config.items("CATEGORIES"))
+        if categories:
+            config_categories.update(categories)
+
+        # Hash of payload without secrets, to skip upload of unchanged blueprint
+        payload_hash = get_resources_hash(
+            bp_resources,
+            name=bp_name,
+            description=bp_desc or "",
+            categories=config_categories,
+            project=project_name,
+        )
+
+        # check if bp with the given name already exists
+        params = {"filter": "name=={};state!=DELETED".format(bp_name)}
+        res, err = self.list(params=params)
         if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+            return None, err
 
         response = res.json()
         entities = response.get("entities", None)
-        if not entities:
-            raise Exception("No project with name {} exists".format(project_name))
+        if entities:
+            if len(entities) > 0:
+                if not force_create:
+                    err_msg = "Blueprint {} already exists. Use --force to first delete existing blueprint before create.".format(
+                        bp_name
+                    )
+                    # ToDo: Add command to edit Blueprints
+                    err = {"error": err_msg, "code": -1}
+                    return None, err
+
+                bp_uuid = entities[0]["metadata"]["uuid"]
+
+                # Existing blueprint is kept, if it is same as the given one
+                if not force_upload:
+                    res, err = self.read(bp_uuid)
+                    if err:
+                        return None, err
+
+                    bp = res.json()
+                    if bp["status"].get("state") == "ACTIVE" and (
+                        get_client_attrs_hash(bp["spec"]["resources"]) == payload_hash
+                    ):
+                        LOG.debug("Blueprint {} is unchanged".format(bp_name))
+                        return mark_upload_skipped(res), None
 
-        project_id = entities[0]["metadata"]["uuid"]
+                # --force option used in create. Delete existing blueprint with same name.
+                _, err = self.delete(bp_uuid)
+                if err:
+                    return None, err
+
+        # Update is needed only to add secrets and categories
+        needs_update = bool(secret_map or secret_variables or config_categories)
+
+        # Hash is set in the last request, so that a partially uploaded
+        # blueprint is not considered unchanged
+        if not needs_update:
+            set_client_attrs_hash(bp_resources, payload_hash)
+
+        upload_payload = self._make_blueprint_payload(bp_name, bp_desc, bp_resources)
 
         # Setting project reference
-        upload_payload["metadata"]["project_reference"] = {
-            "kind": "project",
-            "uuid": project_id,
-            "name": project_name,
-        }
+        projectObj = ProjectAPI(self.connection)
+        project_reference = projectObj.get_project_reference(project_name)
+        upload_payload["metadata"]["project_reference"] = project_reference
 
         res, err = self.upload(upload_payload)
 
         if err:
             return res, err
 
+        if not needs_update:
+            return res, err
+
         # Add secrets and update bp
         bp = res.json()
         del bp["status"]
 
         patch_secrets(bp["spec"]["resources"], secret_map, secret_variables)
+        set_client_attrs_hash(bp["spec"]["resources"], payload_hash)
 
         # TODO - insert categories during update as /import_json fails if categories are given!
-        # Populating the categories at runtime
-        config_categories = dict(config.items("CATEGORIES"))
-        if categories:
-            config_categories.update(categories)
-
         bp["metadata"]["categories"] = config_categories
 
         # Update blueprint
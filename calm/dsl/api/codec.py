@@ -0,0 +1,69 @@
+"""
+codec: JSON encoding/decoding of api payloads
+
+Uses orjson if installed, else falls back to stdlib json.
+"""
+
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class JSONCodec:
+    """Stdlib json codec"""
+
+    name = "json"
+
+    def dumps(self, obj):
+        """returns utf-8 encoded json of obj"""
+        return json.dumps(obj).encode("utf-8")
+
+    def loads(self, data):
+        """returns object decoded from json str/bytes"""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """orjson codec, falling back to stdlib for objects orjson can not handle"""
+
+    name = "orjson"
+
+    def dumps(self, obj):
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # ex: integers larger than 64 bit
+            return super().dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
+
+
+_CODEC = OrjsonCodec() if orjson else JSONCodec()
+
+
+def get_codec():
+    """returns the codec used for api payloads"""
+    return _CODEC
+
+
+def set_codec(codec):
+    """sets the codec used for api payloads, returns the previous one"""
+
+    global _CODEC
+    previous_codec = _CODEC
+    _CODEC = codec
+    return previous_codec
+
+
+def json_dumps(obj):
+    """returns utf-8 encoded json of obj using the current codec"""
+    return _CODEC.dumps(obj)
+
+
+def json_loads(data):
+    """returns object decoded from json using the current codec"""
+    return _CODEC.loads(data)
@@ -12,20 +12,31 @@ client = get_connection(pc_ip, pc_port,
 """
 
 import traceback
+import gzip
 import json
+import random
+import threading
 import urllib3
-import sys
+from contextlib import contextmanager
+from urllib.parse import urlparse
 
-from requests import Session as NonRetrySession
+from requests import Session, Response
 from requests_toolbelt import MultipartEncoder
 from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectTimeout
+from urllib3.exceptions import MaxRetryError, ResponseError
+from urllib3.util.retry import Retry
 
 from calm.dsl.log import get_logging_handle
+from calm.dsl.tools.compile_deps import record_uncacheable
+from .codec import json_dumps, json_loads
 
 urllib3.disable_warnings()
 LOG = get_logging_handle(__name__)
 
+# Request bodies smaller than this (bytes) are not worth compressing
+GZIP_MIN_BODY_SIZE = 16 * 1024
+
 
 class REQUEST:
     """Request related constants"""
@@ -58,6 +69,129 @@ class REQUEST:
         PUT = "put"
 
 
+class ServerConnectionError(Exception):
+    """Raised when connection to the server could not be established"""
+
+    def __init__(self, message, host=None, port=None):
+        super().__init__(message)
+        self.host = host
+        self.port = port
+
+
+class ServerConnectTimeout(ServerConnectionError):
+    """Raised when connection to the server timed out"""
+
+
+class JitterRetry(Retry):
+    """Retry adding random jitter to the exponential backoff, so that
+    concurrent clients do not retry in lockstep"""
+
+    def __init__(self, jitter=0.0, **kwargs):
+        super().__init__(**kwargs)
+        self.jitter = jitter
+
+    def new(self, **kwargs):
+        kwargs.setdefault("jitter", self.jitter)
+        return super().new(**kwargs)
+
+    def get_backoff_time(self):
+        backoff_time = super().get_backoff_time()
+        if backoff_time <= 0:
+            return backoff_time
+        return backoff_time + random.uniform(0, self.jitter)
+
+    @staticmethod
+    def is_post_retryable(url, response):
+        """POST is retried only for list calls, as others (launch, run, upload
+        etc.) may have been processed by the server even on a 502/503. Any
+        POST is retried on 429 having Retry-After, as it is rejected upfront"""
+
+        if urlparse(url or "").path.endswith("/list"):
+            return True
+        return response.status == 429 and bool(response.headers.get("Retry-After"))
+
+    def is_retry(self, method, status_code, has_retry_after=False):
+        # POST is checked further using url on increment
+        if (
+            self.total
+            and method
+            and method.upper() == "POST"
+            and status_code in (self.status_forcelist or ())
+        ):
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+    def increment(
+        self,
+        method=None,
+        url=None,
+        response=None,
+        error=None,
+        _pool=None,
+        _stacktrace=None,
+    ):
+        if (
+            error is None
+            and response is not None
+            and method
+            and method.upper() == "POST"
+            and not self.is_post_retryable(url, response)
+        ):
+            # Response is returned as is, as raise_on_status is not set
+            raise MaxRetryError(_pool, url, ResponseError("POST is not retryable"))
+
+        return super().increment(
+            method=method,
+            url=url,
+            response=response,
+            error=error,
+            _pool=_pool,
+            _stacktrace=_stacktrace,
+        )
+
+
+def build_retry(retries, backoff_factor, backoff_jitter, status_codes):
+    """returns retry config for the transport. Idempotent methods are retried
+    on connection errors also. Status codes are retried for idempotent methods
+    and list calls, look at JitterRetry.is_post_retryable for other POSTs"""
+
+    # urllib3 < 1.26 names allowed methods as method whitelist
+    if hasattr(Retry, "DEFAULT_ALLOWED_METHODS"):
+        methods_kwarg = "allowed_methods"
+        allowed_methods = Retry.DEFAULT_ALLOWED_METHODS
+    else:
+        methods_kwarg = "method_whitelist"
+        allowed_methods = Retry.DEFAULT_METHOD_WHITELIST
+
+    return JitterRetry(
+        total=int(retries),
+        backoff_factor=float(backoff_factor),
+        jitter=float(backoff_jitter),
+        status_forcelist=frozenset(int(code) for code in status_codes),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+        **{methods_kwarg: allowed_methods}
+    )
+
+
+class CodecResponse(Response):
+    """Response decoding json body using the api codec"""
+
+    def json(self, **kwargs):
+        if kwargs or not self.content:
+            return super().json(**kwargs)
+        return json_loads(self.content)
+
+
+class CodecHTTPAdapter(HTTPAdapter):
+    """HTTP adapter building responses that decode json using the api codec"""
+
+    def build_response(self, req, resp):
+        response = super().build_response(req, resp)
+        response.__class__ = CodecResponse
+        return response
+
+
 def build_url(host, port, endpoint="", scheme=REQUEST.SCHEME.HTTPS):
     """Build url.
 
@@ -91,6 +225,11 @@ class Connection:
         response_processor=None,
         session_headers=None,
         retries_enabled=False,
+        retries=3,
+        backoff_factor=0.5,
+        backoff_jitter=0.5,
+        retry_status_codes=(429, 502, 503),
+        gzip_uploads=False,
         **kwargs
     ):
         """Generic client to connect to server.
@@ -110,6 +249,11 @@ class Connection:
             auth_type (str): auth type that needs to be used by the client
             auth (tuple): authentication
             retries_enabled (bool): Flag to perform retries (default: false)
+            retries (int): Maximum number of retries of a request
+            backoff_factor (float): Exponential backoff factor between retries
+            backoff_jitter (float): Maximum random jitter added to backoff
+            retry_status_codes (list): Response status codes to be retried
+            gzip_uploads (bool): Flag to gzip large upload request bodies
         Returns:
         Raises:
         """
@@ -126,6 +270,45 @@ class Connection:
         self.auth_type = auth_type
         self.response_processor = response_processor
         self.retries_enabled = retries_enabled
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_jitter = backoff_jitter
+        self.retry_status_codes = retry_status_codes
+        self.gzip_uploads = gzip_uploads
+        # Number of requests made using this connection
+        self.request_count = 0
+        # Bound on requests made concurrently, look at limit_requests()
+        self._max_requests = None
+        self._request_limit = None
+
+    @property
+    def pool_maxsize(self):
+        """maximum number of connections that can be used concurrently"""
+        return int(self._pool_maxsize)
+
+    @property
+    def max_concurrent_requests(self):
+        """maximum number of requests that are made concurrently"""
+        if self._max_requests:
+            return min(self._max_requests, self.pool_maxsize)
+        return self.pool_maxsize
+
+    @contextmanager
+    def limit_requests(self, max_requests):
+        """
+        Bounds the requests made concurrently using this connection, by all
+        threads, to max_requests within the context.
+
+        Args:
+            max_requests (int): Maximum number of concurrent requests
+        """
+        self._max_requests = max_requests
+        self._request_limit = threading.BoundedSemaphore(max_requests)
+        try:
+            yield
+        finally:
+            self._max_requests = None
+            self._request_limit = None
 
     def connect(self):
         """Connect to api server, create http session pool.
@@ -136,19 +319,27 @@ class Connection:
         Raises:
         """
 
-        # TODO: Add retries
-        # if self.retries_enabled:
-        #     self.session = RetrySession()
-        # else:
-        self.session = NonRetrySession()
+        self.session = Session()
         if self.auth and self.auth_type == REQUEST.AUTH_TYPE.BASIC:
             self.session.auth = self.auth
-        self.session.headers.update({"Content-Type": "application/json"})
+        self.session.headers.update(
+            {"Content-Type": "application/json", "Accept-Encoding": "gzip, deflate"}
+        )
 
-        http_adapter = HTTPAdapter(
+        max_retries = 0
+        if self.retries_enabled:
+            max_retries = build_retry(
+                self.retries,
+                self.backoff_factor,
+                self.backoff_jitter,
+                self.retry_status_codes,
+            )
+
+        http_adapter = CodecHTTPAdapter(
             pool_block=bool(self._pool_block),
             pool_connections=int(self._pool_connections),
             pool_maxsize=int(self._pool_maxsize),
+            max_retries=max_retries,
         )
         self.session.mount("http://", http_adapter)
         self.session.mount("https://", http_adapter)
@@ -167,6 +358,15 @@ class Connection:
         """
         self.session.close()
 
+    def _encode_body(self, request_json, headers, compress=False):
+        """returns the encoded request body along with its headers"""
+
+        data = json_dumps(request_json)
+        if compress and self.gzip_uploads and len(data) >= GZIP_MIN_BODY_SIZE:
+            data = gzip.compress(data)
+            headers = dict(headers, **{"Content-Encoding": "gzip"})
+        return data, headers
+
     def _call(
         self,
         endpoint,
@@ -180,6 +380,7 @@ class Connection:
         timeout=(5, 30),  # (connection timeout, read timeout)
         ignore_error=False,
         warning_msg="",
+        compress=False,
     ):
         """Private method for making http request to calm
 
@@ -189,25 +390,37 @@ class Connection:
             cookies (dict): cookies that need to be forwarded.
             request_json (dict): request data
             request_params (dict): request params
+            compress (bool): gzip the request body if it is large and
+                             gzip uploads are enabled
         Returns:
             (tuple (requests.Response, dict)): Response
+        Raises:
+            ServerConnectTimeout: If connection to server times out
         """
         if request_params is None:
             request_params = {}
 
         request_json = request_json or {}
+        # Compiled output depending on server responses can not be cached
+        record_uncacheable("server call to {}".format(endpoint))
+        self.request_count += 1
+        # Lazy args, so that body is formatted only if debug logs are enabled
         LOG.debug(
-            """Server Request- '{method}' at '{endpoint}' with body:
-            '{body}'""".format(
-                method=method, endpoint=endpoint, body=request_json
-            )
+            """Server Request- '%s' at '%s' with body:
+            '%s'""",
+            method,
+            endpoint,
+            request_json,
         )
         res = None
         err = None
+        request_limit = self._request_limit
+        if request_limit is not None:
+            request_limit.acquire()
         try:
             res = None
             url = build_url(self.host, self.port, endpoint=endpoint, scheme=self.scheme)
-            LOG.debug("URL is: {}".format(url))
+            LOG.debug("URL is: %s", url)
             base_headers = self.session.headers
             if headers:
                 base_headers.update(headers)
@@ -216,30 +429,39 @@ class Connection:
                 if files is not None:
                     request_json.update(files)
                     m = MultipartEncoder(fields=request_json)
+                    # Streamed body cannot be rewound, so it is read upfront
+                    # to be sent again on retries
+                    data = m.to_string() if self.retries_enabled else m
                     res = self.session.post(
                         url,
-                        data=m,
+                        data=data,
                         verify=verify,
                         headers={"Content-Type": m.content_type},
                         timeout=timeout,
                     )
                 else:
+                    data, data_headers = self._encode_body(
+                        request_json, base_headers, compress
+                    )
                     res = self.session.post(
                         url,
                         params=request_params,
-                        data=json.dumps(request_json),
+                        data=data,
                         verify=verify,
-                        headers=base_headers,
+                        headers=data_headers,
                         cookies=cookies,
                         timeout=timeout,
                     )
             elif method == REQUEST.METHOD.PUT:
+                data, data_headers = self._encode_body(
+                    request_json, base_headers, compress
+                )
                 res = self.session.put(
                     url,
                     params=request_params,
-                    data=json.dumps(request_json),
+                    data=data,
                     verify=verify,
-                    headers=base_headers,
+                    headers=data_headers,
                     cookies=cookies,
                     timeout=timeout,
                 )
@@ -256,7 +478,7 @@ class Connection:
                 res = self.session.delete(
                     url,
                     params=request_params,
-                    data=json.dumps(request_json),
+                    data=json_dumps(request_json),
                     verify=verify,
                     headers=base_headers,
                     cookies=cookies,
@@ -267,13 +489,11 @@ class Connection:
                 if not res.ok:
                     LOG.debug("Server Response: {}".format(res.json()))
         except ConnectTimeout as cte:
-            LOG.error(
-                "Could not establish connection to server at https://{}:{}.".format(
-                    self.host, self.port
-                )
+            msg = "Could not establish connection to server at {}://{}:{}.".format(
+                self.scheme, self.host, self.port
             )
             LOG.debug("Error Response: {}".format(cte))
-            sys.exit(-1)
+            raise ServerConnectTimeout(msg, host=self.host, port=self.port) from cte
         except Exception as ex:
             LOG.debug("Got traceback\n{}".format(traceback.format_exc()))
             if hasattr(res, "json") and callable(getattr(res, "json")):
@@ -299,6 +519,9 @@ class Connection:
                     json.dumps(err, indent=4, separators=(",", ": "))
                 )
             )
+        finally:
+            if request_limit is not None:
+                request_limit.release()
         return res, err
 
 
@@ -311,6 +534,7 @@ def get_connection(
     auth_type=REQUEST.AUTH_TYPE.BASIC,
     scheme=REQUEST.SCHEME.HTTPS,
     auth=None,
+    **kwargs
 ):
     """Get api server (aplos/styx) handle.
 
@@ -321,6 +545,7 @@ def get_connection(
         scheme (str): http scheme (http or https)
         session_headers (dict): session headers dict
         auth (tuple): authentication
+        kwargs: retry and pool settings of the connection
     Returns:
         Client handle
     Raises:
@@ -328,7 +553,7 @@ def get_connection(
     """
     global _CONNECTION
     if not _CONNECTION:
-        update_connection(host, port, auth_type, scheme, auth)
+        update_connection(host, port, auth_type, scheme, auth, **kwargs)
     return _CONNECTION
 
 
@@ -338,6 +563,7 @@ def update_connection(
     auth_type=REQUEST.AUTH_TYPE.BASIC,
     scheme=REQUEST.SCHEME.HTTPS,
     auth=None,
+    **kwargs
 ):
     global _CONNECTION
-    _CONNECTION = Connection(host, port, auth_type, scheme=scheme, auth=auth)
+    _CONNECTION = Connection(host, port, auth_type, scheme=scheme, auth=auth, **kwargs)
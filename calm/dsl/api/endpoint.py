@@ -2,7 +2,7 @@ import os
 
 from .resource import ResourceAPI
 from .connection import REQUEST
-from .util import strip_secrets, patch_secrets
+from .util import strip_secrets, patch_secrets, log_request_count
 from calm.dsl.config import get_config
 from .project import ProjectAPI
 
@@ -42,6 +42,7 @@ class EndpointAPI(ResourceAPI):
 
         return endpoint_payload
 
+    @log_request_count("Endpoint upload")
     def upload_with_secrets(
         self, endpoint_name, endpoint_desc, endpoint_resources, force_create=False
     ):
@@ -80,33 +81,20 @@ class EndpointAPI(ResourceAPI):
 
         config = get_config()
         project_name = config["PROJECT"]["name"]
-        projectObj = ProjectAPI(self.connection)
-
-        # Fetch project details
-        params = {"filter": "name=={}".format(project_name)}
-        res, err = projectObj.list(params=params)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        response = res.json()
-        entities = response.get("entities", None)
-        if not entities:
-            raise Exception("No project with name {} exists".format(project_name))
-
-        project_id = entities[0]["metadata"]["uuid"]
-
         # Setting project reference
-        upload_payload["metadata"]["project_reference"] = {
-            "kind": "project",
-            "uuid": project_id,
-            "name": project_name,
-        }
+        projectObj = ProjectAPI(self.connection)
+        project_reference = projectObj.get_project_reference(project_name)
+        upload_payload["metadata"]["project_reference"] = project_reference
 
         res, err = self.upload(upload_payload)
 
         if err:
             return res, err
 
+        # Update is needed only to add secrets
+        if not (secret_map or secret_variables):
+            return res, err
+
         endpoint = res.json()
         del endpoint["status"]
 
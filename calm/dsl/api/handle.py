@@ -1,4 +1,4 @@
-from calm.dsl.config import get_config
+from calm.dsl.config import get_config, get_connection_config
 
 from .connection import get_connection, update_connection, REQUEST, Connection
 from .blueprint import BlueprintAPI
@@ -44,17 +44,18 @@ def get_client_handle(
     scheme=REQUEST.SCHEME.HTTPS,
     auth=None,
     temp=False,  # This flag is used to generate temp handle
+    **kwargs
 ):
     global _CLIENT_HANDLE
     if temp:
-        connection = Connection(host, port, auth_type, scheme, auth)
+        connection = Connection(host, port, auth_type, scheme, auth, **kwargs)
         handle = ClientHandle(connection)
         handle._connect()
         return handle
 
     else:
         if not _CLIENT_HANDLE:
-            update_client_handle(host, port, auth_type, scheme, auth)
+            update_client_handle(host, port, auth_type, scheme, auth, **kwargs)
         return _CLIENT_HANDLE
 
 
@@ -64,9 +65,10 @@ def update_client_handle(
     auth_type=REQUEST.AUTH_TYPE.BASIC,
     scheme=REQUEST.SCHEME.HTTPS,
     auth=None,
+    **kwargs
 ):
     global _CLIENT_HANDLE
-    update_connection(host, port, auth_type, scheme=scheme, auth=auth)
+    update_connection(host, port, auth_type, scheme=scheme, auth=auth, **kwargs)
     connection = get_connection(host, port, auth_type, scheme, auth)
     _CLIENT_HANDLE = ClientHandle(connection)
     _CLIENT_HANDLE._connect()
@@ -82,4 +84,6 @@ def get_api_client():
     username = config["SERVER"].get("pc_username")
     password = config["SERVER"].get("pc_password")
 
-    return get_client_handle(pc_ip, pc_port, auth=(username, password))
+    return get_client_handle(
+        pc_ip, pc_port, auth=(username, password), **get_connection_config()
+    )
@@ -1,5 +1,8 @@
 from .resource import ResourceAPI
 from .connection import REQUEST
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
 
 
 class ProjectAPI(ResourceAPI):
@@ -28,3 +31,36 @@ class ProjectAPI(ResourceAPI):
         return self.connection._call(
             self.INTERNAL_ITEM.format(id), verify=False, method=REQUEST.METHOD.GET
         )
+
+    def get_project_reference(self, project_name):
+        """
+            returns reference of project, using project uuid from local cache.
+            Project is fetched from server if it is not present in cache.
+        """
+
+        # Local import, as store depends on this package
+        from calm.dsl.store import Cache
+
+        project_data = Cache.get_entity_data(entity_type="project", name=project_name)
+        if project_data:
+            project_id = project_data["uuid"]
+
+        else:
+            LOG.debug(
+                "Project {} not found in cache, fetching it from server".format(
+                    project_name
+                )
+            )
+            params = {"filter": "name=={}".format(project_name)}
+            res, err = self.list(params=params)
+            if err:
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+            response = res.json()
+            entities = response.get("entities", None)
+            if not entities:
+                raise Exception("No project with name {} exists".format(project_name))
+
+            project_id = entities[0]["metadata"]["uuid"]
+
+        return {"kind": "project", "uuid": project_id, "name": project_name}
@@ -1,9 +1,12 @@
+from concurrent.futures import ThreadPoolExecutor
+
 from .connection import REQUEST
 
 
 class ResourceAPI:
 
     ROOT = "api/nutanix/v3"
+    DEFAULT_PAGE_SIZE = 250
 
     def __init__(self, connection, resource_type):
         self.connection = connection
@@ -42,21 +45,103 @@ class ResourceAPI:
             ignore_error=ignore_error,
         )
 
-    def get_name_uuid_map(self, params={}):
-        response, err = self.list(params)
-
-        if not err:
-            response = response.json()
-        else:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        total_matches = response["metadata"]["total_matches"]
-        if total_matches == 0:
-            return {}
+    def iter_entities(
+        self, params={}, page_size=None, prefetch=False, ignore_error=False
+    ):
+        """
+            yields entities of all pages of list call, walking offset till
+            total_matches. If prefetch is set, next page is fetched in a
+            background thread while current page is being consumed.
+        """
+
+        params = dict(params)
+        page_size = page_size or params.get("length") or self.DEFAULT_PAGE_SIZE
+        params["length"] = page_size
+        offset = params.get("offset", 0)
+
+        def fetch_page(offset):
+            res, err = self.list(dict(params, offset=offset), ignore_error=ignore_error)
+            if err:
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
+            return res.json()
+
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        try:
+            response = fetch_page(offset)
+            while True:
+                entities = response.get("entities", [])
+                offset += len(entities)
+                total_matches = response["metadata"].get("total_matches", 0)
+
+                has_next = bool(entities) and offset < total_matches
+                if has_next and executor:
+                    next_page = executor.submit(fetch_page, offset)
+
+                for entity in entities:
+                    yield entity
+
+                if not has_next:
+                    break
+
+                response = next_page.result() if executor else fetch_page(offset)
+
+        finally:
+            if executor:
+                executor.shutdown(wait=False)
+
+    def list_all(self, params={}, page_size=None, max_workers=None, ignore_error=False):
+        """
+            returns (response, err) where response holds entities of all pages.
+            First page gives total_matches, remaining pages are fetched
+            concurrently by a thread pool bounded by concurrent requests
+            allowed over the connection.
+            Entities keep page order and walk stops at first failed page.
+        """
+
+        params = dict(params)
+        page_size = page_size or params.get("length") or self.DEFAULT_PAGE_SIZE
+        params["length"] = page_size
+        offset = params.get("offset", 0)
+
+        def fetch_page(offset):
+            res, err = self.list(dict(params, offset=offset), ignore_error=ignore_error)
+            if err:
+                return None, err
+            return res.json().get("entities", []), None
+
+        res, err = self.list(dict(params, offset=offset), ignore_error=ignore_error)
+        if err:
+            return None, err
+
+        res = res.json()
+        entities = res.get("entities", [])
+        total_matches = res["metadata"].get("total_matches", 0)
+        page_offsets = range(offset + len(entities), total_matches, page_size)
+
+        if entities and page_offsets:
+            max_workers = min(
+                max_workers or self.connection.max_concurrent_requests,
+                len(page_offsets),
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                pages = [executor.submit(fetch_page, o) for o in page_offsets]
+                for page in pages:
+                    page_entities, err = page.result()
+                    if err:
+                        for pending_page in pages:
+                            pending_page.cancel()
+                        return None, err
+
+                    entities.extend(page_entities)
+
+        res["entities"] = entities
+        res["metadata"].update({"length": len(entities), "offset": offset})
+        return res, None
 
+    def get_name_uuid_map(self, params={}):
         name_uuid_map = {}
 
-        for entity in response["entities"]:
+        for entity in self.iter_entities(params):
             entity_name = entity["status"]["name"]
             entity_uuid = entity["metadata"]["uuid"]
 
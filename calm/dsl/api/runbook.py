@@ -2,10 +2,21 @@ import os
 
 from .resource import ResourceAPI
 from .connection import REQUEST
-from .util import strip_secrets, patch_secrets
+from .util import (
+    strip_secrets,
+    patch_secrets,
+    log_request_count,
+    get_resources_hash,
+    get_client_attrs_hash,
+    set_client_attrs_hash,
+    mark_upload_skipped,
+)
 from calm.dsl.config import get_config
+from calm.dsl.log import get_logging_handle
 from .project import ProjectAPI
 
+LOG = get_logging_handle(__name__)
+
 
 class RunbookAPI(ResourceAPI):
     def __init__(self, connection):
@@ -31,7 +42,11 @@ class RunbookAPI(ResourceAPI):
 
     def upload(self, payload):
         return self.connection._call(
-            self.UPLOAD, verify=False, request_json=payload, method=REQUEST.METHOD.POST
+            self.UPLOAD,
+            verify=False,
+            request_json=payload,
+            method=REQUEST.METHOD.POST,
+            compress=True,
         )
 
     def resume(self, action_runlog_id, task_runlog_id, payload):
@@ -103,32 +118,45 @@ class RunbookAPI(ResourceAPI):
 
         return runbook_payload
 
-    def upload_with_secrets(
-        self, runbook_name, runbook_desc, runbook_resources, force_create=False
-    ):
+    def _read_if_unchanged(self, uuid, runbook_name, payload_hash):
+        """returns (res, err) of runbook read, (None, None) if it is changed"""
 
-        # check if runbook with the given name already exists
-        params = {"filter": "name=={};deleted==FALSE".format(runbook_name)}
-        res, err = self.list(params=params)
+        res, err = self.read(uuid)
         if err:
             return None, err
 
-        response = res.json()
-        entities = response.get("entities", None)
-        if entities:
-            if len(entities) > 0:
-                if not force_create:
-                    err_msg = "Runbook {} already exists. Use --force to first delete existing runbook before create.".format(
-                        runbook_name
-                    )
-                    err = {"error": err_msg, "code": -1}
-                    return None, err
+        runbook = res.json()
+        if runbook["status"].get("state") != "ACTIVE":
+            return None, None
 
-                # --force option used in create. Delete existing runbook with same name.
-                rb_uuid = entities[0]["metadata"]["uuid"]
-                _, err = self.delete(rb_uuid)
-                if err:
-                    return None, err
+        if get_client_attrs_hash(runbook["spec"]["resources"]) != payload_hash:
+            return None, None
+
+        LOG.debug("Runbook {} is unchanged".format(runbook_name))
+        return mark_upload_skipped(res), None
+
+    @staticmethod
+    def _has_secrets(
+        secret_map, secret_variables, endpoint_secret_map, endpoint_secret_variables
+    ):
+        """checks whether any secret is stripped from runbook or its endpoints"""
+
+        return bool(
+            secret_map
+            or secret_variables
+            or any(endpoint_secret_map.values())
+            or any(endpoint_secret_variables.values())
+        )
+
+    @log_request_count("Runbook upload")
+    def upload_with_secrets(
+        self,
+        runbook_name,
+        runbook_desc,
+        runbook_resources,
+        force_create=False,
+        force_upload=False,
+    ):
 
         secret_map = {}
         secret_variables = []
@@ -157,44 +185,82 @@ class RunbookAPI(ResourceAPI):
             )
             endpoint["attrs"].pop("default_credential_local_reference", None)
 
-        upload_payload = self._make_runbook_payload(
-            runbook_name, runbook_desc, runbook_resources
-        )
-
         config = get_config()
         project_name = config["PROJECT"]["name"]
-        projectObj = ProjectAPI(self.connection)
 
-        # Fetch project details
-        params = {"filter": "name=={}".format(project_name)}
-        res, err = projectObj.list(params=params)
+        # Hash of payload without secrets, to skip upload of unchanged runbook
+        payload_hash = get_resources_hash(
+            runbook_resources,
+            name=runbook_name,
+            description=runbook_desc or "",
+            project=project_name,
+        )
+
+        # check if runbook with the given name already exists
+        params = {"filter": "name=={};deleted==FALSE".format(runbook_name)}
+        res, err = self.list(params=params)
         if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+            return None, err
 
         response = res.json()
         entities = response.get("entities", None)
-        if not entities:
-            raise Exception("No project with name {} exists".format(project_name))
+        if entities:
+            if len(entities) > 0:
+                if not force_create:
+                    err_msg = "Runbook {} already exists. Use --force to first delete existing runbook before create.".format(
+                        runbook_name
+                    )
+                    err = {"error": err_msg, "code": -1}
+                    return None, err
+
+                rb_uuid = entities[0]["metadata"]["uuid"]
+
+                # Existing runbook is kept, if it is same as the given one
+                if not force_upload:
+                    res, err = self._read_if_unchanged(
+                        rb_uuid, runbook_name, payload_hash
+                    )
+                    if err or res is not None:
+                        return res, err
+
+                # --force option used in create. Delete existing runbook with same name.
+                _, err = self.delete(rb_uuid)
+                if err:
+                    return None, err
+
+        # Update is needed only to add secrets
+        needs_update = self._has_secrets(
+            secret_map, secret_variables, endpoint_secret_map, endpoint_secret_variables
+        )
 
-        project_id = entities[0]["metadata"]["uuid"]
+        # Hash is set in the last request, so that a partially uploaded
+        # runbook is not considered unchanged
+        if not needs_update:
+            set_client_attrs_hash(runbook_resources, payload_hash)
+
+        upload_payload = self._make_runbook_payload(
+            runbook_name, runbook_desc, runbook_resources
+        )
 
         # Setting project reference
-        upload_payload["metadata"]["project_reference"] = {
-            "kind": "project",
-            "uuid": project_id,
-            "name": project_name,
-        }
+        projectObj = ProjectAPI(self.connection)
+        project_reference = projectObj.get_project_reference(project_name)
+        upload_payload["metadata"]["project_reference"] = project_reference
 
         res, err = self.upload(upload_payload)
 
         if err:
             return res, err
 
+        if not needs_update:
+            return res, err
+
         runbook = res.json()
         del runbook["status"]
 
         # Add secrets and update runbook
         patch_secrets(runbook["spec"]["resources"], secret_map, secret_variables)
+        set_client_attrs_hash(runbook["spec"]["resources"], payload_hash)
         for endpoint in runbook["spec"]["resources"].get(
             "endpoint_definition_list", []
         ):
@@ -269,8 +335,15 @@ class RunbookAPI(ResourceAPI):
                 self.POLL_RUN.format(uuid), verify=False, method=REQUEST.METHOD.GET
             )
 
+    @log_request_count("Runbook update")
     def update_with_secrets(
-        self, uuid, runbook_name, runbook_desc, runbook_resources, spec_version
+        self,
+        uuid,
+        runbook_name,
+        runbook_desc,
+        runbook_resources,
+        spec_version,
+        force_upload=False,
     ):
 
         secret_map = {}
@@ -300,44 +373,55 @@ class RunbookAPI(ResourceAPI):
             )
             endpoint["attrs"].pop("default_credential_local_reference", None)
 
-        update_payload = self._make_runbook_payload(
-            runbook_name, runbook_desc, runbook_resources, spec_version=spec_version
-        )
-
         config = get_config()
         project_name = config["PROJECT"]["name"]
-        projectObj = ProjectAPI(self.connection)
 
-        # Fetch project details
-        params = {"filter": "name=={}".format(project_name)}
-        res, err = projectObj.list(params=params)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+        # Hash of payload without secrets, to skip update of unchanged runbook
+        payload_hash = get_resources_hash(
+            runbook_resources,
+            name=runbook_name,
+            description=runbook_desc or "",
+            project=project_name,
+        )
 
-        response = res.json()
-        entities = response.get("entities", None)
-        if not entities:
-            raise Exception("No project with name {} exists".format(project_name))
+        if not force_upload:
+            res, err = self._read_if_unchanged(uuid, runbook_name, payload_hash)
+            if err or res is not None:
+                return res, err
+
+        # Update is needed only to add secrets
+        needs_update = self._has_secrets(
+            secret_map, secret_variables, endpoint_secret_map, endpoint_secret_variables
+        )
 
-        project_id = entities[0]["metadata"]["uuid"]
+        # Hash is set in the last request, so that a partially updated
+        # runbook is not considered unchanged
+        if not needs_update:
+            set_client_attrs_hash(runbook_resources, payload_hash)
+
+        update_payload = self._make_runbook_payload(
+            runbook_name, runbook_desc, runbook_resources, spec_version=spec_version
+        )
 
         # Setting project reference
-        update_payload["metadata"]["project_reference"] = {
-            "kind": "project",
-            "uuid": project_id,
-            "name": project_name,
-        }
+        projectObj = ProjectAPI(self.connection)
+        project_reference = projectObj.get_project_reference(project_name)
+        update_payload["metadata"]["project_reference"] = project_reference
 
         res, err = self.update_using_name_reference(uuid, update_payload)
         if err:
             return res, err
 
+        if not needs_update:
+            return res, err
+
         # Add secrets and update runbook
         runbook = res.json()
         del runbook["status"]
 
         # Update runbook
         patch_secrets(runbook["spec"]["resources"], secret_map, secret_variables)
+        set_client_attrs_hash(runbook["spec"]["resources"], payload_hash)
         for endpoint in runbook["spec"]["resources"].get(
             "endpoint_definition_list", []
         ):
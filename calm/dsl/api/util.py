@@ -1,3 +1,28 @@
+import re
+import json
+import hashlib
+from functools import wraps
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+# Key of client attrs having the details of the uploaded dsl payload
+DSL_CLIENT_ATTRS_KEY = "calm_dsl"
+
+# Names given by dsl to the unnamed entities, having random uuid fragment as id
+GENERATED_NAME_PATTERNS = [
+    # Entities and tasks
+    re.compile(r"_[A-Z][A-Za-z]*(?P<id>[0-9a-f]{8})"),
+    # Call runbook and scaling tasks
+    re.compile(r".+_task_for_.+__(?P<id>[0-9a-f]{8})"),
+    # Dag, parallel, while loop and meta tasks
+    re.compile(r"(?P<id>[0-9a-f]{8})_(?:dag|parallel|while_loop|meta)"),
+    re.compile(r"(?P<id>[0-9a-f]{10})_meta_task"),
+    re.compile(r"Endpoint_(?P<id>[0-9a-f]{8})"),
+]
+
+
 def strip_secrets(resources, secret_map, secret_variables, object_lists=[], objects=[]):
     """
     Strips secrets from the resources
@@ -198,3 +223,112 @@ def patch_secrets(resources, secret_map, secret_variables):
         variable["value"] = secret
 
     return resources
+
+
+def _normalize_generated_names(obj, generated_ids):
+    """returns copy of obj, with ids of generated names numbered in order"""
+
+    if isinstance(obj, dict):
+        return {
+            _normalize_generated_names(k, generated_ids): _normalize_generated_names(
+                v, generated_ids
+            )
+            for k, v in obj.items()
+        }
+
+    elif isinstance(obj, list):
+        return [_normalize_generated_names(v, generated_ids) for v in obj]
+
+    elif isinstance(obj, str):
+        for pattern in GENERATED_NAME_PATTERNS:
+            match = pattern.fullmatch(obj)
+            if match:
+                start, end = match.span("id")
+                index = generated_ids.setdefault(match.group("id"), len(generated_ids))
+                return "{}<{}>{}".format(obj[:start], index, obj[end:])
+
+    return obj
+
+
+def get_payload_hash(payload):
+    """
+    Returns hash of payload, that is same across the compiles of same dsl
+    Args:
+        payload (dict): payload stripped of secrets
+    Returns:
+        str: sha256 digest of normalized payload
+    """
+
+    payload = _normalize_generated_names(payload, {})
+    payload = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_resources_hash(resources, **kwargs):
+    """
+    Returns hash of resources, ignoring the hash stored in its client attrs
+    Args:
+        resources (dict): resources stripped of secrets
+        kwargs: other details of entity to be hashed, ex: name
+    Returns:
+        str: sha256 digest of normalized resources
+    """
+
+    client_attrs = resources.get("client_attrs", None)
+    if client_attrs:
+        client_attrs = {
+            k: v for k, v in client_attrs.items() if k != DSL_CLIENT_ATTRS_KEY
+        }
+
+    return get_payload_hash(
+        dict(kwargs, resources=dict(resources, client_attrs=client_attrs))
+    )
+
+
+def get_client_attrs_hash(resources):
+    """Returns payload hash stored in client attrs of resources, if any"""
+
+    client_attrs = resources.get("client_attrs", None) or {}
+    return (client_attrs.get(DSL_CLIENT_ATTRS_KEY, None) or {}).get("payload_hash")
+
+
+def set_client_attrs_hash(resources, payload_hash):
+    """Stores payload hash in client attrs of resources"""
+
+    client_attrs = resources.get("client_attrs", None) or {}
+    client_attrs[DSL_CLIENT_ATTRS_KEY] = {"payload_hash": payload_hash}
+    resources["client_attrs"] = client_attrs
+
+
+def mark_upload_skipped(res):
+    """Marks the read response of an unchanged entity, returned in place of upload"""
+
+    res.upload_skipped = True
+    return res
+
+
+def is_upload_skipped(res):
+    """Checks whether upload of entity was skipped, as it is unchanged"""
+
+    return getattr(res, "upload_skipped", False)
+
+
+def log_request_count(operation):
+    """decorator logging the number of server requests made by a resource api method"""
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(self, *args, **kwargs):
+            request_count = self.connection.request_count
+            try:
+                return func(self, *args, **kwargs)
+            finally:
+                LOG.debug(
+                    "{} made {} server requests".format(
+                        operation, self.connection.request_count - request_count
+                    )
+                )
+
+        return wrapper
+
+    return decorator
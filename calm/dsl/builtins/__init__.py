@@ -64,7 +64,9 @@ from .models.ahv_vm import (
 from .models.client_attrs import (
     init_dsl_metadata_map,
     get_dsl_metadata_map,
+    get_dsl_metadata_snapshot,
     update_dsl_metadata_map,
+    reset_dsl_metadata_map,
 )
 
 __all__ = [
@@ -149,5 +151,7 @@ __all__ = [
     "AhvVmType",
     "init_dsl_metadata_map",
     "get_dsl_metadata_map",
+    "get_dsl_metadata_snapshot",
     "update_dsl_metadata_map",
+    "reset_dsl_metadata_map",
 ]
@@ -14,7 +14,11 @@ class BlueprintType(EntityType):
             """ Unzip pod deployment if exists """
 
             for profile in cdict["app_profile_list"]:
-                deployments = getattr(profile, "deployments", [])
+                # Pod deployments of profile are replaced by extracted ones,
+                # keep them to unzip again when blueprint is compiled again
+                deployments = vars(profile).get("__pod_deployments__", None)
+                if deployments is None:
+                    deployments = getattr(profile, "deployments", [])
 
                 normal_deployments = []
                 for dep in deployments:
@@ -24,19 +28,21 @@ class BlueprintType(EntityType):
                         normal_deployments.extend(
                             pod_dict["deployment_definition_list"]
                         )
-                        cdict["package_definition_list"].extend(
-                            pod_dict["package_definition_list"]
-                        )
-                        cdict["substrate_definition_list"].extend(
-                            pod_dict["substrate_definition_list"]
-                        )
-                        cdict["published_service_definition_list"].extend(
-                            pod_dict["published_service_definition_list"]
-                        )
+                        cdict["package_definition_list"] = list(
+                            cdict["package_definition_list"]
+                        ) + list(pod_dict["package_definition_list"])
+                        cdict["substrate_definition_list"] = list(
+                            cdict["substrate_definition_list"]
+                        ) + list(pod_dict["substrate_definition_list"])
+                        cdict["published_service_definition_list"] = list(
+                            cdict["published_service_definition_list"]
+                        ) + list(pod_dict["published_service_definition_list"])
 
                     else:
                         normal_deployments.append(dep)
 
+                if normal_deployments != deployments:
+                    setattr(profile, "__pod_deployments__", deployments)
                 setattr(profile, "deployments", normal_deployments)
 
             return cdict
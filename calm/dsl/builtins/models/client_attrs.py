@@ -1,17 +1,38 @@
 import copy
+from collections.abc import Mapping
+
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
-DSL_METADATA_MAP = {
-    "Service": {},
-    "Package": {},
-    "Deployment": {},
-    "Profile": {},
-    "Substrate": {},
-}
+DSL_METADATA_ENTITY_TYPES = ["Service", "Package", "Deployment", "Profile", "Substrate"]
+DSL_METADATA_MAP = {entity_type: {} for entity_type in DSL_METADATA_ENTITY_TYPES}
 # TODO Check for credential
 
 
+class MetadataView(Mapping):
+    """Read-only view of dsl metadata, sharing the data of metadata map"""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getitem__(self, key):
+        value = self._data[key]
+        if isinstance(value, dict):
+            return MetadataView(value)
+        return value
+
+    def __iter__(self):
+        return iter(self._data)
+
+    def __len__(self):
+        return len(self._data)
+
+    def __repr__(self):
+        return "{}({!r})".format(self.__class__.__name__, self._data)
+
+
 def update_dsl_metadata_map(entity_type, entity_name, entity_obj):
     global DSL_METADATA_MAP
     if entity_type not in DSL_METADATA_MAP:
@@ -20,12 +41,12 @@ def update_dsl_metadata_map(entity_type, entity_name, entity_obj):
     DSL_METADATA_MAP[entity_type][entity_name] = entity_obj
 
 
-def get_dsl_metadata_map(context=[]):
-    global DSL_METADATA_MAP
+def _get_metadata(context):
+    """returns metadata at the context path, None if not present"""
 
-    metadata = copy.deepcopy(DSL_METADATA_MAP)
+    metadata = DSL_METADATA_MAP
     for c in context:
-        if c in metadata:
+        if isinstance(metadata, dict) and c in metadata:
             metadata = metadata[c]
         else:
             return
@@ -33,6 +54,30 @@ def get_dsl_metadata_map(context=[]):
     return metadata
 
 
+def get_dsl_metadata_map(context=[]):
+    """returns read-only view of metadata at the context path, without copying"""
+
+    metadata = _get_metadata(context)
+    if isinstance(metadata, dict):
+        return MetadataView(metadata)
+
+    return metadata
+
+
+def get_dsl_metadata_snapshot(context=[]):
+    """returns mutable copy of metadata at the context path"""
+
+    return copy.deepcopy(_get_metadata(context))
+
+
 def init_dsl_metadata_map(metadata):
     global DSL_METADATA_MAP
     DSL_METADATA_MAP = metadata
+
+
+def reset_dsl_metadata_map():
+    """clears metadata of the entities compiled earlier in the process"""
+
+    init_dsl_metadata_map(
+        {entity_type: {} for entity_type in DSL_METADATA_ENTITY_TYPES}
+    )
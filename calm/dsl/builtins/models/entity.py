@@ -5,7 +5,7 @@ import sys
 import inspect
 from types import MappingProxyType
 import uuid
-import copy
+import weakref
 
 from ruamel.yaml import YAML, resolver, SafeRepresenter
 from calm.dsl.tools import StrictDraft7Validator
@@ -16,6 +16,10 @@ from .client_attrs import update_dsl_metadata_map, get_dsl_metadata_map
 
 LOG = get_logging_handle(__name__)
 
+# Resolved attributes of entity classes. Look at EntityType.get_all_attrs()
+_ALL_ATTRS_CACHE = weakref.WeakKeyDictionary()
+_DEFAULT = object()
+
 
 class EntityDict(OrderedDict):
     @staticmethod
@@ -90,6 +94,44 @@ class EntityDict(OrderedDict):
         super().__setitem__(name, value)
 
 
+class _SchemaDetail:
+    """
+        Descriptor for schema details(validators, defaults etc.) of an entity type.
+        Details are fetched from schema when the attribute is accessed first time.
+    """
+
+    def __init__(self, schema_name, index):
+        self.schema_name = schema_name
+        self.index = index
+        self.value = None
+
+    def __get__(self, instance, owner):
+        if self.value is None:
+            details = get_schema_details(self.schema_name)
+            self.value = MappingProxyType(details[self.index])
+
+        return self.value
+
+
+class _SchemaValidator:
+    """
+        Descriptor for validator of schema properties of an entity type.
+        Validator is created when the attribute is accessed first time.
+    """
+
+    def __init__(self, schema_name):
+        self.schema_name = schema_name
+        self.value = None
+
+    def __get__(self, instance, owner):
+        if self.value is None:
+            props = get_schema_details(self.schema_name)[0]
+            schema = {"type": "object", "properties": MappingProxyType(props)}
+            self.value = StrictDraft7Validator(schema)
+
+        return self.value
+
+
 class EntityTypeBase(type):
 
     subclasses = {}
@@ -111,25 +153,27 @@ class EntityTypeBase(type):
         if not schema_name:
             return
 
-        # Set properties on metaclass by fetching from schema
-        (schema_props, validators, defaults, display_map) = get_schema_details(
-            schema_name
-        )
+        # Set properties on metaclass. These are fetched from schema lazily,
+        # when the entity type is used first time. Look at _SchemaDetail for details
+
+        # Schema properties of entity type
+        setattr(cls, "__schema_props__", _SchemaDetail(schema_name, 0))
 
         # Set validator dict on metaclass for each prop.
         # To be used during __setattr__() to validate props.
         # Look at validate() for details.
-        setattr(cls, "__validator_dict__", MappingProxyType(validators))
+        setattr(cls, "__validator_dict__", _SchemaDetail(schema_name, 1))
 
         # Set defaults which will be used during serialization.
         # Look at json_dumps() for details
-        setattr(cls, "__default_attrs__", MappingProxyType(defaults))
-
-        # Attach schema properties to metaclass
-        setattr(cls, "__schema_props__", MappingProxyType(schema_props))
+        setattr(cls, "__default_attrs__", _SchemaDetail(schema_name, 2))
 
         # Attach display map for compile/decompile
-        setattr(cls, "__display_map__", MappingProxyType(display_map))
+        setattr(cls, "__display_map__", _SchemaDetail(schema_name, 3))
+
+        # Validator of schema properties, used to validate dicts given for entity.
+        # Look at validate_dict() for details
+        setattr(cls, "__schema_validator__", _SchemaValidator(schema_name))
 
 
 class EntityType(EntityTypeBase):
@@ -140,9 +184,7 @@ class EntityType(EntityTypeBase):
 
     @classmethod
     def validate_dict(cls, entity_dict):
-        schema = {"type": "object", "properties": cls.__schema_props__}
-        validator = StrictDraft7Validator(schema)
-        validator.validate(entity_dict)
+        cls.__schema_validator__.validate(entity_dict)
 
     @classmethod
     def to_yaml(mcls, representer, node):
@@ -213,6 +255,24 @@ class EntityType(EntityTypeBase):
 
         # Set attribute
         super().__setattr__(name, value)
+        cls._clear_attrs_cache()
+
+    def __delattr__(cls, name):
+
+        super().__delattr__(name)
+        cls._clear_attrs_cache()
+
+    def _clear_attrs_cache(cls):
+        """clears resolved attributes of entity and its subclasses"""
+
+        if not _ALL_ATTRS_CACHE:
+            return
+
+        klasses = [cls]
+        while klasses:
+            klass = klasses.pop()
+            _ALL_ATTRS_CACHE.pop(klass, None)
+            klasses.extend(type.__subclasses__(klass))
 
     def __str__(cls):
         return cls.__name__
@@ -308,17 +368,76 @@ class EntityType(EntityTypeBase):
             attrs.pop(k)
 
     def get_all_attrs(cls):
+        """
+        returns attributes of entity merged across its mro, along with defaults.
+        Attributes are resolved once per class and reused till it is modified.
+        """
+
+        all_attrs = _ALL_ATTRS_CACHE.get(cls)
+        if all_attrs is None:
+            all_attrs = cls._resolve_all_attrs()
+            _ALL_ATTRS_CACHE[cls] = all_attrs
 
-        ncls_ns = cls.get_default_attrs()
+        attrs, variables = all_attrs
+        for name, value in variables:
+            # Same variable can be shared by entities, name it as per this entity
+            if getattr(value, "name", None) != name:
+                setattr(value, "name", name)
+
+        return dict(attrs)
+
+    def _resolve_all_attrs(cls):
+        """returns attributes of entity and its class-level variables"""
+
+        default_attrs = getattr(type(cls), "__default_attrs__", {}) or {}
+        ncls_ns = dict.fromkeys(default_attrs, _DEFAULT)
         for klass in reversed(cls.mro()):
             if hasattr(klass, "get_user_attrs") and callable(
                 getattr(klass, "get_user_attrs")
             ):
-                ncls_ns = {**ncls_ns, **klass.__dict__}
+                ncls_ns.update(klass.__dict__)
 
-        ncls = type(cls)(cls.__name__, cls.__bases__, ncls_ns)
+        types = EntityTypeBase.get_entity_types()
+        ActionType = types.get("Action", None)
+        RunbookType = types.get("Runbook", None)
+        VariableType = types.get("Variable", None)
+        DescriptorType = types.get("Descriptor", None)
+        vdict = getattr(type(cls), "__validator_dict__", None) or {}
+
+        attrs = {}
+        variables = []
+        for name, value in ncls_ns.items():
+            if (
+                name.startswith("__")
+                and name.endswith("__")
+                and not isinstance(value, (VariableType, ActionType, RunbookType))
+                and not isinstance(type(value), DescriptorType)
+            ):
+                continue
+
+            if value is _DEFAULT:
+                # Not set on any class in mro
+                attrs[name] = default_attrs[name]()
+                continue
 
-        return ncls.get_user_attrs()
+            descriptor_get = getattr(type(value), "__get__", None)
+            if descriptor_get is not None:
+                # Resolve descriptors(actions, provider spec etc.) on entity
+                try:
+                    value = descriptor_get(value, None, cls)
+                except AttributeError:
+                    pass
+
+            elif (
+                isinstance(value, VariableType)
+                and name not in vdict
+                and not (name.startswith("__") and name.endswith("__"))
+            ):
+                variables.append((name, value))
+
+            attrs[name] = value
+
+        return attrs, variables
 
     def pre_compile(cls):
         """Hook to construct dsl metadata map"""
@@ -412,7 +531,7 @@ class EntityType(EntityTypeBase):
         schema_name = getattr(mcls, "__schema_name__", None)
         ui_name = cdict.get("name", None)
 
-        cur_context = copy.deepcopy(context)
+        cur_context = list(context)
         # TODO clear this mess. Store context of entities as per order in blueprint
         if schema_name == "Deployment":
             # As cur_context will contain Profile details. So reinitiate context
@@ -479,8 +598,7 @@ class EntityType(EntityTypeBase):
     def json_dumps(cls, pprint=False, sort_keys=False):
 
         dump = json.dumps(
-            cls,
-            cls=EntityJSONEncoder,
+            cls.get_dict(),
             sort_keys=sort_keys,
             indent=4 if pprint else None,
             separators=(",", ": ") if pprint else (",", ":"),
@@ -521,7 +639,7 @@ class EntityType(EntityTypeBase):
         return ref(None, (Entity,), attrs)
 
     def get_dict(cls):
-        return json.loads(cls.json_dumps())
+        return _compile_to_dict(cls)
 
 
 class Entity(metaclass=EntityType):
@@ -538,6 +656,54 @@ class EntityJSONEncoder(JSONEncoder):
         return cls.compile()
 
 
+def _compile_key(key):
+    """returns key as converted by json encoder for object keys"""
+
+    if isinstance(key, str):
+        return str(key)
+
+    if key is None or isinstance(key, (int, float)):
+        # true/false/null, int and float (NaN, Infinity) representations
+        return json.dumps(key)
+
+    raise TypeError(
+        "keys must be str, int, float, bool or None, not {}".format(type(key).__name__)
+    )
+
+
+def _compile_to_dict(value):
+    """
+    returns plain (json compatible) data for value, compiling entities in it.
+    Output is same as json.loads(json.dumps(value, cls=EntityJSONEncoder))
+    """
+
+    value_type = type(value)
+    if value_type in (str, int, float, bool) or value is None:
+        return value
+
+    if isinstance(value, dict):
+        return {_compile_key(k): _compile_to_dict(v) for k, v in value.items()}
+
+    if isinstance(value, (list, tuple)):
+        return [_compile_to_dict(v) for v in value]
+
+    if isinstance(value, str):
+        return str(value)
+
+    if isinstance(value, int):
+        return int(value)
+
+    if isinstance(value, float):
+        return float(value)
+
+    if hasattr(value, "__kind__"):
+        return _compile_to_dict(value.compile())
+
+    raise TypeError(
+        "Object of type {} is not JSON serializable".format(value_type.__name__)
+    )
+
+
 class EntityJSONDecoder(JSONDecoder):
     def __init__(self, *args, **kwargs):
         super().__init__(object_hook=self.object_hook, *args, **kwargs)
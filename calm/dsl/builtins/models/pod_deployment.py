@@ -33,6 +33,17 @@ class PODDeploymentType(DeploymentType):
     def extract_deployment(cls, is_simple_deployment=False):
         """ extract service, packages etc. from service and deployment spec"""
 
+        # Extraction modifies the specs, so extracted entities are reused
+        # when blueprint is compiled again
+        pod_dict = vars(cls).get("__pod_dict__", None)
+        if pod_dict is None:
+            pod_dict = cls._extract_deployment(is_simple_deployment)
+            setattr(cls, "__pod_dict__", pod_dict)
+
+        return pod_dict
+
+    def _extract_deployment(cls, is_simple_deployment=False):
+
         service_definition_list = []
         package_definition_list = []
         substrate_definition_list = []
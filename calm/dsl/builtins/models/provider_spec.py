@@ -1,3 +1,5 @@
+import hashlib
+import json
 import os
 import sys
 import inspect
@@ -7,6 +9,7 @@ from calm.dsl.builtins import file_exists
 
 from .entity import EntityType
 from .validator import PropertyValidator
+from calm.dsl.tools.compile_deps import record_file
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -17,6 +20,23 @@ class ProviderSpecType(EntityType):
     __openapi_type__ = "app_provider_spec"
 
 
+# Content digests of specs, per provider type, which are left unchanged by
+# validation. Validation also fills defaults in spec, so other specs are
+# validated again till they reach such content.
+_VALIDATED_SPECS = set()
+
+
+def _get_spec_digest(spec):
+    """returns content digest of spec, None if spec is not json serializable"""
+
+    try:
+        data = json.dumps(spec, sort_keys=True)
+    except (TypeError, ValueError):
+        return None
+
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
 class _ProviderSpec(metaclass=ProviderSpecType):
     def __init__(self, spec):
 
@@ -24,9 +44,16 @@ class _ProviderSpec(metaclass=ProviderSpecType):
 
     def __validate__(self, provider_type):
 
+        spec_digest = _get_spec_digest(self.spec)
+        if spec_digest and (provider_type, spec_digest) in _VALIDATED_SPECS:
+            return self.spec
+
         Provider = get_provider(provider_type)
         Provider.validate_spec(self.spec)
 
+        if spec_digest and spec_digest == _get_spec_digest(self.spec):
+            _VALIDATED_SPECS.add((provider_type, spec_digest))
+
         return self.spec
 
     def __get__(self, instance, cls):
@@ -52,6 +79,7 @@ def read_spec(filename, depth=1):
         LOG.debug("file {} not found at location {}".format(filename, file_path))
         raise ValueError("file {} not found".format(filename))
 
+    record_file(file_path)
     with open(file_path, "r") as f:
         spec = yaml.safe_load(f.read())
 
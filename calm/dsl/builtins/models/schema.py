@@ -1,20 +1,18 @@
 """ Schema should be according to OpenAPI 3 format with x-calm-dsl-type extension"""
 
-import json
 from copy import deepcopy
-from io import StringIO
 
-from ruamel import yaml
-from jinja2 import Environment, PackageLoader
 import jsonref
 from bidict import bidict
 
 from .validator import get_property_validators
+from calm.dsl.tools import get_yaml_template_json
 from calm.dsl.log import get_logging_handle
 
 
 LOG = get_logging_handle(__name__)
 _SCHEMAS = None
+_SCHEMA_DETAILS = {}
 
 
 def _get_all_schemas():
@@ -26,14 +24,8 @@ def _get_all_schemas():
 
 def _load_all_schemas(schema_file="main.yaml.jinja2"):
 
-    loader = PackageLoader(__name__, "schemas")
-    env = Environment(loader=loader)
-    template = env.get_template(schema_file)
-
-    tdict = yaml.safe_load(StringIO(template.render()))
-
     # Check if all references are resolved
-    tdict = jsonref.loads(json.dumps(tdict))
+    tdict = jsonref.loads(get_yaml_template_json(__name__, schema_file, "schemas"))
     # print(json.dumps(tdict, cls=EntityJSONEncoder, indent=4, separators=(",", ": ")))
 
     schemas = tdict["components"]["schemas"]
@@ -149,8 +141,16 @@ def get_validators_with_defaults(schema_props):
 
 
 def get_schema_details(schema_name):
-
-    schema_props = get_schema_props(schema_name)
-    validators, defaults, display_map = get_validators_with_defaults(schema_props)
-
-    return schema_props, validators, defaults, display_map
+    """
+        returns (schema_props, validators, defaults, display_map) of schema.
+        Details are computed once per schema, on first use
+    """
+
+    details = _SCHEMA_DETAILS.get(schema_name, None)
+    if details is None:
+        schema_props = get_schema_props(schema_name)
+        validators, defaults, display_map = get_validators_with_defaults(schema_props)
+        details = (schema_props, validators, defaults, display_map)
+        _SCHEMA_DETAILS[schema_name] = details
+
+    return details
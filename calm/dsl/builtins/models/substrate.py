@@ -1,7 +1,7 @@
 from .entity import EntityType, Entity, EntityTypeBase, EntityDict
 from .validator import PropertyValidator
 from .provider_spec import provider_spec
-from .client_attrs import update_dsl_metadata_map, get_dsl_metadata_map
+from .client_attrs import update_dsl_metadata_map, get_dsl_metadata_snapshot
 
 
 # Substrate
@@ -193,7 +193,7 @@ class SubstrateType(EntityType):
         provider_spec = cls.provider_spec
         if isinstance(provider_spec, AhvVmType):
             ui_name = getattr(cls, "name", "") or cls.__name__
-            sub_metadata = get_dsl_metadata_map([cls.__schema_name__, ui_name])
+            sub_metadata = get_dsl_metadata_snapshot([cls.__schema_name__, ui_name])
 
             vm_dsl_name = provider_spec.__name__
             vm_display_name = getattr(provider_spec, "name", "") or vm_dsl_name
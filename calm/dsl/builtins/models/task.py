@@ -8,6 +8,7 @@ from .validator import PropertyValidator
 from .ref import RefType
 from .task_input import TaskInputType
 from .variable import CalmVariable
+from calm.dsl.tools.compile_deps import record_file
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -121,6 +122,7 @@ def _exec_create(
             os.path.dirname(sys._getframe(depth).f_globals.get("__file__")), filename
         )
 
+        record_file(file_path)
         with open(file_path, "r") as scriptf:
             script = scriptf.read()
 
@@ -156,6 +158,7 @@ def _decision_create(
             os.path.dirname(sys._getframe(depth).f_globals.get("__file__")), filename
         )
 
+        record_file(file_path)
         with open(file_path, "r") as scriptf:
             script = scriptf.read()
 
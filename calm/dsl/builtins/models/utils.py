@@ -7,6 +7,12 @@ from ruamel import yaml
 import re
 from calm.dsl.log import get_logging_handle
 from calm.dsl.config import get_init_data
+from calm.dsl.tools.compile_deps import (
+    is_recording,
+    record_env,
+    record_file,
+    record_uncacheable,
+)
 
 LOG = get_logging_handle(__name__)
 
@@ -27,6 +33,7 @@ def read_file(filename, depth=1):
         LOG.debug("file {} not found at location {}".format(filename, file_path))
         raise ValueError("file {} not found".format(filename))
 
+    record_file(file_path)
     with open(file_path, "r") as data:
         return data.read()
 
@@ -59,11 +66,12 @@ def read_env(relpath=".env"):
     filepath = _get_caller_filepath(relpath)
 
     LOG.debug("Reading env from file: {}".format(filepath))
+    record_file(filepath)
 
     # Check if file path exists
     if not os.path.exists(filepath):
         LOG.warning("env file {} not found.".format(filepath))
-        return os_env
+        return _RecordedEnv(os_env) if is_recording() else os_env
 
     # Read env
     with open(filepath, "r") as f:
@@ -100,7 +108,50 @@ def read_env(relpath=".env"):
     # Give priority to local env over OS env
     env = {**os_env, **local_env}
 
-    return env
+    return _RecordedEnv(env, local_env) if is_recording() else env
+
+
+class _RecordedEnv(dict):
+    """env dict recording the os env variables read from it, while compiling"""
+
+    def __init__(self, env, local_env={}):
+        super().__init__(env)
+        self._local_env = local_env
+
+    def _record(self, name):
+        if name not in self._local_env:
+            record_env(name)
+
+    def _record_all(self):
+        record_uncacheable("all env variables are read")
+
+    def __getitem__(self, name):
+        self._record(name)
+        return super().__getitem__(name)
+
+    def __contains__(self, name):
+        self._record(name)
+        return super().__contains__(name)
+
+    def get(self, name, default=None):
+        self._record(name)
+        return super().get(name, default)
+
+    def __iter__(self):
+        self._record_all()
+        return super().__iter__()
+
+    def keys(self):
+        self._record_all()
+        return super().keys()
+
+    def items(self):
+        self._record_all()
+        return super().items()
+
+    def values(self):
+        self._record_all()
+        return super().values()
 
 
 def file_exists(file_path):
@@ -116,6 +167,7 @@ def read_local_file(filename):
     )
 
     # If not exists read from home directory
+    record_file(abs_file_path)
     if not file_exists(abs_file_path):
         init_obj = get_init_data()
         file_path = os.path.join(init_obj["LOCAL_DIR"].get("location"), filename)
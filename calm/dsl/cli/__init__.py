@@ -1,17 +1,139 @@
+import importlib
+
 from .main import main
-from .bp_commands import *  # NoQA
-from .app_commands import *  # NoQA
-from .runbook_commands import *  # NoQA
-from .endpoint_commands import *  # NoQA
-from .config_commands import *  # NoQA
-from .account_commands import *  # NoQA
-from .project_commands import *  # NoQA
-from .secret_commands import *  # NoQA
-from .cache_commands import *  # NoQA
-from .completion_commands import *  # NoQA
-from .init_command import *  # NoQA
 from calm.dsl.api import get_api_client
-from .mpis_commands import *  # NoQA
-from .app_icon_commands import *  # NoQA
 
-__all__ = ["main", "get_api_client"]
+# Subcommands are registered by name only. The module defining a subcommand is
+# imported when the subcommand is resolved, so a command doesn't pay the import
+# cost of the others. Keep this map in sync while adding new commands.
+# Format: {group_name: {subcommand_name: module_name}}
+LAZY_COMMANDS = {
+    "main": {
+        "restart": "app_commands",
+        "start": "app_commands",
+        "stop": "app_commands",
+    },
+    "abort": {"runbook_execution": "runbook_commands"},
+    "approve": {"marketplace_bp": "mpis_commands"},
+    "clear": {"cache": "cache_commands", "secrets": "secret_commands"},
+    "compile": {
+        "bp": "bp_commands",
+        "endpoint": "endpoint_commands",
+        "runbook": "runbook_commands",
+    },
+    "completion": {"install": "completion_commands", "show": "completion_commands"},
+    "create": {
+        "app_icon": "app_icon_commands",
+        "bp": "bp_commands",
+        "endpoint": "endpoint_commands",
+        "project": "project_commands",
+        "runbook": "runbook_commands",
+        "secret": "secret_commands",
+    },
+    "decompile": {"bp": "bp_commands", "marketplace_bp": "mpis_commands"},
+    "delete": {
+        "account": "account_commands",
+        "app": "app_commands",
+        "app_icon": "app_icon_commands",
+        "bp": "bp_commands",
+        "endpoint": "endpoint_commands",
+        "marketplace_bp": "mpis_commands",
+        "project": "project_commands",
+        "runbook": "runbook_commands",
+        "secret": "secret_commands",
+    },
+    "describe": {
+        "account": "account_commands",
+        "app": "app_commands",
+        "bp": "bp_commands",
+        "endpoint": "endpoint_commands",
+        "marketplace_bp": "mpis_commands",
+        "marketplace_item": "mpis_commands",
+        "project": "project_commands",
+        "runbook": "runbook_commands",
+    },
+    "download": {"action_runlog": "app_commands"},
+    "format": {
+        "bp": "bp_commands",
+        "endpoint": "endpoint_commands",
+        "runbook": "runbook_commands",
+    },
+    "get": {
+        "accounts": "account_commands",
+        "app_icons": "app_icon_commands",
+        "apps": "app_commands",
+        "bps": "bp_commands",
+        "endpoints": "endpoint_commands",
+        "marketplace_bps": "mpis_commands",
+        "marketplace_items": "mpis_commands",
+        "projects": "project_commands",
+        "runbook_executions": "runbook_commands",
+        "runbooks": "runbook_commands",
+        "secrets": "secret_commands",
+    },
+    "init": {"bp": "init_command", "dsl": "init_command", "runbook": "init_command"},
+    "launch": {
+        "bp": "bp_commands",
+        "marketplace_bp": "mpis_commands",
+        "marketplace_item": "mpis_commands",
+    },
+    "pause": {"runbook_execution": "runbook_commands"},
+    "publish": {"bp": "mpis_commands", "marketplace_bp": "mpis_commands"},
+    "reject": {"marketplace_bp": "mpis_commands"},
+    "resume": {"runbook_execution": "runbook_commands"},
+    "run": {"action": "app_commands", "runbook": "runbook_commands"},
+    "set": {"config": "init_command"},
+    "show": {"cache": "cache_commands", "config": "config_commands"},
+    "unpublish": {"marketplace_bp": "mpis_commands"},
+    "update": {
+        "cache": "cache_commands",
+        "marketplace_bp": "mpis_commands",
+        "project": "project_commands",
+        "runbook": "runbook_commands",
+        "secret": "secret_commands",
+    },
+    "watch": {
+        "action_runlog": "app_commands",
+        "app": "app_commands",
+        "runbook_execution": "runbook_commands",
+    },
+}
+
+_COMMAND_MODULES = sorted(
+    {module for cmd_map in LAZY_COMMANDS.values() for module in cmd_map.values()}
+)
+
+
+def _register_lazy_commands():
+
+    for group_name, cmd_map in LAZY_COMMANDS.items():
+        group = main if group_name == "main" else main.commands[group_name]
+        group.add_lazy_commands(
+            {
+                cmd_name: "{}.{}".format(__name__, module_name)
+                for cmd_name, module_name in cmd_map.items()
+            }
+        )
+
+
+def load_all_commands():
+    """Imports all command modules"""
+
+    for module_name in _COMMAND_MODULES:
+        importlib.import_module("{}.{}".format(__name__, module_name))
+
+
+def __getattr__(name):
+    """Helpers of command modules were exported from here earlier"""
+
+    for module_name in _COMMAND_MODULES:
+        module = importlib.import_module("{}.{}".format(__name__, module_name))
+        if hasattr(module, name):
+            return getattr(module, name)
+
+    raise AttributeError("module {} has no attribute {}".format(__name__, name))
+
+
+_register_lazy_commands()
+
+__all__ = ["main", "get_api_client", "load_all_commands"]
@@ -3,7 +3,7 @@ import click
 from calm.dsl.api import get_api_client
 
 from .main import main, get, describe, delete, run, watch, download
-from .utils import Display, FeatureFlagGroup
+from .utils import Display, FeatureFlagGroup, poll_options
 from .apps import (
     get_apps,
     describe_app,
@@ -33,6 +33,13 @@ LOG = get_logging_handle(__name__)
 @click.option(
     "--all-items", "-a", is_flag=True, help="Get all items, including deleted ones"
 )
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    default=False,
+    help="Get items from all pages, instead of a single page of given limit",
+)
 @click.option(
     "--out",
     "-o",
@@ -41,9 +48,9 @@ LOG = get_logging_handle(__name__)
     default="text",
     help="output format",
 )
-def _get_apps(name, filter_by, limit, offset, quiet, all_items, out):
+def _get_apps(name, filter_by, limit, offset, quiet, all_items, out, all_pages):
     """Get Apps, optionally filtered by a string"""
-    get_apps(name, filter_by, limit, offset, quiet, all_items, out)
+    get_apps(name, filter_by, limit, offset, quiet, all_items, out, all_pages)
 
 
 @describe.command("app")
@@ -72,20 +79,23 @@ def _describe_app(app_name, out):
     help="Watch action run in an app",
 )
 @click.option("--watch/--no-watch", "-w", default=False, help="Watch scrolling output")
-def _run_actions(app_name, action_name, watch):
+@poll_options()
+def _run_actions(app_name, action_name, watch, poll_interval, timeout):
     """App lcm actions"""
-    render_actions = display_with_screen(app_name, action_name, watch)
+    render_actions = display_with_screen(
+        app_name, action_name, watch, poll_interval, timeout
+    )
     Display.wrapper(render_actions, watch)
 
 
-def display_with_screen(app_name, action_name, watch):
+def display_with_screen(app_name, action_name, watch, poll_interval=None, timeout=None):
     def render_actions(screen):
         screen.clear()
         screen.print_at(
             "Running action {} for app {}".format(action_name, app_name), 0, 0
         )
         screen.refresh()
-        run_actions(screen, app_name, action_name, watch)
+        run_actions(screen, app_name, action_name, watch, poll_interval, timeout)
         screen.wait_for_input(10.0)
 
     return render_actions
@@ -101,20 +111,14 @@ def display_with_screen(app_name, action_name, watch):
     required=True,
     help="Watch action run in an app",
 )
-@click.option(
-    "--poll-interval",
-    "poll_interval",
-    "-p",
-    type=int,
-    default=10,
-    show_default=True,
-    help="Give polling interval",
-)
-def _watch_action_runlog(runlog_uuid, app_name, poll_interval):
+@poll_options(interval_names=("--poll-interval", "-p"))
+def _watch_action_runlog(runlog_uuid, app_name, poll_interval, timeout):
     """Watch an app"""
 
     def display_action(screen):
-        watch_action(runlog_uuid, app_name, get_api_client(), screen, poll_interval)
+        watch_action(
+            runlog_uuid, app_name, get_api_client(), screen, poll_interval, timeout
+        )
         screen.wait_for_input(10.0)
 
     Display.wrapper(display_action, watch=True)
@@ -123,20 +127,12 @@ def _watch_action_runlog(runlog_uuid, app_name, poll_interval):
 
 @watch.command("app")
 @click.argument("app_name")
-@click.option(
-    "--poll-interval",
-    "poll_interval",
-    "-p",
-    type=int,
-    default=10,
-    show_default=True,
-    help="Give polling interval",
-)
-def _watch_app(app_name, poll_interval):
+@poll_options(interval_names=("--poll-interval", "-p"))
+def _watch_app(app_name, poll_interval, timeout):
     """Watch an app"""
 
     def display_action(screen):
-        watch_app(app_name, screen)
+        watch_app(app_name, screen, poll_interval=poll_interval, timeout=timeout)
         screen.wait_for_input(10.0)
 
     Display.wrapper(display_action, watch=True)
@@ -184,28 +180,37 @@ def restart():
 @start.command("app")
 @click.argument("app_name")
 @click.option("--watch/--no-watch", "-w", default=False, help="Watch scrolling output")
-def start_app(app_name, watch):
+@poll_options()
+def start_app(app_name, watch, poll_interval, timeout):
     """Starts an application"""
 
-    render_actions = display_with_screen(app_name, "start", watch)
+    render_actions = display_with_screen(
+        app_name, "start", watch, poll_interval, timeout
+    )
     Display.wrapper(render_actions, watch)
 
 
 @stop.command("app")
 @click.argument("app_name")
 @click.option("--watch/--no-watch", "-w", default=False, help="Watch scrolling output")
-def stop_app(app_name, watch):
+@poll_options()
+def stop_app(app_name, watch, poll_interval, timeout):
     """Stops an application"""
 
-    render_actions = display_with_screen(app_name, "stop", watch)
+    render_actions = display_with_screen(
+        app_name, "stop", watch, poll_interval, timeout
+    )
     Display.wrapper(render_actions, watch)
 
 
 @restart.command("app")
 @click.argument("app_name")
 @click.option("--watch/--no-watch", "-w", default=False, help="Watch scrolling output")
-def restart_app(app_name, watch):
+@poll_options()
+def restart_app(app_name, watch, poll_interval, timeout):
     """Restarts an application"""
 
-    render_actions = display_with_screen(app_name, "restart", watch)
+    render_actions = display_with_screen(
+        app_name, "restart", watch, poll_interval, timeout
+    )
     Display.wrapper(render_actions, watch)
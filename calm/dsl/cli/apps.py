@@ -17,6 +17,7 @@ from .utils import (
     get_states_filter,
     highlight_text,
     Display,
+    Poller,
 )
 from .constants import APPLICATION, RUNLOG, SYSTEM_ACTIONS
 from calm.dsl.log import get_logging_handle
@@ -24,7 +25,7 @@ from calm.dsl.log import get_logging_handle
 LOG = get_logging_handle(__name__)
 
 
-def get_apps(name, filter_by, limit, offset, quiet, all_items, out):
+def get_apps(name, filter_by, limit, offset, quiet, all_items, out, all_pages=False):
     client = get_api_client()
     config = get_config()
 
@@ -42,7 +43,13 @@ def get_apps(name, filter_by, limit, offset, quiet, all_items, out):
     if filter_query:
         params["filter"] = filter_query
 
-    res, err = client.application.list(params=params)
+    if all_pages:
+        # Fetch all pages concurrently instead of a single page of given limit
+        params.pop("length")
+        res, err = client.application.list_all(params=params)
+    else:
+        res, err = client.application.list(params=params)
+        res = None if err else res.json()
 
     if err:
         pc_ip = config["SERVER"]["pc_ip"]
@@ -50,10 +57,10 @@ def get_apps(name, filter_by, limit, offset, quiet, all_items, out):
         return
 
     if out == "json":
-        click.echo(json.dumps(res.json(), indent=4, separators=(",", ": ")))
+        click.echo(json.dumps(res, indent=4, separators=(",", ": ")))
         return
 
-    json_rows = res.json()["entities"]
+    json_rows = res["entities"]
     if not json_rows:
         click.echo(highlight_text("No application found !!!\n"))
         return
@@ -394,7 +401,9 @@ def get_completion_func(screen):
     return is_action_complete
 
 
-def watch_action(runlog_uuid, app_name, client, screen, poll_interval=10):
+def watch_action(
+    runlog_uuid, app_name, client, screen, poll_interval=None, timeout=None
+):
     app = _get_app(client, app_name, screen=screen)
     app_uuid = app["metadata"]["uuid"]
 
@@ -404,10 +413,10 @@ def watch_action(runlog_uuid, app_name, client, screen, poll_interval=10):
     def poll_func():
         return client.application.poll_action_run(url, payload)
 
-    poll_action(poll_func, get_completion_func(screen), poll_interval)
+    poll_action(poll_func, get_completion_func(screen), poll_interval, timeout)
 
 
-def watch_app(app_name, screen, app=None):
+def watch_app(app_name, screen, app=None, poll_interval=None, timeout=None):
     """Watch an app"""
 
     client = get_api_client()
@@ -511,11 +520,10 @@ def watch_app(app_name, screen, app=None):
             if not is_app_describe:
                 screen.print_at(msg, 0, line)
                 screen.refresh()
-                time.sleep(10)
             return (is_complete, msg)
         return (False, "")
 
-    poll_action(poll_func, is_complete)
+    poll_action(poll_func, is_complete, poll_interval, timeout)
 
 
 def delete_app(app_names, soft=False):
@@ -536,7 +544,7 @@ def delete_app(app_names, soft=False):
         LOG.info("Action runlog uuid: {}".format(runlog_id))
 
 
-def run_actions(screen, app_name, action_name, watch):
+def run_actions(screen, app_name, action_name, watch, poll_interval=None, timeout=None):
     client = get_api_client()
 
     if action_name.lower() == SYSTEM_ACTIONS.CREATE:
@@ -583,25 +591,21 @@ def run_actions(screen, app_name, action_name, watch):
     )
     screen.refresh()
     if watch:
-        watch_action(runlog_uuid, app_name, client, screen=screen)
+        watch_action(
+            runlog_uuid,
+            app_name,
+            client,
+            screen=screen,
+            poll_interval=poll_interval,
+            timeout=timeout,
+        )
 
 
-def poll_action(poll_func, completion_func, poll_interval=10):
-    # Poll every 10 seconds on the app status, for 5 mins
-    maxWait = 5 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
-        res, err = poll_func()
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-        response = res.json()
-        (completed, msg) = completion_func(response)
-        if completed:
-            # click.echo(msg)
-            break
-        count += poll_interval
-        time.sleep(poll_interval)
+def poll_action(poll_func, completion_func, poll_interval=None, timeout=None):
+    """polls till completion, returns True if completed before timeout"""
+
+    completed, _ = Poller(poll_interval, timeout).poll(poll_func, completion_func)
+    return completed
 
 
 def download_runlog(runlog_id, app_name, file_name):
@@ -0,0 +1,190 @@
+"""
+batch_compile: Compiles all dsl files of a directory over a process pool
+
+Each worker is spawned once and warmed up with config, schemas and local db
+loaded, and then compiles the dsl files one by one. Failures are reported per
+file, without stopping the other compiles.
+
+Only python files importing calm.dsl are compiled, and script directories are
+skipped, so that task scripts kept along with the dsl files are not executed.
+"""
+
+import os
+import re
+import sys
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import click
+from ruamel import yaml
+
+from calm.dsl.config import get_config, update_config_file_location
+from calm.dsl.config.config import get_user_config_file
+from calm.dsl.db import get_db_handle
+from calm.dsl.store import Cache, Version
+from calm.dsl.log import CustomLogging, get_logging_handle
+
+from .compile_cache import set_compile_cache, is_compile_cache_enabled
+
+LOG = get_logging_handle(__name__)
+
+# Directories having task scripts, not dsl files
+SKIPPED_DIRS = ("__pycache__", "scripts")
+
+DSL_IMPORT_PATTERN = re.compile(r"^\s*(from|import)\s+calm\.dsl\b", re.MULTILINE)
+
+
+def is_dsl_file(file_path):
+    """checks whether the python file imports calm dsl, without executing it"""
+
+    try:
+        with open(file_path, "r", encoding="utf-8", errors="ignore") as fd:
+            return bool(DSL_IMPORT_PATTERN.search(fd.read()))
+    except OSError:
+        return False
+
+
+def get_dsl_files(dsl_dir):
+    """returns dsl files present in the directory tree, in sorted order"""
+
+    dsl_files = []
+    for root, dirs, files in os.walk(dsl_dir):
+        dirs[:] = sorted(
+            d for d in dirs if not d.startswith(".") and d not in SKIPPED_DIRS
+        )
+        for file_name in sorted(files):
+            if not file_name.endswith(".py") or file_name == "__init__.py":
+                continue
+
+            file_path = os.path.join(root, file_name)
+            if is_dsl_file(file_path):
+                dsl_files.append(file_path)
+
+    return dsl_files
+
+
+def _init_worker(config_file, log_level, compile_cache_enabled):
+    """warms up the worker before it compiles any dsl file"""
+
+    CustomLogging.set_verbose_level(log_level)
+    update_config_file_location(config_file)
+    set_compile_cache(compile_cache_enabled)
+
+    # Loads the entity schemas
+    import calm.dsl.builtins  # noqa: F401
+
+    get_config()
+    get_db_handle()
+    Version.get_version("Calm")
+
+
+def _compile_file(compile_func, dsl_file):
+    """returns (payload, error) of the compiled dsl file"""
+
+    try:
+        payload = compile_func(dsl_file)
+    except (Exception, SystemExit) as exc:
+        LOG.debug("Failed to compile {}".format(dsl_file), exc_info=True)
+        return None, "{}: {}".format(type(exc).__name__, exc)
+
+    return payload, None
+
+
+def compile_dsl_files(compile_func, dsl_files, max_workers=None):
+    """
+        compiles the dsl files using compile_func over a process pool.
+        returns list of (dsl_file, payload, error) in the order of dsl files
+    """
+
+    if not dsl_files:
+        return []
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(dsl_files))
+
+    # Workers are spawned, so that connection to local db is not shared with them
+    executor = ProcessPoolExecutor(
+        max_workers=max_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(
+            get_user_config_file(),
+            CustomLogging.get_verbose_level(),
+            is_compile_cache_enabled(),
+        ),
+    )
+
+    results = []
+    with executor:
+        futures = [
+            executor.submit(_compile_file, compile_func, dsl_file)
+            for dsl_file in dsl_files
+        ]
+        for dsl_file, future in zip(dsl_files, futures):
+            try:
+                payload, err = future.result()
+            except Exception as exc:
+                # ex: worker crashed while compiling
+                payload, err = None, "{}: {}".format(type(exc).__name__, exc)
+
+            results.append((dsl_file, payload, err))
+
+    return results
+
+
+def compile_dir_command(compile_func, entity_type, dsl_dir, out):
+    """compiles all dsl files in the directory, prints payload of each file"""
+
+    dsl_files = get_dsl_files(dsl_dir)
+    if not dsl_files:
+        LOG.error("No DSL files found in {}".format(dsl_dir))
+        sys.exit(-1)
+
+    config = get_config()
+
+    project_name = config["PROJECT"].get("name", "default")
+    project_cache_data = Cache.get_entity_data(entity_type="project", name=project_name)
+
+    if not project_cache_data:
+        LOG.error(
+            "Project {} not found. Please run: calm update cache".format(project_name)
+        )
+        sys.exit(-1)
+
+    project_reference = {
+        "type": "project",
+        "uuid": project_cache_data.get("uuid", ""),
+        "name": project_name,
+    }
+
+    LOG.info("Compiling {} DSL files in {}".format(len(dsl_files), dsl_dir))
+    payloads = {}
+    failed_files = []
+    for dsl_file, payload, err in compile_dsl_files(compile_func, dsl_files):
+        # ex: module having entities imported by other dsl files
+        if payload is None and err is None:
+            LOG.info("No {} found in {}, skipping it".format(entity_type, dsl_file))
+            continue
+
+        if err:
+            LOG.error("Failed to compile {}: {}".format(dsl_file, err))
+            failed_files.append(dsl_file)
+            continue
+
+        payload["metadata"]["project_reference"] = project_reference
+        payloads[os.path.relpath(dsl_file, dsl_dir)] = payload
+
+    if out == "json":
+        click.echo(json.dumps(payloads, indent=4, separators=(",", ": ")))
+    elif out == "yaml":
+        click.echo(yaml.dump(payloads, default_flow_style=False))
+    else:
+        LOG.error("Unknown output format {} given".format(out))
+
+    if failed_files:
+        LOG.error(
+            "Failed to compile {} of {} DSL files".format(
+                len(failed_files), len(dsl_files)
+            )
+        )
+        sys.exit(-1)
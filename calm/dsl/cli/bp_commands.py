@@ -4,11 +4,12 @@ import sys
 import click
 
 from calm.dsl.api import get_api_client
+from calm.dsl.api.util import is_upload_skipped
 from calm.dsl.config import get_config
 from calm.dsl.log import get_logging_handle
 
 from .secrets import find_secret, create_secret
-from .utils import highlight_text
+from .utils import highlight_text, poll_options
 from .main import get, compile, describe, create, launch, delete, decompile, format
 from .bps import (
     get_blueprint_list,
@@ -20,6 +21,7 @@ from .bps import (
     delete_blueprint,
     decompile_bp,
 )
+from .batch_compile import compile_dir_command
 
 LOG = get_logging_handle(__name__)
 
@@ -39,6 +41,13 @@ LOG = get_logging_handle(__name__)
 @click.option(
     "--all-items", "-a", is_flag=True, help="Get all items, including deleted ones"
 )
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    default=False,
+    help="Get items from all pages, instead of a single page of given limit",
+)
 @click.option(
     "--out",
     "-o",
@@ -47,10 +56,12 @@ LOG = get_logging_handle(__name__)
     default="text",
     help="output format",
 )
-def _get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out):
+def _get_blueprint_list(
+    name, filter_by, limit, offset, quiet, all_items, out, all_pages
+):
     """Get the blueprints, optionally filtered by a string"""
 
-    get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out)
+    get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out, all_pages)
 
 
 @describe.command("bp")
@@ -88,8 +99,14 @@ def _format_blueprint_command(bp_file):
     "-f",
     "bp_file",
     type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
-    required=True,
-    help="Path of Blueprint file to upload",
+    help="Path of Blueprint file to compile",
+)
+@click.option(
+    "--dir",
+    "-d",
+    "dsl_dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, readable=True),
+    help="Path of directory having Blueprint files to compile",
 )
 @click.option(
     "--out",
@@ -99,9 +116,17 @@ def _format_blueprint_command(bp_file):
     default="json",
     help="output format",
 )
-def _compile_blueprint_command(bp_file, out):
-    """Compiles a DSL (Python) blueprint into JSON or YAML"""
-    compile_blueprint_command(bp_file, out)
+def _compile_blueprint_command(bp_file, dsl_dir, out):
+    """Compiles a DSL (Python) blueprint or a directory of them into JSON or YAML"""
+
+    if bool(bp_file) == bool(dsl_dir):
+        LOG.error("One of either Blueprint File or Directory is required to compile.")
+        sys.exit(-1)
+
+    if dsl_dir:
+        compile_dir_command(compile_blueprint, "blueprint", dsl_dir, out)
+    else:
+        compile_blueprint_command(bp_file, out)
 
 
 @decompile.command("bp", experimental=True)
@@ -127,7 +152,13 @@ def _decompile_bp(name, bp_file, with_secrets):
 
 
 def create_blueprint(
-    client, bp_payload, name=None, description=None, categories=None, force_create=False
+    client,
+    bp_payload,
+    name=None,
+    description=None,
+    categories=None,
+    force_create=False,
+    force_upload=False,
 ):
 
     bp_payload.pop("status", None)
@@ -174,11 +205,17 @@ def create_blueprint(
         bp_resources,
         categories=categories,
         force_create=force_create,
+        force_upload=force_upload,
     )
 
 
 def create_blueprint_from_json(
-    client, path_to_json, name=None, description=None, force_create=False
+    client,
+    path_to_json,
+    name=None,
+    description=None,
+    force_create=False,
+    force_upload=False,
 ):
 
     with open(path_to_json, "r") as f:
@@ -189,11 +226,12 @@ def create_blueprint_from_json(
         name=name,
         description=description,
         force_create=force_create,
+        force_upload=force_upload,
     )
 
 
 def create_blueprint_from_dsl(
-    client, bp_file, name=None, description=None, force_create=False
+    client, bp_file, name=None, description=None, force_create=False, force_upload=False
 ):
 
     bp_payload = compile_blueprint(bp_file)
@@ -208,6 +246,7 @@ def create_blueprint_from_dsl(
         name=name,
         description=description,
         force_create=force_create,
+        force_upload=force_upload,
     )
 
 
@@ -229,20 +268,38 @@ def create_blueprint_from_dsl(
     "-fc",
     is_flag=True,
     default=False,
-    help="Deletes existing blueprint with the same name before create.",
+    help="Deletes existing blueprint with the same name before create. "
+    "Existing blueprint is kept if it is unchanged since the last upload.",
+)
+@click.option(
+    "--force-upload",
+    "force_upload",
+    is_flag=True,
+    default=False,
+    help="Uploads the blueprint with --force, even if it is unchanged since the last upload.",
 )
-def create_blueprint_command(bp_file, name, description, force):
+def create_blueprint_command(bp_file, name, description, force, force_upload):
     """Creates a blueprint"""
 
     client = get_api_client()
 
     if bp_file.endswith(".json"):
         res, err = create_blueprint_from_json(
-            client, bp_file, name=name, description=description, force_create=force
+            client,
+            bp_file,
+            name=name,
+            description=description,
+            force_create=force,
+            force_upload=force_upload,
         )
     elif bp_file.endswith(".py"):
         res, err = create_blueprint_from_dsl(
-            client, bp_file, name=name, description=description, force_create=force
+            client,
+            bp_file,
+            name=name,
+            description=description,
+            force_create=force,
+            force_upload=force_upload,
         )
     else:
         LOG.error("Unknown file format {}".format(bp_file))
@@ -277,7 +334,14 @@ def create_blueprint_command(bp_file, name, description, force):
         )
         sys.exit(-1)
 
-    LOG.info("Blueprint {} created successfully.".format(bp_name))
+    if is_upload_skipped(res):
+        LOG.info(
+            "Blueprint {} is unchanged, skipped upload. Use --force-upload to upload it anyway.".format(
+                bp_name
+            )
+        )
+    else:
+        LOG.info("Blueprint {} created successfully.".format(bp_name))
     config = get_config()
     pc_ip = config["SERVER"]["pc_ip"]
     pc_port = config["SERVER"]["pc_port"]
@@ -314,12 +378,15 @@ def create_blueprint_command(bp_file, name, description, force):
     type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
     help="Path to python file for runtime editables",
 )
+@poll_options()
 def launch_blueprint_command(
     blueprint_name,
     app_name,
     ignore_runtime_variables,
     profile_name,
     launch_params,
+    poll_interval,
+    timeout,
     blueprint=None,
 ):
     """Launches a blueprint.
@@ -350,6 +417,8 @@ Sample context for variables:
         profile_name=profile_name,
         patch_editables=not ignore_runtime_variables,
         launch_params=launch_params,
+        poll_interval=poll_interval,
+        timeout=timeout,
     )
 
 
@@ -8,7 +8,6 @@ from ruamel import yaml
 import arrow
 import click
 from prettytable import PrettyTable
-from black import format_file_in_place, WriteBack, FileMode
 
 from calm.dsl.builtins import (
     Blueprint,
@@ -17,8 +16,9 @@ from calm.dsl.builtins import (
     BlueprintType,
     get_valid_identifier,
     file_exists,
-    get_dsl_metadata_map,
+    get_dsl_metadata_snapshot,
     init_dsl_metadata_map,
+    reset_dsl_metadata_map,
 )
 from calm.dsl.config import get_config
 from calm.dsl.api import get_api_client
@@ -31,8 +31,10 @@ from .utils import (
     highlight_text,
     get_module_from_file,
     import_var_from_file,
+    Poller,
 )
 from .constants import BLUEPRINT
+from .compile_cache import compile_with_cache
 from calm.dsl.store import Cache
 from calm.dsl.log import get_logging_handle
 from calm.dsl.providers import get_provider
@@ -40,7 +42,9 @@ from calm.dsl.providers import get_provider
 LOG = get_logging_handle(__name__)
 
 
-def get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out):
+def get_blueprint_list(
+    name, filter_by, limit, offset, quiet, all_items, out, all_pages=False
+):
     """Get the blueprints, optionally filtered by a string"""
 
     client = get_api_client()
@@ -60,7 +64,13 @@ def get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out):
     if filter_query:
         params["filter"] = filter_query
 
-    res, err = client.blueprint.list(params=params)
+    if all_pages:
+        # Fetch all pages concurrently instead of a single page of given limit
+        params.pop("length")
+        res, err = client.blueprint.list_all(params=params)
+    else:
+        res, err = client.blueprint.list(params=params)
+        res = None if err else res.json()
 
     if err:
         pc_ip = config["SERVER"]["pc_ip"]
@@ -68,10 +78,10 @@ def get_blueprint_list(name, filter_by, limit, offset, quiet, all_items, out):
         return
 
     if out == "json":
-        click.echo(json.dumps(res.json(), indent=4, separators=(",", ": ")))
+        click.echo(json.dumps(res, indent=4, separators=(",", ": ")))
         return
 
-    json_rows = res.json()["entities"]
+    json_rows = res["entities"]
     if not json_rows:
         click.echo(highlight_text("No blueprint found !!!\n"))
         return
@@ -225,6 +235,14 @@ def get_blueprint_class_from_module(user_bp_module):
 
 
 def compile_blueprint(bp_file):
+    """returns compiled payload of blueprint dsl file, using compile cache if enabled"""
+    return compile_with_cache("blueprint", bp_file, _compile_blueprint)
+
+
+def _compile_blueprint(bp_file):
+
+    # Metadata of blueprints compiled earlier in this process is not needed
+    reset_dsl_metadata_map()
 
     user_bp_module = get_blueprint_module_from_file(bp_file)
     UserBlueprint = get_blueprint_class_from_module(user_bp_module)
@@ -239,7 +257,7 @@ def compile_blueprint(bp_file):
         bp_payload = UserBlueprintPayload.get_dict()
 
         # Adding the display map to client attr
-        display_name_map = get_dsl_metadata_map()
+        display_name_map = get_dsl_metadata_snapshot()
         bp_payload["spec"]["resources"]["client_attrs"] = {"None": display_name_map}
 
         # Note - Install/Uninstall runbooks are not actions in Packages.
@@ -377,6 +395,8 @@ def compile_blueprint_command(bp_file, out):
 
 
 def format_blueprint_command(bp_file):
+    from black import format_file_in_place, WriteBack, FileMode
+
     path = pathlib.Path(bp_file)
     LOG.debug("Formatting blueprint {} using black".format(path))
     if format_file_in_place(
@@ -699,6 +719,8 @@ def launch_blueprint_simple(
     profile_name=None,
     patch_editables=True,
     launch_params=None,
+    poll_interval=None,
+    timeout=None,
 ):
     client = get_api_client()
 
@@ -876,18 +898,23 @@ def launch_blueprint_simple(
     response = res.json()
     launch_req_id = response["status"]["request_id"]
 
-    poll_launch_status(client, blueprint_uuid, launch_req_id)
+    poll_launch_status(
+        client,
+        blueprint_uuid,
+        launch_req_id,
+        poll_interval=poll_interval,
+        timeout=timeout,
+    )
 
 
-def poll_launch_status(client, blueprint_uuid, launch_req_id):
-    # Poll every 10 seconds on the app status, for 5 mins
-    maxWait = 5 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
+def poll_launch_status(
+    client, blueprint_uuid, launch_req_id, poll_interval=None, timeout=None
+):
+    def poll_func():
         LOG.info("Polling status of Launch")
-        res, err = client.blueprint.poll_launch(blueprint_uuid, launch_req_id)
-        response = res.json()
+        return client.blueprint.poll_launch(blueprint_uuid, launch_req_id)
+
+    def is_launch_complete(response):
         app_state = response["status"]["state"]
         pprint(response)
         if app_state == "success":
@@ -904,16 +931,15 @@ def poll_launch_status(client, blueprint_uuid, launch_req_id):
                     pc_ip, pc_port, app_uuid
                 )
             )
-            break
+            return (True, "")
         elif app_state == "failure":
             LOG.debug("API response: {}".format(response))
             LOG.error("Failed to launch blueprint. Check API response above.")
-            break
-        elif err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+            return (True, "")
         LOG.info(app_state)
-        count += 10
-        time.sleep(10)
+        return (False, "")
+
+    Poller(poll_interval, timeout).poll(poll_func, is_launch_complete)
 
 
 def delete_blueprint(blueprint_names):
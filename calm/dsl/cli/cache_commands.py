@@ -1,3 +1,4 @@
+import click
 import datetime
 
 from calm.dsl.store import Cache
@@ -25,9 +26,24 @@ def clear_cache():
 
 
 @update.command("cache")
-def update_cache():
+@click.option(
+    "--workers",
+    "-w",
+    type=click.IntRange(min=1),
+    default=Cache.SYNC_WORKERS,
+    show_default=True,
+    help="Number of concurrent fetches while updating the cache",
+)
+@click.option(
+    "--incremental",
+    "-i",
+    is_flag=True,
+    default=False,
+    help="Update only the entities changed since last update",
+)
+def update_cache(workers, incremental):
     """Update the data for dynamic entities stored in the cache"""
 
-    Cache.sync()
+    Cache.sync(max_workers=workers, incremental=incremental)
     Cache.show_data()
     LOG.info(highlight_text("Cache updated at {}".format(datetime.datetime.now())))
@@ -0,0 +1,274 @@
+"""
+compile_cache: On disk cache of compiled dsl payloads
+
+Compiled payload of a dsl file is cached along with the dependencies recorded
+while compiling it (files, env variables and local cache lookups). Look at
+calm.dsl.tools.compile_deps for details. Cache entry is keyed by the content
+of dsl file, calm dsl sources and config, and it is used only if none of its
+dependencies has changed since.
+
+Payloads having secrets (credentials, secret variables, passwords) are never
+written to the cache.
+"""
+
+import os
+import sys
+import site
+import hashlib
+import sysconfig
+from functools import lru_cache
+
+from calm.dsl.api.codec import json_dumps, json_loads
+from calm.dsl.config import get_config, get_default_cache_dir, get_init_data
+from calm.dsl.store import Cache, Version
+from calm.dsl.tools.compile_deps import (
+    DependencyRecorder,
+    get_data_digest,
+    get_file_digest,
+)
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+# Bump this whenever the format of the cache entries changes
+COMPILE_CACHE_VERSION = 1
+
+# Sub directory of cache dir having compiled payloads
+COMPILE_CACHE_DIR = "compile"
+
+# Lookups recorded while compiling, to be done again to validate cache entry
+CACHE_LOOKUPS = {
+    "entity_data": Cache.get_entity_data,
+    "entity_data_using_uuid": Cache.get_entity_data_using_uuid,
+    "version": Version.get_version,
+}
+
+# Keys of the dicts having secret values in compiled payload
+SECRET_KEYS = ("secret", "password", "domain_password")
+
+_ENABLED = False
+
+
+def set_compile_cache(enabled):
+    """enables/disables the compile cache"""
+
+    global _ENABLED
+    _ENABLED = bool(enabled)
+
+
+def is_compile_cache_enabled():
+    return _ENABLED
+
+
+@lru_cache(maxsize=None)
+def get_dsl_digest():
+    """returns digest of calm dsl sources, using path, size and mtime of files"""
+
+    dsl_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    digest = hashlib.sha256()
+    for root, dirs, files in os.walk(dsl_dir):
+        dirs[:] = sorted(d for d in dirs if d != "__pycache__")
+        for file_name in sorted(files):
+            file_path = os.path.join(root, file_name)
+            file_stat = os.stat(file_path)
+            digest.update(
+                "{}:{}:{}\n".format(
+                    os.path.relpath(file_path, dsl_dir),
+                    file_stat.st_size,
+                    file_stat.st_mtime_ns,
+                ).encode("utf-8")
+            )
+
+    return digest.hexdigest()
+
+
+def _get_config_digest():
+    """returns digest of config and init data, as dsl may read local files using it"""
+
+    try:
+        config = get_config()
+        init_data = get_init_data()
+    except (FileNotFoundError, ValueError):
+        return None
+
+    return get_data_digest(
+        [
+            {section: dict(config[section]) for section in config},
+            {section: dict(init_data[section]) for section in init_data},
+        ]
+    )
+
+
+@lru_cache(maxsize=None)
+def _get_library_dirs():
+    """returns directories of python installation and calm dsl package"""
+
+    paths = set(sysconfig.get_paths().values())
+    paths.update([sys.prefix, sys.base_prefix, sys.exec_prefix])
+    if hasattr(site, "getsitepackages"):
+        paths.update(site.getsitepackages())
+
+    # calm namespace package
+    dsl_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths.add(os.path.dirname(dsl_dir))
+
+    return tuple(os.path.join(os.path.abspath(p), "") for p in paths if p)
+
+
+def get_user_module_files():
+    """returns files of the loaded modules, that are not part of python or dsl"""
+
+    library_dirs = _get_library_dirs()
+    module_files = []
+    for module in list(sys.modules.values()):
+        module_file = getattr(module, "__file__", None)
+        if not module_file:
+            continue
+
+        module_file = os.path.abspath(module_file)
+        if not module_file.startswith(library_dirs):
+            module_files.append(module_file)
+
+    return module_files
+
+
+def _get_cache_file(kind, dsl_file):
+
+    dsl_file = os.path.abspath(dsl_file)
+    cache_key = get_data_digest(
+        [
+            COMPILE_CACHE_VERSION,
+            kind,
+            dsl_file,
+            get_file_digest(dsl_file),
+            get_dsl_digest(),
+            _get_config_digest(),
+        ]
+    )
+    return os.path.join(
+        get_default_cache_dir(), COMPILE_CACHE_DIR, "{}.json".format(cache_key)
+    )
+
+
+def _is_unchanged(dependencies):
+    """checks whether the recorded dependencies are same as now"""
+
+    for file_path, digest in dependencies["files"].items():
+        if get_file_digest(file_path) != digest:
+            LOG.debug("Compile cache dependency {} has changed".format(file_path))
+            return False
+
+    for name, value in dependencies["env"].items():
+        if os.environ.get(name) != value:
+            LOG.debug("Compile cache dependency env {} has changed".format(name))
+            return False
+
+    for lookup_type, lookup_kwargs, digest in dependencies["lookups"]:
+        try:
+            res = CACHE_LOOKUPS[lookup_type](**lookup_kwargs)
+        except (Exception, SystemExit):
+            return False
+
+        if get_data_digest(res) != digest:
+            LOG.debug("Compile cache dependency {} has changed".format(lookup_kwargs))
+            return False
+
+    return True
+
+
+def _read_cache_entry(cache_file):
+    """returns payload of cache entry, None if entry is absent or stale"""
+
+    try:
+        with open(cache_file, "rb") as fd:
+            entry = json_loads(fd.read())
+    except FileNotFoundError:
+        return None
+    except ValueError as exc:
+        LOG.debug("Ignoring invalid compile cache entry: {}".format(exc))
+        return None
+
+    if _is_unchanged(entry["dependencies"]):
+        return entry["payload"]
+
+
+def has_secrets(obj):
+    """checks whether the compiled payload has any secret value"""
+
+    if isinstance(obj, list):
+        return any(has_secrets(item) for item in obj)
+
+    if not isinstance(obj, dict):
+        return False
+
+    if obj.get("type") == "SECRET" and obj.get("value"):
+        return True
+
+    for key, value in obj.items():
+        if key in SECRET_KEYS and isinstance(value, dict) and value.get("value"):
+            return True
+
+        if has_secrets(value):
+            return True
+
+    return False
+
+
+def _write_cache_entry(cache_file, dependencies, payload):
+
+    entry = {"dependencies": dependencies, "payload": payload}
+    tmp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache_file), mode=0o700, exist_ok=True)
+        # Entries are readable by the user only
+        fd = os.open(tmp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with open(fd, "wb") as cache_fd:
+            cache_fd.write(json_dumps(entry))
+        os.replace(tmp_file, cache_file)
+
+    except (OSError, TypeError) as exc:
+        LOG.debug("Failed to write compile cache: {}".format(exc))
+
+
+def compile_with_cache(kind, dsl_file, compile_func):
+    """
+        returns payload compiled by compile_func(dsl_file). If compile cache is
+        enabled, payload is read from it without executing the dsl file. On a
+        miss, dsl file is compiled while recording its dependencies and the
+        payload is cached.
+    """
+
+    if not _ENABLED:
+        return compile_func(dsl_file)
+
+    try:
+        cache_file = _get_cache_file(kind, dsl_file)
+        payload = _read_cache_entry(cache_file)
+    except (OSError, KeyError) as exc:
+        LOG.debug("Compile cache not available: {}".format(exc))
+        return compile_func(dsl_file)
+
+    if payload is not None:
+        LOG.debug("Using compiled {} of {} from compile cache".format(kind, dsl_file))
+        return payload
+
+    with DependencyRecorder() as recorder:
+        payload = compile_func(dsl_file)
+
+    # Local modules imported by dsl
+    for module_file in get_user_module_files():
+        recorder.add_file(module_file)
+
+    if payload is None or not recorder.cacheable:
+        return payload
+
+    if has_secrets(payload):
+        LOG.debug(
+            "Not caching compiled {} of {}, as it has secrets".format(kind, dsl_file)
+        )
+        return payload
+
+    LOG.debug("Writing compiled {} of {} to compile cache".format(kind, dsl_file))
+    _write_cache_entry(cache_file, recorder.get_dependencies(), payload)
+
+    return payload
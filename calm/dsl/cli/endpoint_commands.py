@@ -1,3 +1,5 @@
+import sys
+
 import click
 
 from calm.dsl.log import get_logging_handle
@@ -10,7 +12,9 @@ from .endpoints import (
     describe_endpoint,
     format_endpoint_command,
     compile_endpoint_command,
+    compile_endpoint,
 )
+from .batch_compile import compile_dir_command
 
 LOG = get_logging_handle(__name__)
 
@@ -103,8 +107,14 @@ def _format_endpoint_command(endpoint_file):
     "-f",
     "endpoint_file",
     type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
-    required=True,
-    help="Path of Endpoint file to upload",
+    help="Path of Endpoint file to compile",
+)
+@click.option(
+    "--dir",
+    "-d",
+    "dsl_dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, readable=True),
+    help="Path of directory having Endpoint files to compile",
 )
 @click.option(
     "--out",
@@ -114,6 +124,14 @@ def _format_endpoint_command(endpoint_file):
     default="json",
     help="output format [json|yaml].",
 )
-def _compile_endpoint_command(endpoint_file, out):
-    """Compiles a DSL (Python) endpoint into JSON or YAML"""
-    compile_endpoint_command(endpoint_file, out)
+def _compile_endpoint_command(endpoint_file, dsl_dir, out):
+    """Compiles a DSL (Python) endpoint or a directory of them into JSON or YAML"""
+
+    if bool(endpoint_file) == bool(dsl_dir):
+        LOG.error("One of either Endpoint File or Directory is required to compile.")
+        sys.exit(-1)
+
+    if dsl_dir:
+        compile_dir_command(compile_endpoint, "endpoint", dsl_dir, out)
+    else:
+        compile_endpoint_command(endpoint_file, out)
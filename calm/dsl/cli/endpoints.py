@@ -7,7 +7,6 @@ from ruamel import yaml
 import arrow
 import click
 from prettytable import PrettyTable
-from black import format_file_in_place, WriteBack, FileMode
 
 from calm.dsl.runbooks import Endpoint, create_endpoint_payload
 from calm.dsl.config import get_config
@@ -22,6 +21,7 @@ from .utils import (
     get_module_from_file,
 )
 from .constants import ENDPOINT
+from .compile_cache import compile_with_cache
 from calm.dsl.store import Cache
 
 LOG = get_logging_handle(__name__)
@@ -123,6 +123,11 @@ def get_endpoint_class_from_module(user_endpoint_module):
 
 
 def compile_endpoint(endpoint_file):
+    """returns compiled payload of endpoint dsl file, using compile cache if enabled"""
+    return compile_with_cache("endpoint", endpoint_file, _compile_endpoint)
+
+
+def _compile_endpoint(endpoint_file):
 
     user_endpoint_module = get_endpoint_module_from_file(endpoint_file)
     UserEndpoint = get_endpoint_class_from_module(user_endpoint_module)
@@ -398,6 +403,8 @@ def delete_endpoint(endpoint_names):
 
 
 def format_endpoint_command(endpoint_file):
+    from black import format_file_in_place, WriteBack, FileMode
+
     path = pathlib.Path(endpoint_file)
     LOG.debug("Formatting endpoint {} using black".format(path))
     if format_file_in_place(
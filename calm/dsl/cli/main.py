@@ -1,16 +1,17 @@
 from ruamel import yaml
 import click
+import sys
 import json
 import copy
 
 import click_completion
 import click_completion.core
-from click_repl import repl
 from prettytable import PrettyTable
 
 # TODO - move providers to separate file
 from calm.dsl.providers import get_provider, get_provider_types
 from calm.dsl.api import get_api_client, get_resource_api
+from calm.dsl.api.connection import ServerConnectionError
 from calm.dsl.tools import (
     simple_verbosity_option,
     show_trace_option,
@@ -20,6 +21,7 @@ from calm.dsl.config import update_config_file_location
 from calm.dsl.store import Cache
 
 from .version_validator import validate_version
+from .compile_cache import set_compile_cache
 from .utils import FeatureFlagGroup, highlight_text
 
 CONTEXT_SETTINGS = dict(help_option_names=["-h", "--help"])
@@ -28,7 +30,18 @@ click_completion.init()
 LOG = get_logging_handle(__name__)
 
 
-@click.group(cls=FeatureFlagGroup, context_settings=CONTEXT_SETTINGS)
+class MainGroup(FeatureFlagGroup):
+    """Main group of cli, exits gracefully if server is not reachable"""
+
+    def invoke(self, ctx):
+        try:
+            return super().invoke(ctx)
+        except ServerConnectionError as exc:
+            LOG.error(str(exc))
+            sys.exit(-1)
+
+
+@click.group(cls=MainGroup, context_settings=CONTEXT_SETTINGS)
 @simple_verbosity_option(LOG)
 @show_trace_option(LOG)
 @click.option(
@@ -47,9 +60,16 @@ LOG = get_logging_handle(__name__)
     default=False,
     help="Update cache before running command",
 )
+@click.option(
+    "--no-compile-cache",
+    "no_compile_cache",
+    is_flag=True,
+    default=False,
+    help="Compile dsl files without using the compile cache. Use it if dsl reads files or env variables without read_file, read_local_file or read_env, as such inputs are not tracked by the cache",
+)
 @click.version_option("0.1")
 @click.pass_context
-def main(ctx, config_file, sync):
+def main(ctx, config_file, sync, no_compile_cache):
     """Calm CLI
 
 \b
@@ -71,6 +91,8 @@ Commonly used commands:
 """
     ctx.ensure_object(dict)
     ctx.obj["verbose"] = True
+    set_compile_cache(not no_compile_cache)
+    ctx.call_on_close(lambda: set_compile_cache(False))
     try:
         validate_version()
     except Exception:
@@ -413,6 +435,8 @@ def calmrepl():
 
       :?, :h, :help     displays general help information
 """
+    from click_repl import repl
+
     repl(click.get_current_context())
 
 
@@ -1,3 +1,5 @@
+import sys
+
 import click
 
 from calm.dsl.log import get_logging_handle
@@ -26,11 +28,14 @@ from .runbooks import (
     delete_runbook,
     format_runbook_command,
     compile_runbook_command,
+    compile_runbook,
     watch_runbook_execution,
     resume_runbook_execution,
     pause_runbook_execution,
     abort_runbook_execution,
 )
+from .utils import poll_options
+from .batch_compile import compile_dir_command
 
 LOG = get_logging_handle(__name__)
 
@@ -50,10 +55,17 @@ LOG = get_logging_handle(__name__)
 @click.option(
     "--all-items", "-a", is_flag=True, help="Get all items, including deleted ones"
 )
-def _get_runbook_list(name, filter_by, limit, offset, quiet, all_items):
+@click.option(
+    "--all",
+    "all_pages",
+    is_flag=True,
+    default=False,
+    help="Get items from all pages, instead of a single page of given limit",
+)
+def _get_runbook_list(name, filter_by, limit, offset, quiet, all_items, all_pages):
     """Get the runbooks, optionally filtered by a string"""
 
-    get_runbook_list(name, filter_by, limit, offset, quiet, all_items)
+    get_runbook_list(name, filter_by, limit, offset, quiet, all_items, all_pages)
 
 
 @get.command("runbook_executions", feature_min_version="3.0.0", experimental=True)
@@ -96,12 +108,20 @@ def _get_execution_history(name, filter_by, limit, offset):
     "-fc",
     is_flag=True,
     default=False,
-    help="Deletes existing blueprint with the same name before create.",
+    help="Deletes existing blueprint with the same name before create. "
+    "Existing runbook is kept if it is unchanged since the last upload.",
 )
-def _create_runbook_command(runbook_file, name, description, force):
+@click.option(
+    "--force-upload",
+    "force_upload",
+    is_flag=True,
+    default=False,
+    help="Uploads the runbook with --force, even if it is unchanged since the last upload.",
+)
+def _create_runbook_command(runbook_file, name, description, force, force_upload):
     """Creates a runbook"""
 
-    create_runbook_command(runbook_file, name, description, force)
+    create_runbook_command(runbook_file, name, description, force, force_upload)
 
 
 @update.command("runbook", feature_min_version="3.0.0", experimental=True)
@@ -115,10 +135,17 @@ def _create_runbook_command(runbook_file, name, description, force):
 )
 @click.option("--name", "-n", default=None, required=True, help="Runbook name")
 @click.option("--description", default=None, help="Runbook description (Optional)")
-def _update_runbook_command(runbook_file, name, description):
+@click.option(
+    "--force-upload",
+    "force_upload",
+    is_flag=True,
+    default=False,
+    help="Uploads the runbook even if it is unchanged since the last upload.",
+)
+def _update_runbook_command(runbook_file, name, description, force_upload):
     """Updates a runbook"""
 
-    update_runbook_command(runbook_file, name, description)
+    update_runbook_command(runbook_file, name, description, force_upload)
 
 
 @delete.command("runbook", feature_min_version="3.0.0", experimental=True)
@@ -164,8 +191,14 @@ def _format_runbook_command(runbook_file):
     "-f",
     "runbook_file",
     type=click.Path(exists=True, file_okay=True, dir_okay=False, readable=True),
-    required=True,
-    help="Path of Runbook file to upload",
+    help="Path of Runbook file to compile",
+)
+@click.option(
+    "--dir",
+    "-d",
+    "dsl_dir",
+    type=click.Path(exists=True, file_okay=False, dir_okay=True, readable=True),
+    help="Path of directory having Runbook files to compile",
 )
 @click.option(
     "--out",
@@ -175,9 +208,17 @@ def _format_runbook_command(runbook_file):
     default="json",
     help="output format [json|yaml].",
 )
-def _compile_runbook_command(runbook_file, out):
-    """Compiles a DSL (Python) runbook into JSON or YAML"""
-    compile_runbook_command(runbook_file, out)
+def _compile_runbook_command(runbook_file, dsl_dir, out):
+    """Compiles a DSL (Python) runbook or a directory of them into JSON or YAML"""
+
+    if bool(runbook_file) == bool(dsl_dir):
+        LOG.error("One of either Runbook File or Directory is required to compile.")
+        sys.exit(-1)
+
+    if dsl_dir:
+        compile_dir_command(compile_runbook, "runbook", dsl_dir, out)
+    else:
+        compile_runbook_command(runbook_file, out)
 
 
 @run.command("runbook", feature_min_version="3.0.0", experimental=True)
@@ -205,8 +246,15 @@ def _compile_runbook_command(runbook_file, out):
     help="Path of input file to get the inputs for runbook",
 )
 @click.option("--watch/--no-watch", "-w", default=False, help="Watch scrolling output")
+@poll_options()
 def _run_runbook_command(
-    runbook_name, watch, ignore_runtime_variables, runbook_file=None, input_file=None,
+    runbook_name,
+    watch,
+    ignore_runtime_variables,
+    poll_interval,
+    timeout,
+    runbook_file=None,
+    input_file=None,
 ):
     """Execute the runbook given by name or runbook file"""
 
@@ -216,15 +264,18 @@ def _run_runbook_command(
         ignore_runtime_variables,
         runbook_file=runbook_file,
         input_file=input_file,
+        poll_interval=poll_interval,
+        timeout=timeout,
     )
 
 
 @watch.command("runbook_execution", feature_min_version="3.0.0", experimental=True)
 @click.argument("runlog_uuid", required=True)
-def _watch_runbook_execution(runlog_uuid):
+@poll_options()
+def _watch_runbook_execution(runlog_uuid, poll_interval, timeout):
     """Watch the runbook execution using given runlog UUID"""
 
-    watch_runbook_execution(runlog_uuid)
+    watch_runbook_execution(runlog_uuid, poll_interval, timeout)
 
 
 @pause.command("runbook_execution", feature_min_version="3.0.0", experimental=True)
@@ -8,11 +8,11 @@ from ruamel import yaml
 import arrow
 import click
 from prettytable import PrettyTable
-from black import format_file_in_place, WriteBack, FileMode
 
 from calm.dsl.runbooks import runbook, create_runbook_payload
 from calm.dsl.config import get_config
 from calm.dsl.api import get_api_client
+from calm.dsl.api.util import is_upload_skipped
 from calm.dsl.log import get_logging_handle
 from calm.dsl.store import Cache
 from .utils import (
@@ -21,17 +21,19 @@ from .utils import (
     highlight_text,
     get_states_filter,
     get_module_from_file,
+    Poller,
 )
 from .constants import RUNBOOK, RUNLOG
 from .runlog import get_completion_func, get_runlog_status
 from .endpoints import get_endpoint
 
+from .compile_cache import compile_with_cache
 from anytree import NodeMixin, RenderTree
 
 LOG = get_logging_handle(__name__)
 
 
-def get_runbook_list(name, filter_by, limit, offset, quiet, all_items):
+def get_runbook_list(name, filter_by, limit, offset, quiet, all_items, all_pages=False):
     """Get the runbooks, optionally filtered by a string"""
 
     client = get_api_client()
@@ -52,14 +54,20 @@ def get_runbook_list(name, filter_by, limit, offset, quiet, all_items):
     if filter_query:
         params["filter"] = filter_query
 
-    res, err = client.runbook.list(params=params)
+    if all_pages:
+        # Fetch all pages concurrently instead of a single page of given limit
+        params.pop("length")
+        res, err = client.runbook.list_all(params=params)
+    else:
+        res, err = client.runbook.list(params=params)
+        res = None if err else res.json()
 
     if err:
         pc_ip = config["SERVER"]["pc_ip"]
         LOG.warning("Cannot fetch runbooks from {}".format(pc_ip))
         return
 
-    json_rows = res.json()["entities"]
+    json_rows = res["entities"]
     if not json_rows:
         click.echo(highlight_text("No runbook found !!!\n"))
         return
@@ -125,6 +133,11 @@ def get_runbook_class_from_module(user_runbook_module):
 
 
 def compile_runbook(runbook_file):
+    """returns compiled payload of runbook dsl file, using compile cache if enabled"""
+    return compile_with_cache("runbook", runbook_file, _compile_runbook)
+
+
+def _compile_runbook(runbook_file):
 
     user_runbook_module = get_runbook_module_from_file(runbook_file)
     UserRunbook = get_runbook_class_from_module(user_runbook_module)
@@ -171,7 +184,12 @@ def compile_runbook_command(runbook_file, out):
 
 
 def create_runbook(
-    client, runbook_payload, name=None, description=None, force_create=False
+    client,
+    runbook_payload,
+    name=None,
+    description=None,
+    force_create=False,
+    force_upload=False,
 ):
 
     runbook_payload.pop("status", None)
@@ -188,12 +206,21 @@ def create_runbook(
     runbook_desc = runbook_payload["spec"]["description"]
 
     return client.runbook.upload_with_secrets(
-        runbook_name, runbook_desc, runbook_resources, force_create=force_create
+        runbook_name,
+        runbook_desc,
+        runbook_resources,
+        force_create=force_create,
+        force_upload=force_upload,
     )
 
 
 def create_runbook_from_json(
-    client, path_to_json, name=None, description=None, force_create=False
+    client,
+    path_to_json,
+    name=None,
+    description=None,
+    force_create=False,
+    force_upload=False,
 ):
 
     runbook_payload = json.loads(open(path_to_json, "r").read())
@@ -203,11 +230,17 @@ def create_runbook_from_json(
         name=name,
         description=description,
         force_create=force_create,
+        force_upload=force_upload,
     )
 
 
 def create_runbook_from_dsl(
-    client, runbook_file, name=None, description=None, force_create=False
+    client,
+    runbook_file,
+    name=None,
+    description=None,
+    force_create=False,
+    force_upload=False,
 ):
 
     runbook_payload = compile_runbook(runbook_file)
@@ -222,21 +255,32 @@ def create_runbook_from_dsl(
         name=name,
         description=description,
         force_create=force_create,
+        force_upload=force_upload,
     )
 
 
-def create_runbook_command(runbook_file, name, description, force):
+def create_runbook_command(runbook_file, name, description, force, force_upload=False):
     """Creates a runbook"""
 
     client = get_api_client()
 
     if runbook_file.endswith(".json"):
         res, err = create_runbook_from_json(
-            client, runbook_file, name=name, description=description, force_create=force
+            client,
+            runbook_file,
+            name=name,
+            description=description,
+            force_create=force,
+            force_upload=force_upload,
         )
     elif runbook_file.endswith(".py"):
         res, err = create_runbook_from_dsl(
-            client, runbook_file, name=name, description=description, force_create=force
+            client,
+            runbook_file,
+            name=name,
+            description=description,
+            force_create=force,
+            force_upload=force_upload,
         )
     else:
         LOG.error("Unknown file format {}".format(runbook_file))
@@ -271,7 +315,14 @@ def create_runbook_command(runbook_file, name, description, force):
         )
         sys.exit(-1)
 
-    LOG.info("Runbook {} created successfully.".format(runbook_name))
+    if is_upload_skipped(res):
+        LOG.info(
+            "Runbook {} is unchanged, skipped upload. Use --force-upload to upload it anyway.".format(
+                runbook_name
+            )
+        )
+    else:
+        LOG.info("Runbook {} created successfully.".format(runbook_name))
     config = get_config()
     pc_ip = config["SERVER"]["pc_ip"]
     pc_port = config["SERVER"]["pc_port"]
@@ -286,7 +337,9 @@ def create_runbook_command(runbook_file, name, description, force):
     click.echo(json.dumps(stdout_dict, indent=4, separators=(",", ": ")))
 
 
-def update_runbook(client, runbook_payload, name=None, description=None):
+def update_runbook(
+    client, runbook_payload, name=None, description=None, force_upload=False
+):
 
     runbook_payload.pop("status", None)
 
@@ -306,17 +359,32 @@ def update_runbook(client, runbook_payload, name=None, description=None):
     spec_version = runbook["metadata"]["spec_version"]
 
     return client.runbook.update_with_secrets(
-        uuid, runbook_name, runbook_desc, runbook_resources, spec_version
+        uuid,
+        runbook_name,
+        runbook_desc,
+        runbook_resources,
+        spec_version,
+        force_upload=force_upload,
     )
 
 
-def update_runbook_from_json(client, path_to_json, name=None, description=None):
+def update_runbook_from_json(
+    client, path_to_json, name=None, description=None, force_upload=False
+):
 
     runbook_payload = json.loads(open(path_to_json, "r").read())
-    return update_runbook(client, runbook_payload, name=name, description=description)
+    return update_runbook(
+        client,
+        runbook_payload,
+        name=name,
+        description=description,
+        force_upload=force_upload,
+    )
 
 
-def update_runbook_from_dsl(client, runbook_file, name=None, description=None):
+def update_runbook_from_dsl(
+    client, runbook_file, name=None, description=None, force_upload=False
+):
 
     runbook_payload = compile_runbook(runbook_file)
     if runbook_payload is None:
@@ -324,21 +392,35 @@ def update_runbook_from_dsl(client, runbook_file, name=None, description=None):
         err = {"error": err_msg, "code": -1}
         return None, err
 
-    return update_runbook(client, runbook_payload, name=name, description=description)
+    return update_runbook(
+        client,
+        runbook_payload,
+        name=name,
+        description=description,
+        force_upload=force_upload,
+    )
 
 
-def update_runbook_command(runbook_file, name, description):
+def update_runbook_command(runbook_file, name, description, force_upload=False):
     """Updates a runbook"""
 
     client = get_api_client()
 
     if runbook_file.endswith(".json"):
         res, err = update_runbook_from_json(
-            client, runbook_file, name=name, description=description
+            client,
+            runbook_file,
+            name=name,
+            description=description,
+            force_upload=force_upload,
         )
     elif runbook_file.endswith(".py"):
         res, err = update_runbook_from_dsl(
-            client, runbook_file, name=name, description=description
+            client,
+            runbook_file,
+            name=name,
+            description=description,
+            force_upload=force_upload,
         )
     else:
         LOG.error("Unknown file format {}".format(runbook_file))
@@ -373,7 +455,14 @@ def update_runbook_command(runbook_file, name, description):
         )
         sys.exit(-1)
 
-    LOG.info("Runbook {} updated successfully.".format(runbook_name))
+    if is_upload_skipped(res):
+        LOG.info(
+            "Runbook {} is unchanged, skipped update. Use --force-upload to update it anyway.".format(
+                runbook_name
+            )
+        )
+    else:
+        LOG.info("Runbook {} updated successfully.".format(runbook_name))
     config = get_config()
     pc_ip = config["SERVER"]["pc_ip"]
     pc_port = config["SERVER"]["pc_port"]
@@ -532,7 +621,13 @@ def patch_runbook_runtime_editables(client, runbook):
 
 
 def run_runbook_command(
-    runbook_name, watch, ignore_runtime_variables, runbook_file=None, input_file=None,
+    runbook_name,
+    watch,
+    ignore_runtime_variables,
+    runbook_file=None,
+    input_file=None,
+    poll_interval=None,
+    timeout=None,
 ):
 
     if runbook_file is None and runbook_name is None:
@@ -585,7 +680,14 @@ def run_runbook_command(
         screen.clear()
         screen.refresh()
         run_runbook(
-            screen, client, runbook_id, watch, input_data=input_data, payload=payload
+            screen,
+            client,
+            runbook_id,
+            watch,
+            input_data=input_data,
+            payload=payload,
+            poll_interval=poll_interval,
+            timeout=timeout,
         )
         if runbook_file:
             res, err = client.runbook.delete(runbook_id)
@@ -596,7 +698,16 @@ def run_runbook_command(
     Display.wrapper(render_runbook, watch)
 
 
-def run_runbook(screen, client, runbook_uuid, watch, input_data={}, payload={}):
+def run_runbook(
+    screen,
+    client,
+    runbook_uuid,
+    watch,
+    input_data={},
+    payload={},
+    poll_interval=None,
+    timeout=None,
+):
 
     res, err = client.runbook.run(runbook_uuid, payload)
     if not err:
@@ -611,7 +722,9 @@ def run_runbook(screen, client, runbook_uuid, watch, input_data={}, payload={}):
         return client.runbook.poll_action_run(runlog_uuid)
 
     screen.refresh()
-    should_continue = poll_action(poll_runlog_status, get_runlog_status(screen))
+    should_continue = poll_action(
+        poll_runlog_status, get_runlog_status(screen), poll_interval, timeout
+    )
     if not should_continue:
         return
     res, err = client.runbook.poll_action_run(runlog_uuid)
@@ -622,7 +735,14 @@ def run_runbook(screen, client, runbook_uuid, watch, input_data={}, payload={}):
 
     if watch:
         screen.refresh()
-        watch_runbook(runlog_uuid, runbook, screen=screen, input_data=input_data)
+        watch_runbook(
+            runlog_uuid,
+            runbook,
+            screen=screen,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            input_data=input_data,
+        )
 
     config = get_config()
     pc_ip = config["SERVER"]["pc_ip"]
@@ -637,7 +757,7 @@ def run_runbook(screen, client, runbook_uuid, watch, input_data={}, payload={}):
     screen.refresh()
 
 
-def watch_runbook_execution(runlog_uuid):
+def watch_runbook_execution(runlog_uuid, poll_interval=None, timeout=None):
 
     client = get_api_client()
 
@@ -648,7 +768,9 @@ def watch_runbook_execution(runlog_uuid):
         def poll_runlog_status():
             return client.runbook.poll_action_run(runlog_uuid)
 
-        should_continue = poll_action(poll_runlog_status, get_runlog_status(screen))
+        should_continue = poll_action(
+            poll_runlog_status, get_runlog_status(screen), poll_interval, timeout
+        )
         if not should_continue:
             exit(-1)
         res, err = client.runbook.poll_action_run(runlog_uuid)
@@ -658,13 +780,15 @@ def watch_runbook_execution(runlog_uuid):
         runbook = response["status"]["runbook_json"]["resources"]["runbook"]
 
         screen.refresh()
-        watch_runbook(runlog_uuid, runbook, screen)
+        watch_runbook(runlog_uuid, runbook, screen, poll_interval, timeout)
         screen.wait_for_input(10.0)
 
     Display.wrapper(render_runbook_execution, True)
 
 
-def watch_runbook(runlog_uuid, runbook, screen, poll_interval=10, input_data={}):
+def watch_runbook(
+    runlog_uuid, runbook, screen, poll_interval=None, timeout=None, input_data={}
+):
 
     client = get_api_client()
 
@@ -687,6 +811,7 @@ def watch_runbook(runlog_uuid, runbook, screen, poll_interval=10, input_data={})
         poll_func,
         get_completion_func(screen),
         poll_interval=poll_interval,
+        timeout=timeout,
         task_type_map=task_type_map,
         top_level_tasks=top_level_tasks,
         input_data=input_data,
@@ -781,6 +906,8 @@ def describe_runbook(runbook_name, out):
 
 
 def format_runbook_command(runbook_file):
+    from black import format_file_in_place, WriteBack, FileMode
+
     path = pathlib.Path(runbook_file)
     LOG.debug("Formatting runbook {} using black".format(path))
     if format_file_in_place(
@@ -888,24 +1015,14 @@ def abort_runbook_execution(runlog_uuid):
     click.echo(json.dumps(stdout_dict, indent=4, separators=(",", ": ")))
 
 
-def poll_action(poll_func, completion_func, poll_interval=10, **kwargs):
-    # Poll every 10 seconds on the runlog status, for 10 mins
-    maxWait = 10 * 60
-    count = 0
-    while count < maxWait:
-        # call status api
-        res, err = poll_func()
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-        response = res.json()
-        (completed, msg) = completion_func(response, **kwargs)
-        if completed:
-            # click.echo(msg)
-            if msg:
-                return False
-            break
-        count += poll_interval
-        time.sleep(poll_interval)
+def poll_action(poll_func, completion_func, poll_interval=None, timeout=None, **kwargs):
+    """polls till completion, returns False if completed with a failure message"""
+
+    completed, msg = Poller(poll_interval, timeout).poll(
+        poll_func, completion_func, **kwargs
+    )
+    if completed and msg:
+        return False
     return True
 
 
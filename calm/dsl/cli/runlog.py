@@ -1,4 +1,5 @@
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 from asciimatics.widgets import (
     Frame,
@@ -236,6 +237,151 @@ class RunlogNode(NodeMixin):
             self.children = children
 
 
+class RunlogTree:
+    """
+        Runlog tree of an execution, persisted across polls. Task outputs are
+        fetched only for runlogs updated since last poll, concurrently.
+    """
+
+    # Output is not valid for these tasks
+    NO_OUTPUT_TASK_TYPES = ["INPUT", "CONFIRM", "WHILE_LOOP", "META"]
+    MAX_WORKERS = 10
+
+    def __init__(self, runlog_uuid, task_type_map, max_workers=None):
+        self.runlog_uuid = runlog_uuid
+        self.task_type_map = task_type_map
+        self.max_workers = max_workers or self.MAX_WORKERS
+        self.root = None
+        self.nodes = {}
+        self.runlog_map = {}
+
+        # runlog uuid -> (last_update_time, state, outputs)
+        self.outputs = {}
+
+    def needs_output(self, runlog):
+        """returns True if output of task runlog is to be fetched"""
+
+        uuid = runlog["metadata"]["uuid"]
+        if uuid not in self.outputs:
+            return True
+
+        last_update_time, state, _ = self.outputs[uuid]
+        if state in RUNLOG.TERMINAL_STATES and state == runlog["status"]["state"]:
+            return False
+
+        return last_update_time != runlog["metadata"].get("last_update_time")
+
+    def fetch_outputs(self, runlogs, client):
+        """fetches outputs of runlogs concurrently and caches them"""
+
+        def fetch_output(uuid):
+            res, err = client.runbook.runlog_output(self.runlog_uuid, uuid)
+            if err:
+                raise Exception("\n[{}] - {}".format(err["code"], err["error"]))
+            return res.json()["status"]["output_list"]
+
+        if not runlogs:
+            return
+
+        uuids = [runlog["metadata"]["uuid"] for runlog in runlogs]
+        max_workers = min(self.max_workers, client.connection.pool_maxsize, len(uuids))
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            output_lists = list(executor.map(fetch_output, uuids))
+
+        for runlog, output_list in zip(runlogs, output_lists):
+            outputs = []
+            if len(output_list) > 0:
+                outputs.append(output_list[0]["output"])
+            self.outputs[runlog["metadata"]["uuid"]] = (
+                runlog["metadata"].get("last_update_time"),
+                runlog["status"]["state"],
+                outputs,
+            )
+
+    def update(self, sorted_entities, client):
+        """updates the tree with runlogs sorted on creation time, returns root"""
+
+        # Create root node
+        # TODO - Get details of root node
+        if not self.root:
+            root_uuid = sorted_entities[0]["status"]["root_reference"]["uuid"]
+            root_runlog = {
+                "metadata": {"uuid": root_uuid},
+                "status": {"type": "action_runlog", "state": ""},
+            }
+            self.runlog_map[str(root_uuid)] = root_runlog
+            self.root = RunlogNode(root_runlog)
+            self.nodes[str(root_uuid)] = self.root
+
+        # Update nodes of runlog tree and the map based on uuid
+        tree_runlogs = []
+        pending_output_runlogs = []
+        for runlog in sorted_entities:
+            uuid = runlog["metadata"]["uuid"]
+            self.runlog_map[str(uuid)] = runlog
+            machine_name = runlog["status"].get("machine_name", None)
+            machine = parse_machine_name(self.runlog_uuid, machine_name)
+            if machine and len(machine) == 1:
+                runlog["status"]["machine_name"] = "-"
+                continue  # this runlog corresponds to endpoint loop
+
+            if runlog["status"]["type"] == "task_runlog":
+                task_id = runlog["status"]["task_reference"]["uuid"]
+                task_type = self.task_type_map[task_id]
+                if task_type == "META":
+                    continue  # don't add metatask's trl in runlogTree
+
+                if task_type not in self.NO_OUTPUT_TASK_TYPES and self.needs_output(
+                    runlog
+                ):
+                    pending_output_runlogs.append(runlog)
+
+            tree_runlogs.append((runlog, machine))
+
+        self.fetch_outputs(pending_output_runlogs, client)
+
+        # Detach nodes, so that children are attached again in creation order
+        for node in self.nodes.values():
+            if node is not self.root:
+                node.parent = None
+
+        for runlog, machine in tree_runlogs:
+            uuid = runlog["metadata"]["uuid"]
+            if machine:
+                machine = "{} ({})".format(machine[1], machine[0])
+
+            node = self.nodes.get(str(uuid), None)
+            if node is None:
+                node = RunlogNode(runlog)
+                self.nodes[str(uuid)] = node
+
+            node.runlog = runlog
+            node.machine = machine
+            node.reasons = runlog["status"].get("reason_list", [])
+            node.outputs = self.outputs.get(uuid, (None, None, []))[2]
+
+        # Attach parent to nodes
+        for runlog, _ in tree_runlogs:
+            uuid = runlog["metadata"]["uuid"]
+            parent_uuid = runlog["status"]["parent_reference"]["uuid"]
+            parent_runlog = self.runlog_map[str(parent_uuid)]
+            parent_type = parent_runlog["status"]["type"]
+            while (
+                parent_type == "task_runlog"
+                and self.task_type_map[
+                    parent_runlog["status"]["task_reference"]["uuid"]
+                ]
+                == "META"
+            ) or parent_runlog["status"].get("machine_name", None) == "-":
+                parent_uuid = parent_runlog["status"]["parent_reference"]["uuid"]
+                parent_runlog = self.runlog_map[str(parent_uuid)]
+                parent_type = parent_runlog["status"]["type"]
+
+            self.nodes[str(uuid)].parent = self.nodes[str(parent_uuid)]
+
+        return self.root
+
+
 def displayRunLog(screen, obj, pre, fill, line):
 
     if not isinstance(obj, RunlogNode):
@@ -340,6 +486,9 @@ def displayRunLog(screen, obj, pre, fill, line):
 
 
 def get_completion_func(screen):
+
+    runlog_tree = None
+
     def is_action_complete(
         response,
         task_type_map=[],
@@ -349,6 +498,7 @@ def get_completion_func(screen):
         **kwargs
     ):
 
+        nonlocal runlog_tree
         client = get_api_client()
         global input_tasks
         global input_payload
@@ -368,80 +518,10 @@ def get_completion_func(screen):
                 entities, key=lambda x: int(x["metadata"]["creation_time"])
             )
 
-            # Create nodes of runlog tree and a map based on uuid
-            root = None
-            nodes = {}
-            runlog_map = {}
-            for runlog in sorted_entities:
-                # Create root node
-                # TODO - Get details of root node
-                if not root:
-                    root_uuid = runlog["status"]["root_reference"]["uuid"]
-                    root_runlog = {
-                        "metadata": {"uuid": root_uuid},
-                        "status": {"type": "action_runlog", "state": ""},
-                    }
-                    runlog_map[str(root_uuid)] = root_runlog
-                    root = RunlogNode(root_runlog)
-                    nodes[str(root_uuid)] = root
-
-                uuid = runlog["metadata"]["uuid"]
-                runlog_map[str(uuid)] = runlog
-                reasons = runlog["status"].get("reason_list", [])
-                outputs = []
-                machine_name = runlog["status"].get("machine_name", None)
-                machine = parse_machine_name(runlog_uuid, machine_name)
-                if machine and len(machine) == 1:
-                    runlog["status"]["machine_name"] = "-"
-                    continue  # this runlog corresponds to endpoint loop
-                elif machine:
-                    machine = "{} ({})".format(machine[1], machine[0])
-
-                if runlog["status"]["type"] == "task_runlog":
-
-                    task_id = runlog["status"]["task_reference"]["uuid"]
-                    if task_type_map[task_id] == "META":
-                        continue  # don't add metatask's trl in runlogTree
-
-                    # Output is not valid for input, confirm and while_loop tasks
-                    if task_type_map[task_id] not in ["INPUT", "CONFIRM", "WHILE_LOOP"]:
-                        res, err = client.runbook.runlog_output(runlog_uuid, uuid)
-                        if err:
-                            raise Exception(
-                                "\n[{}] - {}".format(err["code"], err["error"])
-                            )
-                        runlog_output = res.json()
-                        output_list = runlog_output["status"]["output_list"]
-                        if len(output_list) > 0:
-                            outputs.append(output_list[0]["output"])
-
-                nodes[str(uuid)] = RunlogNode(
-                    runlog,
-                    parent=root,
-                    outputs=outputs,
-                    machine=machine,
-                    reasons=reasons,
-                )
-
-            # Attach parent to nodes
-            for runlog in sorted_entities:
-                uuid = runlog["metadata"]["uuid"]
-                if nodes.get(str(uuid), None) is None:
-                    continue
-                parent_uuid = runlog["status"]["parent_reference"]["uuid"]
-                parent_runlog = runlog_map[str(parent_uuid)]
-                parent_type = parent_runlog["status"]["type"]
-                while (
-                    parent_type == "task_runlog"
-                    and task_type_map[parent_runlog["status"]["task_reference"]["uuid"]]
-                    == "META"
-                ) or parent_runlog["status"].get("machine_name", None) == "-":
-                    parent_uuid = parent_runlog["status"]["parent_reference"]["uuid"]
-                    parent_runlog = runlog_map[str(parent_uuid)]
-                    parent_type = parent_runlog["status"]["type"]
-
-                node = nodes[str(uuid)]
-                node.parent = nodes[str(parent_uuid)]
+            # Update the runlog tree persisted across polls
+            if runlog_tree is None:
+                runlog_tree = RunlogTree(runlog_uuid, task_type_map)
+            root = runlog_tree.update(sorted_entities, client)
 
             # Show Progress
             # TODO - Draw progress bar
@@ -1,9 +1,11 @@
 import click
 import sys
 import os
+import time
+import random
+import importlib
 import importlib.util
 from functools import reduce
-from asciimatics.screen import Screen
 from click_didyoumean import DYMMixin
 from distutils.version import LooseVersion as LV
 
@@ -64,6 +66,8 @@ class Display:
     @classmethod
     def wrapper(cls, func, watch=False):
         if watch and os.isatty(sys.stdout.fileno()):
+            from asciimatics.screen import Screen
+
             Screen.wrapper(func, height=1000, catch_interrupt=True)
         else:
             func(display)
@@ -84,11 +88,128 @@ class Display:
 display = Display()
 
 
+class Poller:
+    """
+        Polls till completion. Interval backs off exponentially while the
+        polled response does not change, and resets when it changes.
+    """
+
+    DEFAULT_INTERVAL = 2
+    MAX_INTERVAL = 15
+    DEFAULT_TIMEOUT = 60 * 60
+    BACKOFF_FACTOR = 1.5
+    JITTER = 0.1  # fraction of interval
+
+    def __init__(self, interval=None, timeout=None, max_interval=None):
+        """
+            interval: initial polling interval in seconds
+            timeout: deadline in seconds, 0 to poll till completion
+            max_interval: maximum polling interval in seconds
+        """
+
+        self.interval = interval or self.DEFAULT_INTERVAL
+        self.max_interval = max(max_interval or self.MAX_INTERVAL, self.interval)
+        self.timeout = self.DEFAULT_TIMEOUT if timeout is None else timeout
+
+    def get_delay(self, interval, deadline):
+        """returns time to sleep before next poll, None if deadline is reached"""
+
+        delay = interval * (1 + random.uniform(-self.JITTER, self.JITTER))
+        if deadline is None:
+            return delay
+
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return None
+        return min(delay, remaining)
+
+    def poll(self, poll_func, completion_func, **kwargs):
+        """
+            calls poll_func till completion_func(response, **kwargs) returns
+            (True, msg). Returns (completed, msg), completed is False on timeout.
+        """
+
+        deadline = time.monotonic() + self.timeout if self.timeout else None
+        interval = self.interval
+        last_response = None
+        while True:
+            res, err = poll_func()
+            if err:
+                raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+            response = res.json()
+            completed, msg = completion_func(response, **kwargs)
+            if completed:
+                return True, msg
+
+            if response == last_response:
+                interval = min(interval * self.BACKOFF_FACTOR, self.max_interval)
+            else:
+                interval = self.interval
+            last_response = response
+
+            delay = self.get_delay(interval, deadline)
+            if delay is None:
+                LOG.warning("Polling timed out after {} seconds".format(self.timeout))
+                return False, ""
+            time.sleep(delay)
+
+
+def poll_options(interval_names=("--poll-interval",)):
+    """A decorator that adds `--poll-interval` and `--timeout` options to the
+    decorated command, passed as `poll_interval` and `timeout` arguments"""
+
+    def decorator(f):
+        f = click.option(
+            "--timeout",
+            "timeout",
+            type=int,
+            default=None,
+            help="Polling deadline in seconds, 0 to wait till completion "
+            "(default: {})".format(Poller.DEFAULT_TIMEOUT),
+        )(f)
+        return click.option(
+            *interval_names,
+            "poll_interval",
+            type=int,
+            default=None,
+            help="Initial polling interval in seconds, backs off upto {}s while "
+            "status does not change (default: {})".format(
+                Poller.MAX_INTERVAL, Poller.DEFAULT_INTERVAL
+            ),
+        )(f)
+
+    return decorator
+
+
 class FeatureFlagMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.feature_version_map = dict()
         self.experimental_cmd_map = dict()
+        self.lazy_cmd_map = dict()
+
+    def add_lazy_commands(self, cmd_module_map):
+        """Registers subcommands by name. The module defining a subcommand
+        (given as {cmd_name: module_name}) is imported only when it is needed.
+        """
+
+        self.lazy_cmd_map.update(cmd_module_map)
+
+    def load_lazy_command(self, cmd_name):
+        """Imports the module defining the subcommand, if not imported yet"""
+
+        module_name = self.lazy_cmd_map.get(cmd_name, None)
+        if module_name and cmd_name not in self.commands:
+            LOG.debug("Loading module {} for command {}".format(module_name, cmd_name))
+            importlib.import_module(module_name)
+
+    def list_commands(self, ctx):
+        return sorted({*super().list_commands(ctx), *self.lazy_cmd_map.keys()})
+
+    def get_command(self, ctx, cmd_name):
+        self.load_lazy_command(cmd_name)
+        return super().get_command(ctx, cmd_name)
 
     def command(self, *args, **kwargs):
         """Behaves the same as `click.Group.command()` except added an
@@ -113,6 +234,8 @@ class FeatureFlagMixin:
 
         cmd_name = ctx.protected_args[0]
 
+        # Feature version of a command is registered with it, so load it first
+        self.load_lazy_command(cmd_name)
         feature_min_version = self.feature_version_map.get(cmd_name, "")
         if feature_min_version:
             calm_version = Version.get_version("Calm")
@@ -3,11 +3,15 @@ from .config import (
     get_default_config_file,
     get_default_db_file,
     get_default_local_dir,
+    get_default_cache_dir,
+    get_db_profile,
+    get_connection_config,
     update_config_file_location,
     update_init_config,
     update_config,
     set_config,
     get_config,
+    invalidate_config_cache,
     print_config,
 )
 
@@ -17,10 +21,14 @@ __all__ = [
     "get_default_config_file",
     "get_default_db_file",
     "get_default_local_dir",
+    "get_default_cache_dir",
+    "get_db_profile",
+    "get_connection_config",
     "update_config_file_location",
     "update_init_config",
     "update_config",
     "set_config",
     "get_config",
+    "invalidate_config_cache",
     "print_config",
 ]
@@ -1,14 +1,38 @@
 import os
 import errno
 import configparser
+from collections.abc import Mapping
+from types import MappingProxyType
 
-from jinja2 import Environment, PackageLoader
 from .schema import validate_config, validate_init_config
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
 _CONFIG_FILE = None
 
+# Parsed config along with the stats of files it is parsed from
+_CONFIG_CACHE = None
+
+# Default sqlite profile of local database
+# busy_timeout is in milliseconds, negative cache_size is in KiB
+DEFAULT_DB_PROFILE = {
+    "journal_mode": "wal",
+    "synchronous": "normal",
+    "busy_timeout": 30000,
+    "cache_size": -8000,
+}
+
+# Default retry and transfer settings of connection to server
+# backoff_jitter is the maximum random delay (seconds) added to the backoff
+DEFAULT_CONNECTION_CONFIG = {
+    "retries_enabled": False,
+    "retries": 3,
+    "backoff_factor": 0.5,
+    "backoff_jitter": 0.5,
+    "retry_status_codes": (429, 502, 503),
+    "gzip_uploads": False,
+}
+
 
 def make_file_dir(path, is_dir=False):
     """creates the file directory if not present"""
@@ -57,6 +81,49 @@ def get_init_data():
     return init_config
 
 
+def get_db_profile():
+    """Returns the sqlite profile of local database from init file"""
+
+    db_profile = dict(DEFAULT_DB_PROFILE)
+    try:
+        init_obj = get_init_data()
+    except (FileNotFoundError, ValueError):
+        return db_profile
+
+    for key, value in db_profile.items():
+        db_profile[key] = type(value)(init_obj["DB"].get(key, value))
+
+    return db_profile
+
+
+def get_connection_config():
+    """Returns the retry and transfer settings of connection to server from config file"""
+
+    connection_config = dict(DEFAULT_CONNECTION_CONFIG)
+    try:
+        config = get_config()
+    except (FileNotFoundError, ValueError):
+        return connection_config
+
+    if "CONNECTION" not in config:
+        return connection_config
+
+    section = config["CONNECTION"]
+    for key, value in connection_config.items():
+        if key not in section:
+            continue
+
+        if key in ("retries_enabled", "gzip_uploads"):
+            value = configparser.ConfigParser.BOOLEAN_STATES[section[key].lower()]
+        elif key == "retry_status_codes":
+            value = tuple(int(code) for code in section[key].split(",") if code)
+        else:
+            value = type(value)(section[key])
+        connection_config[key] = value
+
+    return connection_config
+
+
 def get_default_config_file():
     """Returns default location of config file"""
 
@@ -101,6 +168,14 @@ def get_default_local_dir():
     return local_dir
 
 
+def get_default_cache_dir():
+    """Returns the default location for cached dsl artifacts"""
+
+    cache_dir = os.path.join(os.path.expanduser("~"), ".calm", ".cache")
+    make_file_dir(cache_dir, is_dir=True)
+    return cache_dir
+
+
 def update_config_file_location(config_file):
     """
         updates the config file location (global _CONFIG_FILE object)
@@ -123,18 +198,29 @@ def update_config_file_location(config_file):
 
     # If file exists and a valid config file then update global _CONFIG_FILE object
     _CONFIG_FILE = config_file
+    invalidate_config_cache()
+
+
+def _get_template(schema_file):
+    """returns the config template from the cached template environment"""
+
+    # Imported here, as tools depend on config
+    from calm.dsl.tools import get_template
+
+    return get_template(__name__, schema_file)
 
 
 def _render_init_template(
-    config_file, db_file, local_dir, schema_file="init.ini.jinja2"
+    config_file, db_file, local_dir, db_profile, schema_file="init.ini.jinja2"
 ):
     """renders the init template"""
 
-    loader = PackageLoader(__name__, "")
-    env = Environment(loader=loader)
-    template = env.get_template(schema_file)
+    template = _get_template(schema_file)
     text = template.render(
-        config_file=config_file, db_file=db_file, local_dir=local_dir,
+        config_file=config_file,
+        db_file=db_file,
+        local_dir=local_dir,
+        db_profile=db_profile,
     )
     return text.strip() + os.linesep
 
@@ -146,13 +232,18 @@ def _render_config_template(
     password,
     project_name,
     log_level,
+    connection_config=None,
     schema_file="config.ini.jinja2",
 ):
     """renders the config template"""
 
-    loader = PackageLoader(__name__, "")
-    env = Environment(loader=loader)
-    template = env.get_template(schema_file)
+    connection_config = dict(connection_config or {})
+    if "retry_status_codes" in connection_config:
+        connection_config["retry_status_codes"] = ", ".join(
+            str(code) for code in connection_config["retry_status_codes"]
+        )
+
+    template = _get_template(schema_file)
     text = template.render(
         ip=ip,
         port=port,
@@ -160,12 +251,15 @@ def _render_config_template(
         password=password,
         project_name=project_name,
         log_level=log_level,
+        connection_config=connection_config,
     )
     return text.strip() + os.linesep
 
 
-def update_init_config(config_file, db_file, local_dir):
-    """updates the init file data"""
+def update_init_config(config_file, db_file, local_dir, db_profile=None):
+    """updates the init file data, keeping the existing db profile if not given"""
+
+    db_profile = db_profile or get_db_profile()
 
     # create required directories
     make_file_dir(config_file)
@@ -175,27 +269,32 @@ def update_init_config(config_file, db_file, local_dir):
     # Note: No need to validate init data as it is rendered by template
     init_file = get_init_file()
     LOG.debug("Rendering init template")
-    text = _render_init_template(config_file, db_file, local_dir)
+    text = _render_init_template(config_file, db_file, local_dir, db_profile)
 
     # Write init configuration
     LOG.debug("Writing configuration to '{}'".format(init_file))
     with open(init_file, "w") as fd:
         fd.write(text)
+    invalidate_config_cache()
 
 
-def update_config(host, port, username, password, project_name, log_level):
-    """Updates the config file data"""
+def update_config(
+    host, port, username, password, project_name, log_level, connection_config=None
+):
+    """Updates the config file data, keeping the existing connection settings if not given"""
 
+    connection_config = connection_config or get_connection_config()
     config_file = get_user_config_file()
 
     LOG.debug("Rendering configuration template")
     text = _render_config_template(
-        host, port, username, password, project_name, log_level
+        host, port, username, password, project_name, log_level, connection_config
     )
 
     LOG.debug("Writing configuration to '{}'".format(config_file))
     with open(config_file, "w") as fd:
         fd.write(text)
+    invalidate_config_cache()
 
 
 def set_config(
@@ -217,6 +316,7 @@ def set_config(
     """
 
     init_obj = get_init_data()
+    invalidate_config_cache()
 
     if config_file:
         # Validate config file and update _CONFIG_FILE object
@@ -255,10 +355,73 @@ def set_config(
     )
 
 
+class ConfigView(Mapping):
+    """Read-only view of the parsed config, having config sections as keys"""
+
+    def __init__(self, config):
+        self._sections = {
+            section: MappingProxyType(dict(config.items(section)))
+            for section in config.sections()
+        }
+
+    def __getitem__(self, section):
+        return self._sections[section]
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __len__(self):
+        return len(self._sections)
+
+    def sections(self):
+        return list(self._sections)
+
+    def items(self, section=None):
+        if section is None:
+            return self._sections.items()
+
+        return list(self._sections[section].items())
+
+
+def _get_file_stat(file_path):
+    """returns (mtime, size) of file, None if file is not present"""
+
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        return None
+
+    return (file_stat.st_mtime_ns, file_stat.st_size)
+
+
+def invalidate_config_cache():
+    """drops the parsed config, so that next get_config() parses it again"""
+
+    global _CONFIG_CACHE
+    _CONFIG_CACHE = None
+
+
 def get_config():
+    """
+        returns read-only view of config. Parsed config is cached in process
+        till the init file or config file changes.
+    """
 
-    global _CONFIG_FILE
+    global _CONFIG_CACHE
+
+    init_file_stat = None
+    if not _CONFIG_FILE:
+        init_file_stat = _get_file_stat(get_init_file())
+
+    if _CONFIG_CACHE:
+        cache_key, config_file, config_file_stat, config = _CONFIG_CACHE
+        if (
+            cache_key == (_CONFIG_FILE, init_file_stat)
+            and _get_file_stat(config_file) == config_file_stat
+        ):
+            return config
 
+    cache_key = (_CONFIG_FILE, init_file_stat)
     if not _CONFIG_FILE:
         # Get config file from init file
         init_obj = get_init_data()
@@ -267,6 +430,9 @@ def get_config():
     else:
         config_file = _CONFIG_FILE
 
+    # Stat is taken before parsing, so that later changes invalidate the cache
+    config_file_stat = _get_file_stat(config_file)
+
     # Parse the config file
     config = configparser.ConfigParser()
     config.optionxform = str  # Maintaining case sensitivity for field names
@@ -278,6 +444,8 @@ def get_config():
             "Invalid config file: {}. Please run calm init dsl".format(config_file)
         )
 
+    config = ConfigView(config)
+    _CONFIG_CACHE = (cache_key, config_file, config_file_stat, config)
     return config
 
 
@@ -1,4 +1,6 @@
-from schema import Schema, And, Use, SchemaError
+import configparser
+
+from schema import Schema, And, Use, Optional, SchemaError
 
 
 config_schema_dict = {
@@ -11,11 +13,31 @@ config_schema_dict = {
     "PROJECT": {"name": And(Use(str))},
     "LOG": {"level": And(Use(str))},
     "CATEGORIES": {},
+    Optional("CONNECTION"): {
+        Optional("retries_enabled"): And(
+            Use(str.lower), lambda v: v in configparser.ConfigParser.BOOLEAN_STATES
+        ),
+        Optional("gzip_uploads"): And(
+            Use(str.lower), lambda v: v in configparser.ConfigParser.BOOLEAN_STATES
+        ),
+        Optional("retries"): And(Use(int)),
+        Optional("backoff_factor"): And(Use(float)),
+        Optional("backoff_jitter"): And(Use(float)),
+        Optional("retry_status_codes"): And(
+            Use(lambda v: [int(code) for code in v.split(",") if code])
+        ),
+    },
 }
 
 
 init_schema_dict = {
-    "DB": {"location": And(Use(str)),},  # NoQA
+    "DB": {
+        "location": And(Use(str)),
+        Optional("journal_mode"): And(Use(str)),
+        Optional("synchronous"): And(Use(str)),
+        Optional("busy_timeout"): And(Use(int)),
+        Optional("cache_size"): And(Use(int)),
+    },
     "LOCAL_DIR": {"location": And(Use(str)),},  # NoQA
     "CONFIG": {"location": And(Use(str)),},  # NoQA
 }
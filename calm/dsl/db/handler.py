@@ -1,9 +1,9 @@
 import atexit
 import os
 
-from calm.dsl.config import get_init_data
+from calm.dsl.config import get_init_data, get_db_profile
 from .table_config import dsl_database, SecretTable, DataTable, VersionTable
-from .table_config import CacheTableBase
+from .table_config import CacheTableBase, CacheSyncTable
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -23,7 +23,12 @@ class Database:
     def instantiate_db():
         init_obj = get_init_data()
         db_location = init_obj["DB"].get("location")
-        dsl_database.init(db_location)
+        db_profile = get_db_profile()
+        dsl_database.init(
+            db_location,
+            timeout=db_profile["busy_timeout"] / 1000,
+            pragmas=list(db_profile.items()),
+        )
         return dsl_database
 
     def __init__(self):
@@ -32,24 +37,38 @@ class Database:
         self.secret_table = self.set_and_verify(SecretTable)
         self.data_table = self.set_and_verify(DataTable)
         self.version_table = self.set_and_verify(VersionTable)
+        self.cache_sync_table = self.set_and_verify(CacheSyncTable)
 
         for table_type, table in CacheTableBase.tables.items():
             setattr(self, table_type, self.set_and_verify(table))
 
     def set_and_verify(self, table_cls):
         """ Verify whether this class exists in db
-            If not, then creates one
+            If not, then creates one, else migrates the existing one
         """
 
         if not self.db.table_exists((table_cls.__name__).lower()):
             self.db.create_tables([table_cls])
 
+        else:
+            self.migrate(table_cls)
+
         # Register table to class
         if table_cls not in self.registered_tables:
             self.registered_tables.append(table_cls)
 
         return table_cls
 
+    def migrate(self, table_cls):
+        """Adds the indexes declared by table class but missing in db"""
+
+        table_name = (table_cls.__name__).lower()
+        db_indexes = {index.name for index in self.db.get_indexes(table_name)}
+        for index in table_cls._meta.fields_to_index():
+            if index._name not in db_indexes:
+                LOG.debug("Adding index {} to {}".format(index._name, table_name))
+                self.db.execute(index.safe(True))
+
     def is_closed(self):
         """return True if db connection is closed else False"""
 
@@ -104,8 +123,10 @@ def init_db_handle():
     # Removing existing db at init location if exists
     init_obj = get_init_data()
     db_location = init_obj["DB"].get("location")
-    if os.path.exists(db_location):
-        os.remove(db_location)
+    # Journal files of wal mode are removed along with db
+    for db_file in [db_location, db_location + "-wal", db_location + "-shm"]:
+        if os.path.exists(db_file):
+            os.remove(db_file)
 
     # Initialize new database object
     _Database = Database()
@@ -7,8 +7,10 @@ from peewee import (
     ForeignKeyField,
     CompositeKey,
     DoesNotExist,
+    chunked,
 )
 import datetime
+from concurrent.futures import ThreadPoolExecutor
 import click
 import arrow
 import json
@@ -23,6 +25,9 @@ LOG = get_logging_handle(__name__)
 # Proxy database
 dsl_database = SqliteDatabase(None)
 
+# Max number of variables in a single sqlite query (for older sqlite versions)
+SQLITE_MAX_VARIABLES = 999
+
 
 class BaseModel(Model):
     class Meta:
@@ -59,6 +64,9 @@ class DataTable(BaseModel):
 class CacheTableBase(BaseModel):
     tables = {}
 
+    # Combinations of kwargs with which get_entity_data looks up the entities
+    __lookup_kwargs__ = ()
+
     def __init_subclass__(cls, **kwargs):
         super().__init_subclass__(**kwargs)
 
@@ -78,19 +86,95 @@ class CacheTableBase(BaseModel):
     @classmethod
     def clear(cls):
         """removes entire data from table"""
-        raise NotImplementedError("clear helper not implemented")
+        cls.delete().execute()
 
     @classmethod
     def show_data(cls):
         raise NotImplementedError("show_data helper not implemented")
 
     @classmethod
-    def sync(cls):
-        raise NotImplementedError("sync helper not implemented")
+    def sync(cls, **kwargs):
+        """sync the table from server"""
+        cls.write_entries(cls.fetch_entries(**kwargs))
+
+    @classmethod
+    def fetch_entries(cls, **kwargs):
+        """
+            returns the entries(create_entry kwargs) fetched from server.
+            Entries may carry server side 'update_time' of the entity, used
+            by incremental sync.
+        """
+        raise NotImplementedError("fetch_entries helper not implemented")
+
+    @classmethod
+    def write_entries(cls, entries):
+        """replaces the table data by given entries in a single transaction"""
+
+        with cls._meta.database.atomic():
+            cls.clear()
+            cls.create_entries(entries)
+
+            CacheSyncTable.set_watermark(cls.__cache_type__, get_watermark(entries))
+
+    @classmethod
+    def write_entries_incremental(cls, entries):
+        """
+            applies the delta of given entries over table data in a single
+            transaction. New entities and entities updated since the last
+            sync watermark are upserted, rows of entities no longer present
+            at server are removed. Returns (upserted count, removed count).
+        """
+
+        watermark = CacheSyncTable.get_watermark(cls.__cache_type__)
+        existing_uuids = {row.uuid for row in cls.select(cls.uuid)}
+
+        fetched_uuids = set()
+        changed_entries = []
+        for entry in entries:
+            fetched_uuids.add(entry["uuid"])
+            update_time = entry.get("update_time")
+            if (
+                entry["uuid"] not in existing_uuids
+                or not (watermark and update_time)
+                or parse_update_time(update_time) >= watermark
+            ):
+                changed_entries.append(entry)
+
+        removed_uuids = existing_uuids - fetched_uuids
+        stale_uuids = list(removed_uuids | {e["uuid"] for e in changed_entries})
+
+        with cls._meta.database.atomic():
+            # Chunked to stay within sqlite's limit of query variables
+            while stale_uuids:
+                chunk = stale_uuids[:SQLITE_MAX_VARIABLES]
+                stale_uuids = stale_uuids[SQLITE_MAX_VARIABLES:]
+                cls.delete().where(cls.uuid.in_(chunk)).execute()
+
+            cls.create_entries(changed_entries)
+
+            CacheSyncTable.set_watermark(cls.__cache_type__, get_watermark(entries))
+
+        return len(changed_entries), len(removed_uuids)
+
+    @classmethod
+    def get_entry_row(cls, name, uuid, **kwargs):
+        """returns the table row(field values) for given entry"""
+        raise NotImplementedError("get_entry_row helper not implemented")
 
     @classmethod
     def create_entry(cls, name, uuid, **kwargs):
-        raise NotImplementedError("create_entry helper not implemented")
+        cls.create(**cls.get_entry_row(name, uuid, **kwargs))
+
+    @classmethod
+    def create_entries(cls, entries):
+        """stores the entries in table by chunked bulk inserts"""
+
+        rows = [cls.get_entry_row(**entry) for entry in entries]
+        # Each row takes a query variable per field
+        batch_size = max(SQLITE_MAX_VARIABLES // len(cls._meta.fields), 1)
+        with cls._meta.database.atomic():
+            for batch in chunked(rows, batch_size):
+                cls.insert_many(batch).execute()
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -103,6 +187,7 @@ class CacheTableBase(BaseModel):
 
 class AhvSubnetsCache(CacheTableBase):
     __cache_type__ = "ahv_subnet"
+    __lookup_kwargs__ = (("account_uuid",), ("account_uuid", "cluster"))
     name = CharField()
     uuid = CharField()
     cluster = CharField()
@@ -118,12 +203,6 @@ class AhvSubnetsCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -157,11 +236,8 @@ class AhvSubnetsCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table from server"""
-
-        # clear old data
-        cls.clear()
+    def fetch_entries(cls, max_workers=None, **kwargs):
+        """returns subnet entries of all Nutanix_PC accounts"""
 
         client = get_api_client()
         payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
@@ -170,32 +246,39 @@ class AhvSubnetsCache(CacheTableBase):
         AhvVmProvider = get_provider("AHV_VM")
         AhvObj = AhvVmProvider.get_api_obj()
 
-        for e_name, e_uuid in account_name_uuid_map.items():
+        def fetch_account_entries(account_uuid):
             try:
-                res = AhvObj.subnets(account_uuid=e_uuid)
+                res = AhvObj.subnets(account_uuid=account_uuid)
             except Exception:
                 LOG.warning(
                     "Unable to fetch subnets for Nutanix_PC Account(uuid={})".format(
-                        e_uuid
+                        account_uuid
                     )
                 )
-                continue
+                return []
 
+            entries = []
             for entity in res["entities"]:
-                name = entity["status"]["name"]
-                uuid = entity["metadata"]["uuid"]
                 cluster_ref = entity["status"]["cluster_reference"]
-                cluster_name = cluster_ref.get("name", "")
-
-                cls.create_entry(
-                    name=name, uuid=uuid, cluster=cluster_name, account_uuid=e_uuid
+                entries.append(
+                    {
+                        "name": entity["status"]["name"],
+                        "uuid": entity["metadata"]["uuid"],
+                        "cluster": cluster_ref.get("name", ""),
+                        "account_uuid": account_uuid,
+                        "update_time": entity["metadata"].get("last_update_time"),
+                    }
                 )
+            return entries
 
         # For older version < 2.9.0
         # Add working for older versions too
+        return fetch_account_wise(
+            fetch_account_entries, account_name_uuid_map.values(), max_workers
+        )
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def get_entry_row(cls, name, uuid, **kwargs):
         account_uuid = kwargs.get("account_uuid", "")
         if not account_uuid:
             LOG.error("Account UUID not supplied for subnet {}".format(name))
@@ -206,10 +289,12 @@ class AhvSubnetsCache(CacheTableBase):
             LOG.error("cluster not supplied for subnet {}".format(name))
             sys.exit(-1)
 
-        # store data in table
-        super().create(
-            name=name, uuid=uuid, cluster=cluster_name, account_uuid=account_uuid
-        )
+        return {
+            "name": name,
+            "uuid": uuid,
+            "cluster": cluster_name,
+            "account_uuid": account_uuid,
+        }
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -252,10 +337,12 @@ class AhvSubnetsCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("name", "account_uuid"), False), (("uuid",), False))
 
 
 class AhvImagesCache(CacheTableBase):
     __cache_type__ = "ahv_disk_image"
+    __lookup_kwargs__ = (("account_uuid", "image_type"),)
     name = CharField()
     image_type = CharField()
     uuid = CharField()
@@ -271,12 +358,6 @@ class AhvImagesCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -310,10 +391,8 @@ class AhvImagesCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
+    def fetch_entries(cls, max_workers=None, **kwargs):
+        """returns image entries of all Nutanix_PC accounts"""
 
         client = get_api_client()
         payload = {"length": 250, "filter": "state==VERIFIED;type==nutanix_pc"}
@@ -322,38 +401,51 @@ class AhvImagesCache(CacheTableBase):
         AhvVmProvider = get_provider("AHV_VM")
         AhvObj = AhvVmProvider.get_api_obj()
 
-        for e_name, e_uuid in account_name_uuid_map.items():
+        def fetch_account_entries(account_uuid):
             try:
-                res = AhvObj.images(account_uuid=e_uuid)
+                res = AhvObj.images(account_uuid=account_uuid)
             except Exception:
                 LOG.warning(
                     "Unable to fetch images for Nutanix_PC Account(uuid={})".format(
-                        e_uuid
+                        account_uuid
                     )
                 )
-                continue
+                return []
 
+            entries = []
             for entity in res["entities"]:
-                name = entity["status"]["name"]
-                uuid = entity["metadata"]["uuid"]
-                # TODO add proper validation for karbon images
-                image_type = entity["status"]["resources"].get("image_type", "")
-                cls.create_entry(
-                    name=name, uuid=uuid, image_type=image_type, account_uuid=e_uuid
+                entries.append(
+                    {
+                        "name": entity["status"]["name"],
+                        "uuid": entity["metadata"]["uuid"],
+                        # TODO add proper validation for karbon images
+                        "image_type": entity["status"]["resources"].get(
+                            "image_type", ""
+                        ),
+                        "account_uuid": account_uuid,
+                        "update_time": entity["metadata"].get("last_update_time"),
+                    }
                 )
+            return entries
+
+        return fetch_account_wise(
+            fetch_account_entries, account_name_uuid_map.values(), max_workers
+        )
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def get_entry_row(cls, name, uuid, **kwargs):
         account_uuid = kwargs.get("account_uuid", "")
         if not account_uuid:
             LOG.error("Account UUID not supplied for image {}".format(name))
             sys.exit(-1)
 
         image_type = kwargs.get("image_type", "")
-        # store data in table
-        super().create(
-            name=name, uuid=uuid, image_type=image_type, account_uuid=account_uuid
-        )
+        return {
+            "name": name,
+            "uuid": uuid,
+            "image_type": image_type,
+            "account_uuid": account_uuid,
+        }
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -395,10 +487,12 @@ class AhvImagesCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("name", "account_uuid"), False), (("uuid",), False))
 
 
 class ProjectCache(CacheTableBase):
     __cache_type__ = "project"
+    __lookup_kwargs__ = ((),)
     name = CharField()
     uuid = CharField()
     accounts_data = CharField()
@@ -414,12 +508,6 @@ class ProjectCache(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -444,33 +532,25 @@ class ProjectCache(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        """sync the table data from server"""
-        # clear old data
-        cls.clear()
+    def fetch_entries(cls, **kwargs):
+        """returns project entries fetched from server"""
 
-        # update by latest data
         client = get_api_client()
 
-        payload = {"length": 200, "offset": 0, "filter": "state!=DELETED;type!=nutanix"}
-        res, err = client.account.list(payload)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        res = res.json()
+        payload = {"length": 250, "offset": 0, "filter": "state!=DELETED;type!=nutanix"}
         # Single account per provider_type can be added to project
         account_uuid_type_map = {}
-        for entity in res["entities"]:
+        for entity in client.account.iter_entities(payload):
             a_uuid = entity["metadata"]["uuid"]
             a_type = entity["status"]["resources"]["type"]
             account_uuid_type_map[a_uuid] = a_type
 
         Obj = get_resource_api("projects", client.connection)
-        res, err = Obj.list({"length": 1000})
+        res, err = Obj.list_all({"length": 250})
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
-        res = res.json()
+        entries = []
         for entity in res["entities"]:
             name = entity["status"]["name"]
             uuid = entity["metadata"]["uuid"]
@@ -502,23 +582,28 @@ class ProjectCache(CacheTableBase):
                 subnets_uuid_list.append(subnet["uuid"])
 
             subnets_uuid_list = json.dumps(subnets_uuid_list)
-            cls.create_entry(
-                name=name,
-                uuid=uuid,
-                accounts_data=accounts_data,
-                whitelisted_subnets=subnets_uuid_list,
+            entries.append(
+                {
+                    "name": name,
+                    "uuid": uuid,
+                    "accounts_data": accounts_data,
+                    "whitelisted_subnets": subnets_uuid_list,
+                    "update_time": entity["metadata"].get("last_update_time"),
+                }
             )
 
+        return entries
+
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
+    def get_entry_row(cls, name, uuid, **kwargs):
         accounts_data = kwargs.get("accounts_data", "{}")
         whitelisted_subnets = kwargs.get("whitelisted_subnets", "[]")
-        super().create(
-            name=name,
-            uuid=uuid,
-            accounts_data=accounts_data,
-            whitelisted_subnets=whitelisted_subnets,
-        )
+        return {
+            "name": name,
+            "uuid": uuid,
+            "accounts_data": accounts_data,
+            "whitelisted_subnets": whitelisted_subnets,
+        }
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -541,10 +626,12 @@ class ProjectCache(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("uuid",), False),)
 
 
 class AhvNetworkFunctionChain(CacheTableBase):
     __cache_type__ = "ahv_network_function_chain"
+    __lookup_kwargs__ = ((),)
     name = CharField()
     uuid = CharField()
     last_update_time = DateTimeField(default=datetime.datetime.now())
@@ -556,12 +643,6 @@ class AhvNetworkFunctionChain(CacheTableBase):
             "last_update_time": self.last_update_time,
         }
 
-    @classmethod
-    def clear(cls):
-        """removes entire data from table"""
-        for db_entity in cls.select():
-            db_entity.delete_instance()
-
     @classmethod
     def show_data(cls):
         """display stored data in table"""
@@ -587,28 +668,27 @@ class AhvNetworkFunctionChain(CacheTableBase):
         click.echo(table)
 
     @classmethod
-    def sync(cls):
-        # clear old data
-        cls.clear()
+    def fetch_entries(cls, **kwargs):
+        """returns network function chain entries fetched from server"""
 
-        # update by latest data
         client = get_api_client()
         Obj = get_resource_api("network_function_chains", client.connection)
-        res, err = Obj.list({"length": 1000})
+        res, err = Obj.list_all({"length": 250})
         if err:
             raise Exception("[{}] - {}".format(err["code"], err["error"]))
 
-        res = res.json()
-        for entity in res["entities"]:
-            name = entity["status"]["name"]
-            uuid = entity["metadata"]["uuid"]
-            cls.create_entry(name=name, uuid=uuid)
+        return [
+            {
+                "name": entity["status"]["name"],
+                "uuid": entity["metadata"]["uuid"],
+                "update_time": entity["metadata"].get("last_update_time"),
+            }
+            for entity in res["entities"]
+        ]
 
     @classmethod
-    def create_entry(cls, name, uuid, **kwargs):
-        super().create(
-            name=name, uuid=uuid,
-        )
+    def get_entry_row(cls, name, uuid, **kwargs):
+        return {"name": name, "uuid": uuid}
 
     @classmethod
     def get_entity_data(cls, name, **kwargs):
@@ -622,6 +702,7 @@ class AhvNetworkFunctionChain(CacheTableBase):
     class Meta:
         database = dsl_database
         primary_key = CompositeKey("name", "uuid")
+        indexes = ((("uuid",), False),)
 
 
 class VersionTable(BaseModel):
@@ -636,6 +717,73 @@ class VersionTable(BaseModel):
         }
 
 
+class CacheSyncTable(BaseModel):
+    cache_type = CharField(primary_key=True)
+    watermark = CharField(default="")
+    last_update_time = DateTimeField(default=datetime.datetime.now)
+
+    @classmethod
+    def get_watermark(cls, cache_type):
+        """returns the server update time of latest entity synced in cache table"""
+
+        try:
+            entity = super().get(cls.cache_type == cache_type)
+        except DoesNotExist:
+            return None
+
+        return parse_update_time(entity.watermark) if entity.watermark else None
+
+    @classmethod
+    def set_watermark(cls, cache_type, watermark):
+
+        watermark = watermark.isoformat() if watermark else ""
+        cls.replace(
+            cache_type=cache_type,
+            watermark=watermark,
+            last_update_time=datetime.datetime.now(),
+        ).execute()
+
+
+def parse_update_time(update_time):
+    """returns timezone aware datetime for the iso formatted update time"""
+
+    try:
+        # Fast path for the utc timestamps returned by server
+        update_time = datetime.datetime.fromisoformat(
+            update_time.replace("Z", "+00:00")
+        )
+    except ValueError:
+        return arrow.get(update_time).datetime
+
+    if not update_time.tzinfo:
+        update_time = update_time.replace(tzinfo=datetime.timezone.utc)
+    return update_time
+
+
+def get_watermark(entries):
+    """returns the latest server update time among entries"""
+
+    update_times = [
+        parse_update_time(e["update_time"]) for e in entries if e.get("update_time")
+    ]
+    return max(update_times, default=None)
+
+
+def fetch_account_wise(fetch_account_entries, account_uuids, max_workers=None):
+    """
+        calls fetch_account_entries for all accounts concurrently and returns
+        the entries of all accounts, keeping the order of accounts
+    """
+
+    account_uuids = list(account_uuids)
+    if not account_uuids:
+        return []
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        account_entries = executor.map(fetch_account_entries, account_uuids)
+        return [entry for entries in account_entries for entry in entries]
+
+
 def highlight_text(text, **kwargs):
     """Highlight text in our standard format"""
     return click.style("{}".format(text), fg="blue", bold=False, **kwargs)
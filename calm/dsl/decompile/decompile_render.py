@@ -1,5 +1,4 @@
 import os
-from black import format_str, FileMode
 
 from calm.dsl.log import get_logging_handle
 from calm.dsl.decompile.bp_file_helper import render_bp_file_template
@@ -17,6 +16,8 @@ def create_bp_file(dir_name, bp_data):
 
 def create_bp_dir(bp_cls=None, bp_dir_name=None, with_secrets=False):
 
+    from black import format_str, FileMode
+
     bp_dir_name = bp_dir_name or bp_cls.__name__
     dir_name = os.getcwd()
 
@@ -1,12 +1,9 @@
-from jinja2 import Environment, PackageLoader
+from calm.dsl.tools import get_template as get_package_template
 
 
 def get_template(schema_file):
 
-    loader = PackageLoader(__name__, "schemas")
-    env = Environment(loader=loader)
-    template = env.get_template(schema_file)
-    return template
+    return get_package_template(__name__, schema_file, "schemas")
 
 
 def render_template(schema_file, obj):
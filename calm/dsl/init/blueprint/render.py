@@ -1,12 +1,12 @@
 import os
 import sys
 import json
-from jinja2 import Environment, PackageLoader
 from Crypto.PublicKey import RSA
 
 from calm.dsl.config import get_config
 from calm.dsl.store import Cache
 from calm.dsl.builtins import read_file
+from calm.dsl.tools import get_template
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -83,9 +83,7 @@ def render_blueprint_template(bp_name, provider_type):
 
     schema_file, temp_render_helper = template_map.get(provider_type)
 
-    loader = PackageLoader(__name__, "")
-    env = Environment(loader=loader)
-    template = env.get_template(schema_file)
+    template = get_template(__name__, schema_file)
 
     return temp_render_helper(template, bp_name)
 
@@ -1,7 +1,7 @@
 import os
-from jinja2 import Environment, PackageLoader
 
 from calm.dsl.builtins import read_file
+from calm.dsl.tools import get_template
 from calm.dsl.log import get_logging_handle
 from calm.dsl.config import get_config
 
@@ -12,9 +12,7 @@ def render_runbook_template(runbook_name):
 
     schema_file = "runbook.py.jinja2"
 
-    loader = PackageLoader(__name__, "")
-    env = Environment(loader=loader)
-    template = env.get_template(schema_file)
+    template = get_template(__name__, schema_file)
     LOG.info("Rendering runbook template")
     config = get_config()
     text = template.render(
@@ -1,5 +1,4 @@
 import logging
-import inspect
 
 from colorlog import ColoredFormatter
 import time
@@ -27,6 +26,7 @@ class CustomLogging:
         * LOG.critical  - [CRITICAL]
         * LOG.exception - [ERROR]
 
+    Messages can take lazy %-style args, formatted only if the record is emitted.
     """
 
     _VERBOSE_LEVEL = 20
@@ -66,11 +66,8 @@ class CustomLogging:
 
     @staticmethod
     def __add_caller_info(msg):
-        stack = inspect.stack()
-
-        # filename = stack[2][1]
-        # func = stack[2][3]
-        ln = stack[2][2]
+        # Frame of the caller of logging method
+        ln = sys._getframe(2).f_lineno
 
         return ":{}] {}".format(ln, msg)
 
@@ -78,12 +75,18 @@ class CustomLogging:
     def set_verbose_level(cls, lvl):
         cls._VERBOSE_LEVEL = lvl
 
+    @classmethod
+    def get_verbose_level(cls):
+        return cls._VERBOSE_LEVEL
+
     @classmethod
     def enable_show_trace(cls):
         cls._SHOW_TRACE = True
 
     def get_logger(self):
-        self.set_logger_level(self._VERBOSE_LEVEL)
+        # Setting the level clears the logging cache, so it is done only on change
+        if self._logger.level != self._VERBOSE_LEVEL:
+            self.set_logger_level(self._VERBOSE_LEVEL)
         self.show_trace = self._SHOW_TRACE
         return self._logger
 
@@ -100,7 +103,7 @@ class CustomLogging:
         """sets the logger verbose level"""
         self._logger.setLevel(lvl)
 
-    def info(self, msg, nl=True, **kwargs):
+    def info(self, msg, *args, nl=True, **kwargs):
         """
         info log level
 
@@ -112,12 +115,14 @@ class CustomLogging:
             None
         """
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.INFO):
+            return
 
         if not nl:
             for handler in logger.handlers:
                 handler.terminator = " "
 
-        logger.info(self.__add_caller_info(msg), **kwargs)
+        logger.info(self.__add_caller_info(msg), *args, **kwargs)
 
         if not nl:
             for handler in logger.handlers:
@@ -135,6 +140,9 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.WARNING):
+            return
+
         return logger.warning(self.__add_caller_info(msg), *args, **kwargs)
 
     def error(self, msg, *args, **kwargs):
@@ -149,6 +157,9 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+
         if self.show_trace:
             kwargs["stack_info"] = sys.exc_info()
         return logger.error(self.__add_caller_info(msg), *args, **kwargs)
@@ -165,6 +176,9 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.ERROR):
+            return
+
         if self.show_trace:
             kwargs["stack_info"] = sys.exc_info()
         return logger.exception(self.__add_caller_info(msg), *args, **kwargs)
@@ -181,6 +195,9 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.CRITICAL):
+            return
+
         if self.show_trace:
             kwargs["stack_info"] = sys.exc_info()
         return logger.critical(self.__add_caller_info(msg), *args, **kwargs)
@@ -197,6 +214,9 @@ class CustomLogging:
         """
 
         logger = self.get_logger()
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
         return logger.debug(self.__add_caller_info(msg), *args, **kwargs)
 
     def __addCustomFormatter(self, ch):
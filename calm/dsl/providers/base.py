@@ -1,11 +1,7 @@
 from collections import OrderedDict
-from io import StringIO
-import json
 
-from ruamel import yaml
-from jinja2 import Environment, PackageLoader
 import jsonref
-from calm.dsl.tools import StrictDraft7Validator
+from calm.dsl.tools import StrictDraft7Validator, get_yaml_template_json
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -22,10 +18,7 @@ class ProviderBase:
 
         if provider_type:
 
-            # Init Provider
-            cls._init()
-
-            # Register Provider
+            # Register Provider. Provider spec is loaded lazily(on first use)
             cls.providers[provider_type] = cls
 
 
@@ -35,6 +28,9 @@ class Provider(ProviderBase):
     spec_template_file = None
     package_name = None
 
+    provider_spec = None
+    Validator = None
+
     @classmethod
     def _init(cls):
 
@@ -44,22 +40,29 @@ class Provider(ProviderBase):
         if cls.spec_template_file is None:
             raise NotImplementedError("Spec file not given")
 
-        loader = PackageLoader(cls.package_name, "")
-        env = Environment(loader=loader)
-        template = env.get_template(cls.spec_template_file)
-        tdict = yaml.safe_load(StringIO(template.render()))
-        tdict = jsonref.loads(json.dumps(tdict))
+        LOG.debug("Loading provider spec for {}".format(cls.provider_type))
+        tdict = jsonref.loads(
+            get_yaml_template_json(cls.package_name, cls.spec_template_file)
+        )
 
         # TODO - Check if keys are present
         cls.provider_spec = tdict["components"]["schemas"]["provider_spec"]
         cls.Validator = StrictDraft7Validator(cls.provider_spec)
 
+    @classmethod
+    def is_initialized(cls):
+        return cls.Validator is not None
+
     @classmethod
     def get_provider_spec(cls):
+        if not cls.is_initialized():
+            cls._init()
         return cls.provider_spec
 
     @classmethod
     def get_validator(cls):
+        if not cls.is_initialized():
+            cls._init()
         return cls.Validator
 
     @classmethod
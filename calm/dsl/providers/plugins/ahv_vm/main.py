@@ -12,7 +12,6 @@ from calm.dsl.api import get_resource_api, get_api_client
 from calm.dsl.providers import get_provider_interface
 from calm.dsl.tools import StrictDraft7Validator
 from calm.dsl.log import get_logging_handle
-from calm.dsl.builtins import ref
 from calm.dsl.store import Version
 
 from .constants import AHV as AhvConstants
@@ -36,6 +35,10 @@ class AhvVmProvider(Provider):
     @classmethod
     def update_vm_image_config(cls, spec, disk_packages={}):
         """Ex: disk_packages = {disk_index: vmImageClass}"""
+
+        # Imported here, as builtins are not needed for other provider helpers
+        from calm.dsl.builtins import ref
+
         disk_list = spec["resources"].get("disk_list", [])
 
         for disk_ind, img_cls in disk_packages.items():
@@ -778,6 +781,21 @@ class AhvBase:
     def get_version(cls):
         return getattr(cls, "__api_version__")
 
+    @staticmethod
+    def list_entities(Obj, params, paginate=True):
+        """returns list response of Obj, entities of all pages if paginate is set"""
+
+        if paginate:
+            res, err = Obj.list_all(params, ignore_error=True)
+        else:
+            res, err = Obj.list(params, ignore_error=True)
+            res = None if err else res.json()
+
+        if err:
+            raise Exception("[{}] - {}".format(err["code"], err["error"]))
+
+        return res
+
     def images(self, *args, **kwargs):
         raise NotImplementedError("images call not implemented")
 
@@ -828,12 +846,8 @@ class AhvNew(AhvBase):
             filter_query = filter_query[1:]
 
         params = {"length": limit, "offset": offset, "filter": filter_query}
-        res, err = Obj.list(params, ignore_error=True)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        res = res.json()
-        return res
+        # Walk all pages unless a single page is asked for
+        return self.list_entities(Obj, params, paginate="length" not in kwargs)
 
     def subnets(self, *args, **kwargs):
         Obj = get_resource_api(self.SUBNETS, self.connection)
@@ -849,12 +863,8 @@ class AhvNew(AhvBase):
             filter_query = filter_query[1:]
 
         params = {"length": limit, "offset": offset, "filter": filter_query}
-        res, err = Obj.list(params, ignore_error=True)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        res = res.json()
-        return res
+        # Walk all pages unless a single page is asked for
+        return self.list_entities(Obj, params, paginate="length" not in kwargs)
 
     def categories(self, *args, **kwargs):
         payload = copy.deepcopy(self.CATEGORIES_PAYLOAD)
@@ -924,12 +934,8 @@ class Ahv(AhvBase):
         filter_query = kwargs.get("filter_query", "")
 
         params = {"length": limit, "offset": offset, "filter": filter_query}
-        res, err = Obj.list(params, ignore_error=True)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        res = res.json()
-        return res
+        # Walk all pages unless a single page is asked for
+        return self.list_entities(Obj, params, paginate="length" not in kwargs)
 
     def subnets(self, *args, **kwargs):
         Obj = get_resource_api(self.SUBNETS, self.connection)
@@ -938,12 +944,8 @@ class Ahv(AhvBase):
         filter_query = kwargs.get("filter_query", "")
 
         params = {"length": limit, "offset": offset, "filter": filter_query}
-        res, err = Obj.list(params, ignore_error=True)
-        if err:
-            raise Exception("[{}] - {}".format(err["code"], err["error"]))
-
-        res = res.json()
-        return res
+        # Walk all pages unless a single page is asked for
+        return self.list_entities(Obj, params, paginate="length" not in kwargs)
 
     def categories(self, *args, **kwargs):
         Obj = get_resource_api(self.GROUPS, self.connection)
@@ -1,10 +1,14 @@
 import click
+import copy
 import sys
 import traceback
+from concurrent.futures import ThreadPoolExecutor
 from peewee import OperationalError, IntegrityError
 
 from ..db import get_db_handle, init_db_handle
+from calm.dsl.api import get_api_client
 from .version import Version
+from calm.dsl.tools.compile_deps import record_lookup
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -13,6 +17,53 @@ LOG = get_logging_handle(__name__)
 class Cache:
     """Cache class Implementation"""
 
+    # Default number of concurrent fetches while syncing cache
+    SYNC_WORKERS = 8
+
+    # Cache types whose table is read whole into memory on first lookup
+    WARM_LOAD_TYPES = {"project"}
+
+    # Per process memo of entity lookups, invalidated on sync/clear of cache
+    _entity_data_memo = {}
+    _warm_loaded_types = set()
+
+    @classmethod
+    def clear_memo(cls):
+        """clears the entity lookups memoized in this process"""
+
+        cls._entity_data_memo.clear()
+        cls._warm_loaded_types.clear()
+
+    @staticmethod
+    def _get_memo_key(entity_type, name, kwargs):
+        """returns memo key for lookup, None if lookup can't be memoized"""
+
+        # Lookups ignore the empty filters
+        lookup_kwargs = tuple(sorted((k, v) for k, v in kwargs.items() if v))
+        try:
+            hash(lookup_kwargs)
+        except TypeError:
+            return None
+
+        return (entity_type, name, lookup_kwargs)
+
+    @classmethod
+    def warm_load(cls, entity_type):
+        """reads the whole cache table of entity_type into the memo"""
+
+        db_cls = cls.get_cache_tables()[entity_type]
+        for entity in db_cls.select():
+            entity_data = entity.get_detail_dict()
+            for lookup_fields in db_cls.__lookup_kwargs__:
+                lookup_kwargs = {k: entity_data[k] for k in lookup_fields}
+                memo_key = cls._get_memo_key(
+                    entity_type, entity_data["name"], lookup_kwargs
+                )
+                # First entity wins, as in table lookups
+                cls._entity_data_memo.setdefault(memo_key, entity_data)
+
+        cls._warm_loaded_types.add(entity_type)
+
     @classmethod
     def get_cache_tables(cls):
         """returns tables used for cache purpose"""
@@ -30,6 +81,41 @@ class Cache:
     def get_entity_data(cls, entity_type, name, **kwargs):
         """returns entity data corresponding to supplied entry using entity name"""
 
+        memo_key = cls._get_memo_key(entity_type, name, kwargs)
+        if memo_key is not None:
+            if memo_key not in cls._entity_data_memo:
+                cls._memoize_entity_data(memo_key, entity_type, name, **kwargs)
+
+            res = copy.deepcopy(cls._entity_data_memo[memo_key])
+
+        else:
+            res = cls._get_entity_data(entity_type, name, **kwargs)
+
+        record_lookup(
+            "entity_data", dict(entity_type=entity_type, name=name, **kwargs), res
+        )
+        return res
+
+    @classmethod
+    def _memoize_entity_data(cls, memo_key, entity_type, name, **kwargs):
+
+        if (
+            entity_type in cls.WARM_LOAD_TYPES
+            and entity_type not in cls._warm_loaded_types
+        ):
+            try:
+                cls.warm_load(entity_type)
+            except OperationalError:
+                LOG.debug("Failed to warm load {} cache table".format(entity_type))
+
+        if memo_key not in cls._entity_data_memo:
+            cls._entity_data_memo[memo_key] = cls._get_entity_data(
+                entity_type, name, **kwargs
+            )
+
+    @classmethod
+    def _get_entity_data(cls, entity_type, name, **kwargs):
+
         cache_tables = cls.get_cache_tables()
         if not entity_type:
             LOG.error("No entity type for cache supplied")
@@ -76,35 +162,75 @@ class Cache:
             )
             sys.exit(-1)
 
+        record_lookup(
+            "entity_data_using_uuid",
+            dict(entity_type=entity_type, uuid=uuid, **kwargs),
+            res,
+        )
         return res
 
     @classmethod
-    def sync(cls):
-        """Sync cache by latest data"""
+    def sync(cls, max_workers=None, incremental=False):
+        """
+            Sync cache by latest data. Data of all tables (and of all accounts
+            inside a table) is fetched concurrently, with at most max_workers
+            requests to server at a time, while each table is written in a
+            single transaction from the calling thread.
+            If incremental is set, only the delta is applied over existing data.
+        """
+
+        max_workers = max_workers or cls.SYNC_WORKERS
+        cls.clear_memo()
 
         def sync_tables(tables):
-            for table in tables:
-                table.sync()
-                click.echo(".", nl=False, err=True)
+            # Version is synced first, as provider apis depend on calm version
+            Version.sync()
+            click.echo(".", nl=False, err=True)
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                table_entries = [
+                    executor.submit(table.fetch_entries, max_workers=max_workers)
+                    for table in tables
+                ]
+                try:
+                    for table, entries in zip(tables, table_entries):
+                        if incremental:
+                            upserted, removed = table.write_entries_incremental(
+                                entries.result()
+                            )
+                            LOG.debug(
+                                "{}: {} entries upserted, {} removed".format(
+                                    table.__cache_type__, upserted, removed
+                                )
+                            )
+                        else:
+                            table.write_entries(entries.result())
+                        click.echo(".", nl=False, err=True)
+
+                except Exception:
+                    for entries in table_entries:
+                        entries.cancel()
+                    raise
 
         cache_table_map = cls.get_cache_tables()
         tables = list(cache_table_map.values())
 
-        # Inserting version table at start
-        tables.insert(0, Version)
+        # Fetches of tables, accounts and pages are nested thread pools, all
+        # using the same connection. Bound the requests made by all of them.
+        connection = get_api_client().connection
+        with connection.limit_requests(max_workers):
+            try:
+                LOG.info("Updating cache", nl=False)
+                sync_tables(tables)
 
-        try:
-            LOG.info("Updating cache", nl=False)
-            sync_tables(tables)
-
-        except (OperationalError, IntegrityError):
-            click.echo(" [Fail]")
-            # init db handle once (recreating db if some schema changes are there)
-            LOG.info("Removing existing db and updating cache again")
-            init_db_handle()
-            LOG.info("Updating cache", nl=False)
-            sync_tables(tables)
-            click.echo(" [Done]", err=True)
+            except (OperationalError, IntegrityError):
+                click.echo(" [Fail]")
+                # init db handle once (recreating db if some schema changes are there)
+                LOG.info("Removing existing db and updating cache again")
+                init_db_handle()
+                LOG.info("Updating cache", nl=False)
+                sync_tables(tables)
+                click.echo(" [Done]", err=True)
 
     @classmethod
     def clear_entities(cls):
@@ -112,6 +238,7 @@ class Cache:
 
         # For now clearing means erasing all data. So reinitialising whole database
         init_db_handle()
+        cls.clear_memo()
 
     @classmethod
     def show_data(cls):
@@ -2,6 +2,7 @@ import peewee
 
 from ..db import get_db_handle
 from calm.dsl.api import get_api_client
+from calm.dsl.tools.compile_deps import record_lookup
 from calm.dsl.log import get_logging_handle
 
 LOG = get_logging_handle(__name__)
@@ -26,10 +27,13 @@ class Version:
         db = get_db_handle()
         try:
             entity = db.version_table.get(db.version_table.name == name)
-            return entity.version
+            version = entity.version
 
         except peewee.DoesNotExist:
-            return None
+            version = None
+
+        record_lookup("version", {"name": name}, version)
+        return version
 
     @classmethod
     def sync(cls):
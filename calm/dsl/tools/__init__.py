@@ -1,6 +1,7 @@
 from .ping import ping
 from .validator import StrictDraft7Validator
 from .click_options import simple_verbosity_option, show_trace_option
+from .template_cache import get_yaml_template_json, get_template
 
 
 __all__ = [
@@ -9,4 +10,6 @@ __all__ = [
     "StrictDraft7Validator",
     "simple_verbosity_option",
     "show_trace_option",
+    "get_yaml_template_json",
+    "get_template",
 ]
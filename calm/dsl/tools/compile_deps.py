@@ -0,0 +1,120 @@
+"""
+compile_deps: Records the inputs read by dsl while it is compiled
+
+Files read through read_file/read_spec/read_env, env variables and local
+cache lookups are recorded on the active DependencyRecorder, if any.
+Look at calm.dsl.cli.compile_cache for its usage.
+"""
+
+import os
+import json
+import hashlib
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+_RECORDER = None
+
+
+def get_file_digest(file_path):
+    """returns sha256 digest of file content, None if file is not present"""
+
+    try:
+        with open(file_path, "rb") as fd:
+            return hashlib.sha256(fd.read()).hexdigest()
+    except (FileNotFoundError, NotADirectoryError):
+        return None
+
+
+def get_data_digest(data):
+    """returns sha256 digest of json serializable data"""
+
+    data = json.dumps(data, sort_keys=True, default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class DependencyRecorder:
+    """Records the dependencies of dsl compiled within its context"""
+
+    def __init__(self):
+        self.files = {}
+        self.env = {}
+        self.lookups = {}
+        self.cacheable = True
+        self._previous = None
+
+    def __enter__(self):
+        global _RECORDER
+        self._previous = _RECORDER
+        _RECORDER = self
+        return self
+
+    def __exit__(self, *exc):
+        global _RECORDER
+        _RECORDER = self._previous
+
+    def add_file(self, file_path):
+        file_path = os.path.abspath(file_path)
+        if file_path not in self.files:
+            self.files[file_path] = get_file_digest(file_path)
+
+    def add_env(self, name):
+        self.env.setdefault(name, os.environ.get(name))
+
+    def add_lookup(self, lookup_type, lookup_kwargs, result):
+        try:
+            lookup_key = json.dumps([lookup_type, lookup_kwargs], sort_keys=True)
+        except (TypeError, ValueError):
+            self.set_uncacheable("{} lookup is not serializable".format(lookup_type))
+            return
+
+        self.lookups.setdefault(lookup_key, get_data_digest(result))
+
+    def set_uncacheable(self, reason):
+        LOG.debug("Compiled dsl is not cacheable: {}".format(reason))
+        self.cacheable = False
+
+    def get_dependencies(self):
+        """returns json serializable dependencies"""
+
+        return {
+            "files": self.files,
+            "env": self.env,
+            "lookups": [
+                json.loads(lookup_key) + [digest]
+                for lookup_key, digest in self.lookups.items()
+            ],
+        }
+
+
+def is_recording():
+    return _RECORDER is not None
+
+
+def record_file(file_path):
+    """records file read by dsl"""
+
+    if _RECORDER:
+        _RECORDER.add_file(file_path)
+
+
+def record_env(name):
+    """records os env variable read by dsl"""
+
+    if _RECORDER:
+        _RECORDER.add_env(name)
+
+
+def record_lookup(lookup_type, lookup_kwargs, result):
+    """records local cache lookup done while compiling dsl"""
+
+    if _RECORDER:
+        _RECORDER.add_lookup(lookup_type, lookup_kwargs, result)
+
+
+def record_uncacheable(reason):
+    """records that compiled dsl depends on inputs that are not tracked"""
+
+    if _RECORDER:
+        _RECORDER.set_uncacheable(reason)
@@ -0,0 +1,122 @@
+import os
+import sys
+import json
+import hashlib
+import importlib
+from functools import lru_cache
+from io import StringIO
+
+from ruamel import yaml
+from jinja2 import Environment, PackageLoader, FileSystemBytecodeCache
+
+from calm.dsl.config import get_default_cache_dir
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+# Bump this whenever the format of the cached template files changes
+TEMPLATE_CACHE_VERSION = 1
+
+# Sub directory of cache dir having compiled jinja templates
+BYTECODE_CACHE_DIR = "jinja2"
+
+
+@lru_cache(maxsize=None)
+def get_template_env(package_name, template_dir=""):
+    """
+        returns jinja environment for templates of the package, cached in
+        process. Compiled templates are cached in the cache dir across runs,
+        keyed by the checksum of template source.
+    """
+
+    bytecode_cache = None
+    try:
+        cache_dir = os.path.join(get_default_cache_dir(), BYTECODE_CACHE_DIR)
+        os.makedirs(cache_dir, exist_ok=True)
+        bytecode_cache = FileSystemBytecodeCache(cache_dir)
+    except OSError as exc:
+        LOG.debug("Template bytecode cache not available: {}".format(exc))
+
+    loader = PackageLoader(package_name, template_dir)
+    return Environment(loader=loader, bytecode_cache=bytecode_cache)
+
+
+def get_template(package_name, template_file, template_dir=""):
+    """returns the template from the cached environment of package"""
+
+    return get_template_env(package_name, template_dir).get_template(template_file)
+
+
+def _get_template_dir(package_name, template_dir):
+
+    module = sys.modules.get(package_name) or importlib.import_module(package_name)
+    return os.path.join(os.path.dirname(os.path.abspath(module.__file__)), template_dir)
+
+
+def _get_template_sources_digest(template_dir):
+    """returns digest of all templates present in template_dir"""
+
+    digest = hashlib.sha256()
+    for file_name in sorted(os.listdir(template_dir)):
+        if not file_name.endswith(".jinja2"):
+            continue
+
+        digest.update(file_name.encode("utf-8"))
+        with open(os.path.join(template_dir, file_name), "rb") as fd:
+            digest.update(fd.read())
+
+    return digest.hexdigest()
+
+
+def _get_template_cache_file(package_name, template_file, template_dir):
+
+    template_dir = _get_template_dir(package_name, template_dir)
+    cache_file = "{}.{}.v{}.{}.json".format(
+        package_name,
+        template_file.split(".")[0],
+        TEMPLATE_CACHE_VERSION,
+        _get_template_sources_digest(template_dir)[:16],
+    )
+    return os.path.join(get_default_cache_dir(), cache_file)
+
+
+def render_yaml_template(package_name, template_file, template_dir=""):
+    """renders the yaml template and returns its json document"""
+
+    template = get_template(package_name, template_file, template_dir)
+
+    tdict = yaml.safe_load(StringIO(template.render()))
+    return json.dumps(tdict)
+
+
+def get_yaml_template_json(package_name, template_file, template_dir=""):
+    """
+        returns the json document of rendered yaml template.
+        Document is read from the cache dir if present, else the template is
+        rendered and written to the cache dir. Cache files are keyed by the
+        digest of all templates in template_dir, so any change in them
+        invalidates the cache.
+    """
+
+    try:
+        cache_file = _get_template_cache_file(package_name, template_file, template_dir)
+    except Exception as exc:
+        LOG.debug("Template cache not available: {}".format(exc))
+        return render_yaml_template(package_name, template_file, template_dir)
+
+    if os.path.exists(cache_file):
+        with open(cache_file, "r") as fd:
+            return fd.read()
+
+    LOG.debug("Writing template cache to '{}'".format(cache_file))
+    document = render_yaml_template(package_name, template_file, template_dir)
+    tmp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+    try:
+        with open(tmp_file, "w") as fd:
+            fd.write(document)
+        os.replace(tmp_file, cache_file)
+
+    except OSError as exc:
+        LOG.debug("Failed to write template cache: {}".format(exc))
+
+    return document
@@ -0,0 +1,150 @@
+import importlib
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+from requests.exceptions import ConnectTimeout
+
+from calm.dsl.cli import main as cli
+
+from calm.dsl.api.connection import (
+    ServerConnectionError,
+    ServerConnectTimeout,
+    build_retry,
+)
+from tests.stub_server import StubHandler, get_connection
+
+
+class FlakyHandler(StubHandler):
+    """Responds with the queued error statuses first, then succeeds"""
+
+    def _respond(self):
+        self.read_body()
+        self.server.calls += 1
+
+        if not self.server.errors:
+            return self.respond({"entities": []})
+
+        status, retry_after = self.server.errors.pop(0)
+        headers = {}
+        if retry_after is not None:
+            headers["Retry-After"] = str(retry_after)
+        self.respond({"code": status}, status=status, headers=headers)
+
+    do_GET = _respond
+    do_POST = _respond
+
+
+@pytest.fixture
+def server(stub_server):
+
+    return stub_server(FlakyHandler, calls=0, errors=[])
+
+
+def _get_connection(server, **kwargs):
+
+    return get_connection(server, backoff_factor=0, backoff_jitter=0, **kwargs)
+
+
+def test_retries_on_unavailable_server(server):
+
+    server.errors = [(503, 0), (502, None)]
+    connection = _get_connection(server, retries_enabled=True)
+
+    # List calls are POST and are retried as well
+    res, err = connection._call("api/nutanix/v3/blueprints/list")
+    assert err is None
+    assert res.json() == {"entities": []}
+    assert server.calls == 3
+    connection.close()
+
+
+def test_post_not_retried_on_unavailable_server(server):
+
+    server.errors = [(503, 0)]
+    connection = _get_connection(server, retries_enabled=True)
+
+    # Server may have launched the blueprint already
+    res, err = connection._call(
+        "api/nutanix/v3/blueprints/uuid/launch", ignore_error=True
+    )
+    assert err["code"] == 503
+    assert server.calls == 1
+
+    # Rate limited request is not processed by server
+    server.calls = 0
+    server.errors = [(429, 0), (429, None)]
+    res, err = connection._call(
+        "api/nutanix/v3/blueprints/uuid/launch", ignore_error=True
+    )
+    assert err["code"] == 429
+    assert server.calls == 2
+    connection.close()
+
+
+def test_retries_exhausted_returns_error(server):
+
+    server.errors = [(503, 0)] * 3
+    connection = _get_connection(server, retries_enabled=True, retries=1)
+
+    res, err = connection._call("api/nutanix/v3/blueprints/list", ignore_error=True)
+    assert err["code"] == 503
+    assert server.calls == 2
+    connection.close()
+
+
+def test_no_retries_if_disabled(server):
+
+    server.errors = [(503, 0)]
+    connection = _get_connection(server)
+
+    res, err = connection._call("api/nutanix/v3/blueprints/list", ignore_error=True)
+    assert err["code"] == 503
+    assert server.calls == 1
+    connection.close()
+
+
+def test_connect_timeout_is_raised(server):
+
+    connection = _get_connection(server, retries_enabled=True)
+    with mock.patch.object(
+        connection.session, "post", side_effect=ConnectTimeout("timed out")
+    ):
+        with pytest.raises(ServerConnectionError) as exc_info:
+            connection._call("api/nutanix/v3/blueprints/list")
+
+    assert isinstance(exc_info.value, ServerConnectTimeout)
+    assert exc_info.value.port == server.server_port
+    connection.close()
+
+
+def test_cli_exits_on_connection_error():
+
+    # calm.dsl.cli.main is shadowed by the main command
+    cli_module = importlib.import_module("calm.dsl.cli.main")
+    bp_commands = importlib.import_module("calm.dsl.cli.bp_commands")
+
+    runner = CliRunner()
+    with mock.patch.object(cli_module, "validate_version"), mock.patch.object(
+        bp_commands,
+        "get_blueprint_list",
+        side_effect=ServerConnectTimeout("Could not establish connection"),
+    ):
+        result = runner.invoke(cli, ["get", "bps"])
+
+    assert result.exit_code == -1
+    assert isinstance(result.exception, SystemExit)
+
+
+def test_backoff_jitter():
+
+    retry = build_retry(
+        retries=5, backoff_factor=1, backoff_jitter=0.5, status_codes=[503]
+    )
+    for _ in range(3):
+        retry = retry.increment(method="GET", url="/", error=None)
+
+    # Jitter is carried over to the incremented retries
+    base_backoff = 4
+    for _ in range(20):
+        assert base_backoff <= retry.get_backoff_time() <= base_backoff + 0.5
@@ -0,0 +1,66 @@
+import gzip
+
+import pytest
+
+from calm.dsl.api.codec import JSONCodec, set_codec
+from tests.stub_server import StubHandler, get_connection
+
+PAYLOAD = {"spec": {"name": "bp", "resources": {"description": "x" * 32 * 1024}}}
+
+
+class GzipEchoHandler(StubHandler):
+    """Echoes the request body, gzipping the response if client accepts it"""
+
+    def do_POST(self):
+        self.server.request_headers = self.headers
+        body = self.read_body()
+
+        headers = {}
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            body = gzip.compress(body)
+            headers["Content-Encoding"] = "gzip"
+        self.respond(body, headers=headers)
+
+
+@pytest.fixture
+def server(stub_server):
+
+    return stub_server(GzipEchoHandler)
+
+
+def test_gzip_upload(server):
+
+    connection = get_connection(server, gzip_uploads=True)
+    res, err = connection._call("upload", request_json=PAYLOAD, compress=True)
+    assert err is None
+    assert res.json() == PAYLOAD
+    assert server.request_headers["Content-Encoding"] == "gzip"
+    assert int(server.request_headers["Content-Length"]) < 1024
+
+    # Bodies of calls other than uploads are not compressed
+    res, err = connection._call("list", request_json=PAYLOAD)
+    assert res.json() == PAYLOAD
+    assert "Content-Encoding" not in server.request_headers
+    connection.close()
+
+
+def test_no_gzip_upload_if_disabled(server):
+
+    connection = get_connection(server)
+    res, err = connection._call("upload", request_json=PAYLOAD, compress=True)
+    assert res.json() == PAYLOAD
+    assert "Content-Encoding" not in server.request_headers
+    assert "gzip" in server.request_headers["Accept-Encoding"]
+    connection.close()
+
+
+def test_stdlib_codec(server):
+
+    previous_codec = set_codec(JSONCodec())
+    try:
+        connection = get_connection(server)
+        res, err = connection._call("list", request_json=PAYLOAD)
+        assert res.json() == PAYLOAD
+        connection.close()
+    finally:
+        set_codec(previous_codec)
@@ -0,0 +1,214 @@
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from unittest.mock import MagicMock, patch
+
+from calm.dsl.api.resource import get_resource_api
+from tests.stub_server import StubHandler, get_connection
+
+
+class StubConnection:
+    """Serves list calls from a fixed set of entities, honouring length/offset"""
+
+    def __init__(self, entities, fail_at_offset=None, pool_maxsize=4, latency=0):
+        self.entities = entities
+        self.fail_at_offset = fail_at_offset
+        self.pool_maxsize = pool_maxsize
+        self.max_concurrent_requests = pool_maxsize
+        self.latency = latency
+        self.requests = []
+        self.active_calls = 0
+        self.max_active_calls = 0
+        self._lock = threading.Lock()
+
+    def _call(self, endpoint, request_json=None, ignore_error=False, **kwargs):
+        request_json = dict(request_json or {})
+        with self._lock:
+            self.requests.append(request_json)
+            self.active_calls += 1
+            self.max_active_calls = max(self.max_active_calls, self.active_calls)
+
+        time.sleep(self.latency)
+        with self._lock:
+            self.active_calls -= 1
+
+        offset = request_json.get("offset", 0)
+        if offset == self.fail_at_offset:
+            return None, {"code": 500, "error": "Internal error"}
+
+        length = request_json["length"]
+        page_end = offset + length
+        res = MagicMock()
+        res.json.return_value = {
+            "entities": self.entities[offset:page_end],
+            "metadata": {
+                "total_matches": len(self.entities),
+                "length": length,
+                "offset": offset,
+            },
+        }
+        return res, None
+
+
+def _get_entities(count):
+    return [
+        {"status": {"name": "entity_{}".format(i)}, "metadata": {"uuid": str(i)}}
+        for i in range(count)
+    ]
+
+
+@pytest.mark.parametrize("prefetch", [False, True])
+def test_iter_entities_walks_all_pages(prefetch):
+
+    connection = StubConnection(_get_entities(1001))
+    Obj = get_resource_api("projects", connection)
+
+    entities = list(Obj.iter_entities({"length": 250}, prefetch=prefetch))
+    assert [e["metadata"]["uuid"] for e in entities] == [str(i) for i in range(1001)]
+    assert [r["offset"] for r in connection.requests] == [0, 250, 500, 750, 1000]
+
+
+def test_iter_entities_empty_list():
+
+    connection = StubConnection([])
+    Obj = get_resource_api("projects", connection)
+
+    assert list(Obj.iter_entities(page_size=20)) == []
+    assert len(connection.requests) == 1
+
+
+def test_iter_entities_raises_on_page_error():
+
+    connection = StubConnection(_get_entities(30), fail_at_offset=20)
+    Obj = get_resource_api("projects", connection)
+
+    with pytest.raises(Exception, match="500"):
+        list(Obj.iter_entities(page_size=10, prefetch=True))
+
+
+def test_name_uuid_map_beyond_single_page():
+
+    entities = _get_entities(300)
+    entities.append({"status": {"name": "entity_0"}, "metadata": {"uuid": "dup"}})
+    connection = StubConnection(entities)
+    Obj = get_resource_api("projects", connection)
+
+    name_uuid_map = Obj.get_name_uuid_map({"length": 100})
+    assert len(name_uuid_map) == 300
+    assert name_uuid_map["entity_0"] == ["0", "dup"]
+    assert name_uuid_map["entity_299"] == "299"
+
+
+def test_list_all_keeps_page_order():
+
+    connection = StubConnection(_get_entities(1001), latency=0.01)
+    Obj = get_resource_api("projects", connection)
+
+    res, err = Obj.list_all({"length": 100})
+    assert err is None
+    assert [e["metadata"]["uuid"] for e in res["entities"]] == [
+        str(i) for i in range(1001)
+    ]
+    assert res["metadata"]["total_matches"] == 1001
+    assert res["metadata"]["length"] == 1001
+
+
+def test_list_all_respects_pool_maxsize():
+
+    connection = StubConnection(_get_entities(1000), pool_maxsize=3, latency=0.01)
+    Obj = get_resource_api("projects", connection)
+
+    res, err = Obj.list_all(page_size=50)
+    assert err is None
+    assert len(res["entities"]) == 1000
+    assert 1 < connection.max_active_calls <= 3
+
+
+def test_list_all_stops_on_error():
+
+    connection = StubConnection(
+        _get_entities(1000), fail_at_offset=100, pool_maxsize=1, latency=0.01
+    )
+    Obj = get_resource_api("projects", connection)
+
+    res, err = Obj.list_all(page_size=50)
+    assert res is None
+    assert err["code"] == 500
+    # Pages queued after the failed one are never fetched
+    assert len(connection.requests) < 20
+
+
+@pytest.mark.parametrize(
+    "all_items, all_pages, states_filtered, list_all_called",
+    [(True, False, True, False), (False, True, False, True)],
+)
+def test_get_bps_all_items_and_all_pages(
+    all_items, all_pages, states_filtered, list_all_called
+):
+
+    from calm.dsl.cli import bps
+
+    client = MagicMock()
+    client.blueprint.list.return_value = (MagicMock(), None)
+    client.blueprint.list.return_value[0].json.return_value = {"entities": []}
+    client.blueprint.list_all.return_value = ({"entities": []}, None)
+
+    with patch.object(bps, "get_api_client", return_value=client):
+        bps.get_blueprint_list(None, None, 20, 0, False, all_items, "json", all_pages)
+
+    if list_all_called:
+        params = client.blueprint.list_all.call_args[1]["params"]
+        assert not client.blueprint.list.called
+        assert "length" not in params
+    else:
+        params = client.blueprint.list.call_args[1]["params"]
+        assert not client.blueprint.list_all.called
+        assert params["length"] == 20
+
+    assert ("state==" in params.get("filter", "")) == states_filtered
+
+
+class PagesHandler(StubHandler):
+    """Serves list calls slowly, recording the requests served concurrently"""
+
+    def do_POST(self):
+        payload = self.read_json()
+        with self.server.lock:
+            self.server.active_calls += 1
+            self.server.max_active_calls = max(
+                self.server.max_active_calls, self.server.active_calls
+            )
+
+        time.sleep(0.02)
+        with self.server.lock:
+            self.server.active_calls -= 1
+
+        offset, length = payload.get("offset", 0), payload["length"]
+        page_end = min(offset + length, 200)
+        self.respond(
+            {
+                "entities": _get_entities(200)[offset:page_end],
+                "metadata": {"total_matches": 200, "offset": offset},
+            }
+        )
+
+
+def test_list_all_within_request_limit(stub_server):
+
+    server = stub_server(
+        PagesHandler, lock=threading.Lock(), active_calls=0, max_active_calls=0
+    )
+    connection = get_connection(server)
+    Obj = get_resource_api("projects", connection)
+
+    # Nested pools share the limit, ex: pages of all accounts in cache sync
+    with connection.limit_requests(2):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(executor.map(lambda _: Obj.list_all(page_size=10), range(4)))
+
+    assert all(len(res["entities"]) == 200 for res, err in results)
+    assert server.max_active_calls == 2
+    assert connection.max_concurrent_requests == connection.pool_maxsize
+    connection.close()
@@ -0,0 +1,329 @@
+import copy
+import json
+import uuid
+
+import pytest
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.store import Cache
+from calm.dsl.api.blueprint import BlueprintAPI
+from calm.dsl.api.runbook import RunbookAPI
+from calm.dsl.api.endpoint import EndpointAPI
+from calm.dsl.api.util import get_resources_hash, strip_secrets, is_upload_skipped
+from calm.dsl.cli.bps import compile_blueprint
+from calm.dsl.cli.runbooks import compile_runbook
+from calm.dsl.cli.endpoints import compile_endpoint
+from tests.stub_server import StubHandler, get_connection
+
+PREFIX = "/api/nutanix/v3/"
+
+
+class CalmStubHandler(StubHandler):
+    """Stores the uploaded entities in memory, records the calls made"""
+
+    def _handle(self):
+        payload = self.read_json()
+
+        path = self.path.replace(PREFIX, "", 1)
+        self.server.calls.append((self.command, path))
+        resource_type, _, item = path.partition("/")
+        entities = self.server.entities.setdefault(resource_type, {})
+
+        if item == "list":
+            name = payload["filter"].split(";")[0].split("==")[1]
+            if resource_type == "projects":
+                entities = {"project-uuid": {"spec": {"name": name}}}
+
+            return self.respond(
+                {
+                    "entities": [
+                        {"metadata": {"uuid": entity_uuid}}
+                        for entity_uuid, entity in entities.items()
+                        if entity["spec"]["name"] == name
+                    ]
+                }
+            )
+
+        if item in ["import_json"] or item.endswith("/update"):
+            entity_uuid = item.split("/")[0] if "/" in item else str(uuid.uuid4())
+            payload["metadata"]["uuid"] = entity_uuid
+        elif item:
+            entity_uuid = item
+        else:
+            return self.respond({}, status=404)
+
+        if self.command == "DELETE":
+            entities.pop(entity_uuid)
+            return self.respond({})
+
+        # Update using name references is done, update adding secrets fails
+        if self.command == "PUT" and item == entity_uuid and self.server.fail_updates:
+            return self.respond({"message_list": ["Update failed"]}, status=500)
+
+        if self.command != "GET":
+            entities[entity_uuid] = copy.deepcopy(payload)
+
+        entity = copy.deepcopy(entities[entity_uuid])
+        entity["status"] = {"state": self.server.state}
+        self.respond(entity)
+
+    do_GET = _handle
+    do_POST = _handle
+    do_PUT = _handle
+    do_DELETE = _handle
+
+
+@pytest.fixture
+def server(stub_server):
+
+    return stub_server(
+        CalmStubHandler, calls=[], entities={}, state="ACTIVE", fail_updates=False
+    )
+
+
+@pytest.fixture
+def connection(server):
+
+    connection = get_connection(server)
+    yield connection
+    connection.close()
+
+
+def _get_resources(payload):
+    return copy.deepcopy(payload["spec"]["resources"])
+
+
+def test_payload_hash_ignores_generated_names():
+
+    # Compiles having tasks with random names
+    runbook_file = "tests/sample_runbooks/set_variable.py"
+    resources1 = _get_resources(compile_runbook(runbook_file))
+    resources2 = _get_resources(compile_runbook(runbook_file))
+    assert json.dumps(resources1) != json.dumps(resources2)
+    assert get_resources_hash(resources1) == get_resources_hash(resources2)
+
+    tasks = resources2["runbook"]["task_definition_list"]
+    tasks[-1]["attrs"]["script"] = "print 'changed'"
+    assert get_resources_hash(resources1) != get_resources_hash(resources2)
+
+
+def test_payload_hash_ignores_secrets():
+
+    bp_payload = compile_blueprint("tests/simple_blueprint/test_simple_blueprint.py")
+    hashes = []
+    for secret in ["passwd1", "passwd2"]:
+        resources = _get_resources(bp_payload)
+        resources["credential_definition_list"][0]["secret"]["value"] = secret
+        strip_secrets(resources, {}, [], object_lists=["service_definition_list"])
+        hashes.append(get_resources_hash(resources))
+
+    assert hashes[0] == hashes[1]
+
+
+def test_unchanged_blueprint_not_uploaded(server, connection):
+
+    bp_api = BlueprintAPI(connection)
+    bp_payload = compile_blueprint("tests/simple_blueprint/test_simple_blueprint.py")
+
+    res, err = bp_api.upload_with_secrets("bp1", "", _get_resources(bp_payload))
+    assert err is None
+    bp_uuid = res.json()["metadata"]["uuid"]
+
+    # Existing blueprint is not replaced without force
+    server.calls = []
+    res, err = bp_api.upload_with_secrets("bp1", "", _get_resources(bp_payload))
+    assert "already exists" in err["error"]
+    assert server.calls == [("POST", "blueprints/list")]
+
+    # Blueprint is read, but not uploaded again
+    server.calls = []
+    res, err = bp_api.upload_with_secrets(
+        "bp1", "", _get_resources(bp_payload), force_create=True
+    )
+    assert err is None
+    assert is_upload_skipped(res)
+    assert res.json()["metadata"]["uuid"] == bp_uuid
+    assert server.calls == [
+        ("POST", "blueprints/list"),
+        ("GET", "blueprints/{}".format(bp_uuid)),
+    ]
+
+    # Changed blueprint
+    server.calls = []
+    bp_payload["spec"]["resources"]["service_definition_list"][0][
+        "description"
+    ] = "changed"
+    res, err = bp_api.upload_with_secrets(
+        "bp1", "", _get_resources(bp_payload), force_create=True
+    )
+    assert err is None
+    assert not is_upload_skipped(res)
+    assert ("DELETE", "blueprints/{}".format(bp_uuid)) in server.calls
+    assert ("POST", "blueprints/import_json") in server.calls
+
+    # Name of existing blueprint with other content
+    res, err = bp_api.upload_with_secrets("bp2", "", _get_resources(bp_payload))
+    assert err is None
+    res, err = bp_api.upload_with_secrets("bp2", "desc", _get_resources(bp_payload))
+    assert "already exists" in err["error"]
+
+    # Forced upload
+    server.calls = []
+    res, err = bp_api.upload_with_secrets(
+        "bp1", "", _get_resources(bp_payload), force_create=True, force_upload=True
+    )
+    assert err is None
+    assert ("POST", "blueprints/import_json") in server.calls
+
+
+def test_unchanged_runbook_not_updated(server, connection):
+
+    runbook_api = RunbookAPI(connection)
+    runbook_payload = compile_runbook("tests/sample_runbooks/set_variable.py")
+
+    res, err = runbook_api.upload_with_secrets(
+        "rb1", "", _get_resources(runbook_payload)
+    )
+    assert err is None
+    runbook_uuid = res.json()["metadata"]["uuid"]
+
+    res, err = runbook_api.upload_with_secrets(
+        "rb1", "", _get_resources(runbook_payload)
+    )
+    assert "already exists" in err["error"]
+
+    res, err = runbook_api.upload_with_secrets(
+        "rb1", "", _get_resources(runbook_payload), force_create=True
+    )
+    assert err is None
+    assert is_upload_skipped(res)
+
+    # Recompiled runbook having other names for unnamed tasks
+    server.calls = []
+    runbook_payload = compile_runbook("tests/sample_runbooks/set_variable.py")
+    res, err = runbook_api.update_with_secrets(
+        runbook_uuid, "rb1", "", _get_resources(runbook_payload), 1
+    )
+    assert err is None
+    assert is_upload_skipped(res)
+    assert server.calls == [("GET", "runbooks/{}".format(runbook_uuid))]
+
+    server.calls = []
+    res, err = runbook_api.update_with_secrets(
+        runbook_uuid, "rb1", "", _get_resources(runbook_payload), 1, force_upload=True
+    )
+    assert err is None
+    assert ("PUT", "runbooks/{}/update".format(runbook_uuid)) in server.calls
+
+
+def test_upload_requests(server, connection, monkeypatch):
+
+    bp_payload = compile_blueprint("tests/simple_blueprint/test_simple_blueprint.py")
+    runbook_payload = compile_runbook("tests/sample_runbooks/simple_runbook.py")
+
+    # Project reference is taken from local cache
+    monkeypatch.setattr(
+        Cache, "get_entity_data", lambda **kwargs: {"uuid": "cached-project-uuid"}
+    )
+
+    # Blueprint having secrets is updated after upload
+    res, err = BlueprintAPI(connection).upload_with_secrets(
+        "bp1", "", _get_resources(bp_payload)
+    )
+    assert err is None
+    bp_uuid = res.json()["metadata"]["uuid"]
+    assert server.calls == [
+        ("POST", "blueprints/list"),
+        ("POST", "blueprints/import_json"),
+        ("PUT", "blueprints/{}".format(bp_uuid)),
+    ]
+    bp = server.entities["blueprints"][bp_uuid]
+    assert bp["metadata"]["project_reference"]["uuid"] == "cached-project-uuid"
+
+    # Runbook without secrets is not updated after upload
+    server.calls = []
+    request_count = connection.request_count
+    res, err = RunbookAPI(connection).upload_with_secrets(
+        "rb1", "", _get_resources(runbook_payload)
+    )
+    assert err is None
+    assert server.calls == [
+        ("POST", "runbooks/list"),
+        ("POST", "runbooks/import_json"),
+    ]
+    assert connection.request_count - request_count == 2
+
+
+def test_upload_project_not_cached(server, connection, monkeypatch):
+
+    endpoint_payload = compile_endpoint("tests/sample_endpoints/linux_endpoint.py")
+
+    # Project is fetched from server
+    monkeypatch.setattr(Cache, "get_entity_data", lambda **kwargs: None)
+    res, err = EndpointAPI(connection).upload_with_secrets(
+        "ep1", "", _get_resources(endpoint_payload)
+    )
+    assert err is None
+    endpoint_uuid = res.json()["metadata"]["uuid"]
+    assert server.calls == [
+        ("POST", "endpoints/list"),
+        ("POST", "projects/list"),
+        ("POST", "endpoints/import_json"),
+        ("PUT", "endpoints/{}".format(endpoint_uuid)),
+    ]
+    endpoint = server.entities["endpoints"][endpoint_uuid]
+    assert endpoint["metadata"]["project_reference"]["uuid"] == "project-uuid"
+
+
+def test_partially_uploaded_blueprint_is_uploaded(server, connection):
+
+    bp_api = BlueprintAPI(connection)
+    bp_payload = compile_blueprint("tests/simple_blueprint/test_simple_blueprint.py")
+
+    # Update adding the secrets fails
+    server.fail_updates = True
+    res, err = bp_api.upload_with_secrets("bp1", "", _get_resources(bp_payload))
+    assert err["code"] == 500
+
+    server.fail_updates = False
+    server.calls = []
+    res, err = bp_api.upload_with_secrets(
+        "bp1", "", _get_resources(bp_payload), force_create=True
+    )
+    assert err is None
+    assert ("POST", "blueprints/import_json") in server.calls
+
+    # Blueprint not in active state
+    server.state = "DRAFT"
+    server.calls = []
+    res, err = bp_api.upload_with_secrets(
+        "bp1", "", _get_resources(bp_payload), force_create=True
+    )
+    assert err is None
+    assert ("POST", "blueprints/import_json") in server.calls
+
+
+def test_partially_updated_runbook_is_updated(server, connection):
+
+    runbook_api = RunbookAPI(connection)
+    runbook_payload = compile_runbook("tests/sample_runbooks/set_variable.py")
+    res, err = runbook_api.upload_with_secrets(
+        "rb1", "", _get_resources(runbook_payload)
+    )
+    assert err is None
+    runbook_uuid = res.json()["metadata"]["uuid"]
+
+    # Update adding the secrets fails
+    server.fail_updates = True
+    res, err = runbook_api.update_with_secrets(
+        runbook_uuid, "rb1", "desc", _get_resources(runbook_payload), 1
+    )
+    assert err["code"] == 500
+
+    server.fail_updates = False
+    server.calls = []
+    res, err = runbook_api.update_with_secrets(
+        runbook_uuid, "rb1", "desc", _get_resources(runbook_payload), 1
+    )
+    assert err is None
+    assert ("PUT", "runbooks/{}/update".format(runbook_uuid)) in server.calls
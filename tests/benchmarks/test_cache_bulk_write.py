@@ -0,0 +1,113 @@
+import math
+import time
+from unittest import mock
+
+from peewee import SqliteDatabase
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.db.table_config import (
+    AhvImagesCache,
+    CacheSyncTable,
+    SQLITE_MAX_VARIABLES,
+)
+from calm.dsl.providers.plugins.ahv_vm.main import AhvNew
+from calm.dsl.log import get_logging_handle
+from tests.stub_server import StubHandler, get_connection
+
+LOG = get_logging_handle(__name__)
+
+IMAGE_COUNT = 50000
+PER_ROW_SAMPLE = 1000
+ACCOUNT_UUID = "00000000-0000-0000-0000-000000000001"
+
+IMAGES = [
+    {
+        "status": {
+            "name": "image-{}".format(i),
+            "resources": {"image_type": "DISK_IMAGE"},
+        },
+        "metadata": {
+            "uuid": "image-uuid-{}".format(i),
+            "last_update_time": "2020-01-01T00:00:00Z",
+        },
+    }
+    for i in range(IMAGE_COUNT)
+]
+
+
+class StubImagesHandler(StubHandler):
+    """Serves paginated image list calls"""
+
+    def do_POST(self):
+        payload = self.read_json()
+        offset, length = payload.get("offset", 0), payload["length"]
+        page_end = offset + length
+        self.respond(
+            {
+                "entities": IMAGES[offset:page_end],
+                "metadata": {"total_matches": IMAGE_COUNT, "offset": offset},
+            }
+        )
+
+
+def _fetch_image_entries(connection):
+
+    client = mock.MagicMock()
+    client.account.get_name_uuid_map.return_value = {"PC": ACCOUNT_UUID}
+    provider = mock.MagicMock()
+    provider.get_api_obj.return_value = AhvNew(connection)
+
+    with mock.patch(
+        "calm.dsl.db.table_config.get_api_client", return_value=client
+    ), mock.patch("calm.dsl.db.table_config.get_provider", return_value=provider):
+        return AhvImagesCache.fetch_entries()
+
+
+def test_bulk_image_sync_benchmark(tmp_path, stub_server):
+
+    server = stub_server(StubImagesHandler)
+    connection = get_connection(server)
+
+    db = SqliteDatabase(str(tmp_path / "dsl.db"))
+    tables = [AhvImagesCache, CacheSyncTable]
+    try:
+        with db.bind_ctx(tables):
+            db.create_tables(tables)
+
+            start = time.time()
+            entries = _fetch_image_entries(connection)
+            fetch_time = time.time() - start
+            assert len(entries) == IMAGE_COUNT
+
+            # Per row inserts in autocommit mode, extrapolated to all the rows
+            start = time.time()
+            for entry in entries[:PER_ROW_SAMPLE]:
+                AhvImagesCache.create_entry(**entry)
+            per_row_time = (time.time() - start) * IMAGE_COUNT / PER_ROW_SAMPLE
+
+            with mock.patch.object(
+                db, "execute_sql", wraps=db.execute_sql
+            ) as execute_sql:
+                start = time.time()
+                AhvImagesCache.write_entries(entries)
+                bulk_time = time.time() - start
+            assert AhvImagesCache.select().count() == IMAGE_COUNT
+
+    finally:
+        connection.close()
+        db.close()
+
+    LOG.info(
+        "Synced {} images: fetch = {:.2f}s, bulk write = {:.2f}s, "
+        "per row write = {:.2f}s (estimated)".format(
+            IMAGE_COUNT, fetch_time, bulk_time, per_row_time
+        )
+    )
+
+    # Rows are inserted in batches, as many as sqlite query variables allow
+    insert_sql = 'INSERT INTO "{}"'.format(AhvImagesCache._meta.table_name)
+    inserts = [
+        args for args, _ in execute_sql.call_args_list if args[0].startswith(insert_sql)
+    ]
+    batch_size = SQLITE_MAX_VARIABLES // len(AhvImagesCache._meta.fields)
+    assert len(inserts) == math.ceil(IMAGE_COUNT / batch_size)
@@ -0,0 +1,111 @@
+import glob
+import itertools
+import json
+import time
+import uuid
+from unittest import mock
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.cli.bps import (
+    get_blueprint_module_from_file,
+    get_blueprint_class_from_module,
+)
+from calm.dsl.builtins import create_blueprint_payload, Service
+from calm.dsl.builtins import CalmVariable as Var
+from calm.dsl.builtins.models.entity import EntityType
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+COMPILE_COUNT = 5
+
+
+def _get_class_attrs(cls):
+    """resolves attributes by creating a class, as done earlier"""
+
+    ncls_ns = cls.get_default_attrs()
+    for klass in reversed(cls.mro()):
+        if hasattr(klass, "get_user_attrs") and callable(
+            getattr(klass, "get_user_attrs")
+        ):
+            ncls_ns = {**ncls_ns, **klass.__dict__}
+
+    ncls = type(cls)(cls.__name__, cls.__bases__, ncls_ns)
+
+    return ncls.get_user_attrs()
+
+
+def _compile(bp_payload):
+    """returns compiled blueprint json and time taken per compile"""
+
+    # Generated entity names use uuid4, make them same across compilations
+    uuids = (uuid.UUID(int=i) for i in itertools.count())
+    with mock.patch.object(uuid, "uuid4", lambda: next(uuids)):
+        start = time.time()
+        for _ in range(COMPILE_COUNT):
+            bp_json = json.dumps(bp_payload.get_dict())
+
+    compile_time = (time.time() - start) / COMPILE_COUNT
+    return bp_json, compile_time
+
+
+def _get_blueprint_payload(bp_file):
+    """returns blueprint payload for file"""
+
+    bp_module = get_blueprint_module_from_file(bp_file)
+    UserBlueprint = get_blueprint_class_from_module(bp_module)
+    bp_payload, _ = create_blueprint_payload(UserBlueprint)
+    return bp_payload
+
+
+def test_compile_examples(local_files):
+
+    total_time = total_class_attrs_time = 0
+    bp_files = sorted(glob.glob("examples/*/*.py"))
+    for bp_file in bp_files:
+        with open(bp_file) as fd:
+            if "(Blueprint)" not in fd.read():
+                continue
+
+        bp_payload = _get_blueprint_payload(bp_file)
+        with mock.patch.object(EntityType, "get_all_attrs", _get_class_attrs):
+            class_attrs_bp_json, class_attrs_compile_time = _compile(bp_payload)
+        bp_json, compile_time = _compile(bp_payload)
+
+        assert bp_json == class_attrs_bp_json
+        LOG.info(
+            "Compiled {} in {:.1f}ms, {:.1f}ms when attrs class is created".format(
+                bp_file, compile_time * 1000, class_attrs_compile_time * 1000
+            )
+        )
+        total_time += compile_time
+        total_class_attrs_time += class_attrs_compile_time
+
+    LOG.info(
+        "Compiled examples in {:.1f}ms, {:.1f}ms when attrs class is created".format(
+            total_time * 1000, total_class_attrs_time * 1000
+        )
+    )
+
+
+def test_attrs_cleared_on_update():
+    class BaseService(Service):
+        port = Var("80")
+
+    class MyService(BaseService):
+        pass
+
+    attrs = MyService.get_all_attrs()
+    assert attrs["port"].value == "80"
+    assert MyService.get_all_attrs() == attrs
+
+    # Returned attrs can be modified by callers
+    attrs.pop("port")
+    assert "port" in MyService.get_all_attrs()
+
+    BaseService.port = Var("8080")
+    assert MyService.get_all_attrs()["port"].value == "8080"
+
+    MyService.singleton = True
+    assert MyService.get_all_attrs()["singleton"] is True
+    assert BaseService.get_all_attrs()["singleton"] is False
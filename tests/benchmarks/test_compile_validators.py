@@ -0,0 +1,145 @@
+import glob
+import time
+from unittest import mock
+
+import pytest
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.cli.bps import compile_blueprint
+from calm.dsl.builtins.models import entity, provider_spec
+from calm.dsl.builtins.models.readiness_probe import ReadinessProbeType
+from calm.dsl.log import get_logging_handle
+from calm.dsl.providers import base as provider_base
+from calm.dsl.providers.base import Provider, get_providers
+
+LOG = get_logging_handle(__name__)
+
+
+def _get_example_blueprints():
+
+    bp_files = []
+    for bp_file in sorted(glob.glob("examples/*/*.py")):
+        with open(bp_file) as fd:
+            if "(Blueprint)" in fd.read():
+                bp_files.append(bp_file)
+
+    return bp_files
+
+
+def _clear_schema_validators():
+    """validators of entity types are cached for process, clear them so that
+    created validators are counted"""
+
+    for entity_type in entity.EntityTypeBase.get_entity_types().values():
+        schema_validator = vars(entity_type).get("__schema_validator__", None)
+        if schema_validator is not None:
+            schema_validator.value = None
+
+
+def _clear_provider_validators():
+    """provider specs are loaded again, creating their validators"""
+
+    for provider_cls in get_providers().values():
+        provider_cls.provider_spec = None
+        provider_cls.Validator = None
+
+
+def test_compile_examples_validations(local_files):
+
+    validate_spec = Provider.validate_spec.__func__
+    spec_validations = []
+
+    def _validate_spec(cls, spec):
+        spec_validations.append(id(spec))
+        return validate_spec(cls, spec)
+
+    provider_spec._VALIDATED_SPECS.clear()
+    _clear_schema_validators()
+    _clear_provider_validators()
+    with mock.patch.object(
+        entity, "StrictDraft7Validator", wraps=entity.StrictDraft7Validator
+    ) as validator_cls, mock.patch.object(
+        provider_base, "StrictDraft7Validator", wraps=entity.StrictDraft7Validator
+    ) as provider_validator_cls, mock.patch.object(
+        Provider, "validate_spec", classmethod(_validate_spec)
+    ), mock.patch.object(
+        provider_spec._ProviderSpec,
+        "__validate__",
+        autospec=True,
+        side_effect=provider_spec._ProviderSpec.__validate__,
+    ) as spec_access:
+
+        bp_files = _get_example_blueprints()
+        start = time.time()
+        for bp_file in bp_files:
+            assert compile_blueprint(bp_file)
+        compile_time = time.time() - start
+
+    LOG.info(
+        "Compiled {} blueprints in {:.3f}s. Provider specs accessed {} times, "
+        "validated {} times. {} validators created".format(
+            len(bp_files),
+            compile_time,
+            spec_access.call_count,
+            len(spec_validations),
+            validator_cls.call_count + provider_validator_cls.call_count,
+        )
+    )
+    assert bp_files
+    # Specs are validated again only if modified during compile (ex: azure)
+    assert len(spec_validations) < spec_access.call_count
+    # Validators are created once per entity type and provider at most
+    assert validator_cls.call_count <= len(entity.EntityTypeBase.get_entity_types())
+    assert 0 < provider_validator_cls.call_count <= len(get_providers())
+
+
+def test_validate_dict_validator_created_once():
+
+    probe = {"connection_type": "SSH", "connection_port": 22, "retries": "5"}
+    _clear_schema_validators()
+    with mock.patch.object(
+        entity, "StrictDraft7Validator", wraps=entity.StrictDraft7Validator
+    ) as validator_cls:
+        for _ in range(10):
+            ReadinessProbeType.validate_dict(probe)
+
+        with pytest.raises(Exception):
+            ReadinessProbeType.validate_dict({"connection_port": "22"})
+
+    assert validator_cls.call_count == 1
+
+
+def test_modified_spec_validated_again():
+
+    spec = provider_spec.provider_spec({"name": "vm-@@{calm_array_index}@@"})
+    provider_spec._VALIDATED_SPECS.clear()
+    with mock.patch.object(Provider, "validate_spec") as validate_spec:
+        spec.__validate__("AWS_VM")
+        spec.__validate__("AWS_VM")
+        assert validate_spec.call_count == 1
+
+        spec.spec["name"] = "vm"
+        spec.__validate__("AWS_VM")
+        assert validate_spec.call_count == 2
+
+    provider_spec._VALIDATED_SPECS.clear()
+
+
+def test_spec_with_defaults_filled_validated_again():
+    def _fill_defaults(spec):
+        spec.setdefault("resources", {})
+
+    provider_spec._VALIDATED_SPECS.clear()
+    with mock.patch.object(
+        Provider, "validate_spec", side_effect=_fill_defaults
+    ) as validate_spec:
+        for _ in range(2):
+            spec = provider_spec.provider_spec({"name": "vm"})
+            spec.__validate__("AWS_VM")
+            assert spec.spec == {"name": "vm", "resources": {}}
+
+        # Content left unchanged by validation is not validated again
+        spec.__validate__("AWS_VM")
+        assert validate_spec.call_count == 3
+
+    provider_spec._VALIDATED_SPECS.clear()
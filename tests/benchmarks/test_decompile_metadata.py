@@ -0,0 +1,119 @@
+import copy
+import json
+import time
+from unittest import mock
+
+import pytest
+
+from calm.dsl.builtins import init_dsl_metadata_map
+from calm.dsl.builtins.models import client_attrs
+from calm.dsl.builtins.models.blueprint import BlueprintType
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+BP_FILE = "tests/decompile/sample.json"
+SERVICE_COUNT = 500
+
+
+def _get_synthetic_blueprint():
+    """returns blueprint payload having SERVICE_COUNT services, with metadata"""
+
+    with open(BP_FILE) as fd:
+        bp_payload = json.load(fd)
+
+    service = bp_payload["service_definition_list"][0]
+    services = []
+    service_metadata = {}
+    for i in range(SERVICE_COUNT):
+        service_obj = copy.deepcopy(service)
+        service_obj["name"] = "service {}".format(i)
+        services.append(service_obj)
+        service_metadata[service_obj["name"]] = {
+            "dsl_name": "Service{}".format(i),
+            "Action": {
+                action["name"]: {"dsl_name": "action_{}".format(j)}
+                for j, action in enumerate(service_obj["action_list"])
+            },
+        }
+
+    bp_payload["service_definition_list"] = services
+    metadata = {
+        "Service": service_metadata,
+        "Package": {},
+        "Deployment": {},
+        "Profile": {},
+        "Substrate": {},
+    }
+    return bp_payload, metadata
+
+
+def _get_copy_lookup_time(context=["Service"], calls=10):
+    """returns time taken by a metadata lookup copying the whole map, as done earlier"""
+
+    start = time.time()
+    for _ in range(calls):
+        metadata = copy.deepcopy(client_attrs.DSL_METADATA_MAP)
+        for c in context:
+            metadata = metadata[c]
+    return (time.time() - start) / calls
+
+
+def test_decompile_large_blueprint():
+
+    bp_payload, metadata = _get_synthetic_blueprint()
+    initial_metadata = client_attrs.DSL_METADATA_MAP
+    try:
+        init_dsl_metadata_map(metadata)
+        with mock.patch(
+            "calm.dsl.builtins.models.entity.get_dsl_metadata_map",
+            wraps=client_attrs.get_dsl_metadata_map,
+        ) as get_metadata, mock.patch.object(
+            client_attrs, "copy", wraps=copy
+        ) as metadata_copy:
+            start = time.time()
+            bp_cls = BlueprintType.decompile(bp_payload)
+            decompile_time = time.time() - start
+
+        copy_lookup_time = _get_copy_lookup_time()
+
+    finally:
+        init_dsl_metadata_map(initial_metadata)
+
+    assert len(bp_cls.services) == SERVICE_COUNT
+    assert bp_cls.services[-1].__name__ == "Service{}".format(SERVICE_COUNT - 1)
+
+    lookups = get_metadata.call_count
+    LOG.info(
+        "Decompiled blueprint with {} services in {:.2f}s, {} metadata lookups. "
+        "Copying metadata map on lookups would add {:.2f}s".format(
+            SERVICE_COUNT, decompile_time, lookups, lookups * copy_lookup_time
+        )
+    )
+
+    # Lookups read the metadata map, without copying it
+    assert lookups
+    metadata_copy.deepcopy.assert_not_called()
+
+
+def test_metadata_view_and_snapshot():
+
+    initial_metadata = client_attrs.DSL_METADATA_MAP
+    try:
+        init_dsl_metadata_map({"Service": {"svc": {"dsl_name": "Svc", "Action": {}}}})
+        view = client_attrs.get_dsl_metadata_map(["Service", "svc"])
+        assert view["dsl_name"] == "Svc"
+        with pytest.raises(TypeError):
+            view["dsl_name"] = "Svc2"
+        with pytest.raises(TypeError):
+            view["Action"]["action_create"] = {}
+
+        snapshot = client_attrs.get_dsl_metadata_snapshot(["Service", "svc"])
+        snapshot["dsl_name"] = "Svc2"
+        assert (
+            client_attrs.get_dsl_metadata_map(["Service", "svc", "dsl_name"]) == "Svc"
+        )
+        assert client_attrs.get_dsl_metadata_map(["Service", "svc2"]) is None
+
+    finally:
+        init_dsl_metadata_map(initial_metadata)
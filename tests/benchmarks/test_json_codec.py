@@ -0,0 +1,60 @@
+import json
+import time
+
+import pytest
+
+from calm.dsl.api.codec import JSONCodec, get_codec
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+EXPORTED_BLUEPRINTS = [
+    "tests/existing_vm_example/test_existing_vm_bp.json",
+    "tests/simple_blueprint/test_simple_blueprint.json",
+    "tests/two_vm_example/two_vm_bp_output.json",
+    "tests/decompile/sample.json",
+]
+ROUNDS = 200
+
+
+def _get_codec_time(codec, payload, data):
+    """returns (encode time, decode time) per round of payload"""
+
+    start = time.time()
+    for _ in range(ROUNDS):
+        codec.dumps(payload)
+    encode_time = (time.time() - start) / ROUNDS
+
+    start = time.time()
+    for _ in range(ROUNDS):
+        codec.loads(data)
+    decode_time = (time.time() - start) / ROUNDS
+
+    return encode_time, decode_time
+
+
+@pytest.mark.parametrize("bp_file", EXPORTED_BLUEPRINTS)
+def test_json_codec_benchmark(bp_file):
+
+    with open(bp_file, "rb") as fd:
+        data = fd.read()
+    payload = json.loads(data)
+
+    codec = get_codec()
+    assert codec.loads(codec.dumps(payload)) == payload
+
+    stdlib_times = _get_codec_time(JSONCodec(), payload, data)
+    codec_times = _get_codec_time(codec, payload, data)
+
+    LOG.info(
+        "{} ({} KiB): json encode = {:.0f}us, decode = {:.0f}us; "
+        "{} encode = {:.0f}us, decode = {:.0f}us".format(
+            bp_file,
+            len(data) // 1024,
+            stdlib_times[0] * 10 ** 6,
+            stdlib_times[1] * 10 ** 6,
+            codec.name,
+            codec_times[0] * 10 ** 6,
+            codec_times[1] * 10 ** 6,
+        )
+    )
@@ -0,0 +1,62 @@
+import time
+import inspect
+import logging
+from unittest import mock
+
+from calm.dsl.log import CustomLogging, get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+LARGE_BP_FILE = "examples/Kubernetes/kubernetes.py"
+CALLS = 100000
+
+
+def _get_call_time(func, calls=CALLS):
+    """returns the time taken per call of func"""
+
+    start = time.time()
+    for _ in range(calls):
+        func()
+    return (time.time() - start) / calls
+
+
+def test_disabled_debug_log_overhead():
+
+    bench_log = get_logging_handle("calm.dsl.bench")
+    payload = mock.MagicMock()
+    with mock.patch.object(
+        CustomLogging, "_VERBOSE_LEVEL", logging.INFO
+    ), mock.patch.object(inspect, "stack", wraps=inspect.stack) as stack:
+        debug_time = _get_call_time(lambda: bench_log.debug("Payload: %s", payload))
+
+    # Disabled log calls neither inspect the stack nor format their args
+    stack.assert_not_called()
+    payload.__str__.assert_not_called()
+
+    # Cost of the stack inspection done earlier for every log call
+    stack_time = _get_call_time(inspect.stack, calls=100)
+
+    LOG.info(
+        "Disabled debug log: {:.2f}us per call, inspect.stack(): {:.2f}us".format(
+            debug_time * 10 ** 6, stack_time * 10 ** 6
+        )
+    )
+
+
+def test_compile_large_blueprint_at_info_level():
+
+    from calm.dsl.cli.bps import compile_blueprint
+
+    # Warm up the imports and schemas
+    compile_blueprint(LARGE_BP_FILE)
+
+    with mock.patch.object(
+        CustomLogging, "_VERBOSE_LEVEL", logging.INFO
+    ), mock.patch.object(inspect, "stack", wraps=inspect.stack) as stack:
+        start = time.time()
+        for _ in range(5):
+            compile_blueprint(LARGE_BP_FILE)
+        compile_time = (time.time() - start) / 5
+
+    LOG.info("Compiled {} in {:.3f}s at INFO level".format(LARGE_BP_FILE, compile_time))
+    stack.assert_not_called()
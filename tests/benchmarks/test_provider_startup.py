@@ -0,0 +1,62 @@
+import sys
+import subprocess
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+LAZY_STARTUP = """
+import time
+start = time.time()
+from calm.dsl.providers import get_providers
+providers = get_providers()
+assert not any(p.is_initialized() for p in providers.values())
+print(time.time() - start)
+"""
+
+EAGER_STARTUP = """
+import time
+start = time.time()
+from calm.dsl.providers import get_providers
+for provider in get_providers().values():
+    provider.get_validator()
+print(time.time() - start)
+"""
+
+
+def _get_startup_time(code, rounds=3):
+    """returns best startup time of given code, each round in a fresh interpreter"""
+
+    times = []
+    for _ in range(rounds):
+        res = subprocess.run(
+            [sys.executable, "-c", code],
+            check=True,
+            stdout=subprocess.PIPE,
+            universal_newlines=True,
+        )
+        times.append(float(res.stdout.strip().splitlines()[-1]))
+
+    return min(times)
+
+
+def test_provider_startup_benchmark():
+
+    lazy_time = _get_startup_time(LAZY_STARTUP)
+    eager_time = _get_startup_time(EAGER_STARTUP)
+    LOG.info(
+        "Providers startup: lazy = {:.3f}s, all specs loaded = {:.3f}s".format(
+            lazy_time, eager_time
+        )
+    )
+
+
+def test_provider_spec_loaded_on_first_use():
+
+    from calm.dsl.providers import get_provider
+
+    AhvVmProvider = get_provider("AHV_VM")
+    spec = AhvVmProvider.get_provider_spec()
+    assert AhvVmProvider.is_initialized()
+    assert spec["type"] == "object"
+    assert AhvVmProvider.get_validator() is AhvVmProvider.get_validator()
@@ -0,0 +1,21 @@
+import pytest
+from peewee import SqliteDatabase
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.store import Cache
+from calm.dsl.db.table_config import CacheTableBase, CacheSyncTable
+
+
+@pytest.fixture
+def tmp_cache_db(tmp_path):
+    """binds the cache tables to a temporary db, keeping the local db intact"""
+
+    tables = [CacheSyncTable] + list(CacheTableBase.tables.values())
+    db = SqliteDatabase(str(tmp_path / "dsl.db"))
+    with db.bind_ctx(tables):
+        db.create_tables(tables)
+        Cache.clear_memo()
+        yield db
+        Cache.clear_memo()
+
+    db.close()
@@ -0,0 +1,121 @@
+import os
+import json
+import shutil
+import importlib
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from calm.dsl.cli import main as cli
+from calm.dsl.cli.bps import compile_blueprint
+from calm.dsl.cli.batch_compile import (
+    compile_dir_command,
+    compile_dsl_files,
+    get_dsl_files,
+)
+
+EXAMPLES_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "examples"
+)
+
+# Blueprint file -> its services
+BLUEPRINTS = {
+    "Hadoop/hadoop.py": ["Hadoop_Master", "Hadoop_Slave"],
+    "Kubernetes/kubernetes.py": ["Master", "Worker"],
+}
+
+
+@pytest.fixture
+def dsl_dir(tmp_path):
+
+    for bp_file in BLUEPRINTS:
+        bp_dir = os.path.dirname(bp_file)
+        shutil.copytree(
+            os.path.join(EXAMPLES_DIR, bp_dir), str(tmp_path / bp_dir),
+        )
+
+    (tmp_path / "broken.py").write_text(
+        "import calm.dsl.builtins\nraise ValueError('Invalid blueprint')"
+    )
+    (tmp_path / "no_blueprint.py").write_text("from calm.dsl.builtins import ref")
+    (tmp_path / "__init__.py").write_text("")
+
+    # Task scripts are not dsl files
+    (tmp_path / "script.py").write_text("print('@@{calm_application_name}@@')")
+    (tmp_path / "scripts").mkdir()
+    (tmp_path / "scripts" / "task.py").write_text("from calm.dsl.builtins import ref")
+    (tmp_path / ".hidden").mkdir()
+    (tmp_path / ".hidden" / "hidden.py").write_text("")
+    return str(tmp_path)
+
+
+def _get_services(bp_payload):
+    return sorted(bp_payload["spec"]["resources"]["client_attrs"]["None"]["Service"])
+
+
+def test_get_dsl_files(dsl_dir):
+
+    dsl_files = [os.path.relpath(f, dsl_dir) for f in get_dsl_files(dsl_dir)]
+    assert dsl_files == ["broken.py", "no_blueprint.py"] + list(BLUEPRINTS)
+
+
+def test_compile_dsl_files(dsl_dir):
+
+    dsl_files = get_dsl_files(dsl_dir)
+    results = compile_dsl_files(compile_blueprint, dsl_files, max_workers=2)
+    assert [dsl_file for dsl_file, _, _ in results] == dsl_files
+
+    # Failure of a file doesn't stop the others
+    _, payload, err = results[0]
+    assert payload is None
+    assert err == "ValueError: Invalid blueprint"
+
+    # File without blueprint
+    _, payload, err = results[1]
+    assert payload is None
+    assert err is None
+
+    for dsl_file, payload, err in results[2:]:
+        assert err is None
+        services = BLUEPRINTS[os.path.relpath(dsl_file, dsl_dir)]
+        assert _get_services(payload) == services
+
+
+def test_compile_dir_command(dsl_dir, capsys):
+
+    os.remove(os.path.join(dsl_dir, "broken.py"))
+
+    # Files without blueprint are skipped, not failed
+    compile_dir_command(compile_blueprint, "blueprint", dsl_dir, "json")
+    payloads = json.loads(capsys.readouterr().out)
+    assert sorted(payloads) == list(BLUEPRINTS)
+
+
+def test_compile_blueprints_in_same_process(dsl_dir):
+
+    # Metadata of a blueprint is not carried over to the next one
+    for bp_file, services in BLUEPRINTS.items():
+        bp_payload = compile_blueprint(os.path.join(dsl_dir, bp_file))
+        assert _get_services(bp_payload) == services
+
+
+@pytest.mark.parametrize("both", [False, True])
+def test_compile_file_or_dir_required(dsl_dir, both):
+
+    args = ["compile", "bp"]
+    if both:
+        args += ["-f", os.path.join(dsl_dir, "broken.py"), "-d", dsl_dir]
+
+    # calm.dsl.cli.main is shadowed by the main command
+    cli_module = importlib.import_module("calm.dsl.cli.main")
+    bp_commands = importlib.import_module("calm.dsl.cli.bp_commands")
+
+    runner = CliRunner()
+    with mock.patch.object(cli_module, "validate_version"), mock.patch.object(
+        bp_commands, "compile_dir_command"
+    ) as compile_dir_command:
+        result = runner.invoke(cli, args)
+
+    assert result.exit_code == -1
+    assert not compile_dir_command.called
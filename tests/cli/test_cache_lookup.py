@@ -0,0 +1,89 @@
+import json
+from unittest import mock
+
+import pytest
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.store import Cache
+from calm.dsl.db.table_config import AhvSubnetsCache, ProjectCache
+
+ACCOUNT_UUID = "acc00000-0000-0000-0000-000000000099"
+PROJECT_NAME = "_test_cache_lookup_project"
+
+
+@pytest.fixture
+def cache_entries(tmp_cache_db):
+
+    ProjectCache.create_entry(
+        name=PROJECT_NAME,
+        uuid="prj-uuid",
+        accounts_data=json.dumps({"nutanix_pc": ACCOUNT_UUID}),
+        whitelisted_subnets=json.dumps(["sub-uuid-1"]),
+    )
+    AhvSubnetsCache.create_entry(
+        name="vlan.99",
+        uuid="sub-uuid-1",
+        cluster="cluster-1",
+        account_uuid=ACCOUNT_UUID,
+    )
+    AhvSubnetsCache.create_entry(
+        name="vlan.99",
+        uuid="sub-uuid-2",
+        cluster="cluster-2",
+        account_uuid=ACCOUNT_UUID,
+    )
+
+
+def test_warm_loaded_project_lookup(cache_entries):
+
+    with mock.patch.object(
+        ProjectCache, "get_entity_data", wraps=ProjectCache.get_entity_data
+    ) as table_lookup:
+        project = Cache.get_entity_data("project", PROJECT_NAME)
+        assert project["accounts_data"] == {"nutanix_pc": ACCOUNT_UUID}
+
+        # Returned data is a copy, memoized data stays intact
+        project["whitelisted_subnets"].append("sub-uuid-2")
+        project = Cache.get_entity_data("project", PROJECT_NAME)
+        assert project["whitelisted_subnets"] == ["sub-uuid-1"]
+
+        # Project table is warm loaded, so lookups never hit the table
+        table_lookup.assert_not_called()
+
+        # Entities missing in warm loaded table are looked up only once
+        assert Cache.get_entity_data("project", "_missing_project") is None
+        assert Cache.get_entity_data("project", "_missing_project") is None
+        assert table_lookup.call_count == 1
+
+
+def test_memoized_subnet_lookup(cache_entries):
+
+    with mock.patch.object(
+        AhvSubnetsCache, "get_entity_data", wraps=AhvSubnetsCache.get_entity_data
+    ) as table_lookup:
+        for _ in range(3):
+            subnet = Cache.get_entity_data(
+                "ahv_subnet", "vlan.99", account_uuid=ACCOUNT_UUID, cluster="cluster-2"
+            )
+            assert subnet["uuid"] == "sub-uuid-2"
+
+        # Empty filters are ignored by lookups
+        subnet = Cache.get_entity_data(
+            "ahv_subnet", "vlan.99", account_uuid=ACCOUNT_UUID, cluster=""
+        )
+        assert subnet["uuid"] == "sub-uuid-1"
+        assert table_lookup.call_count == 2
+
+
+def test_memo_invalidated_on_sync(cache_entries):
+
+    Cache.get_entity_data("project", PROJECT_NAME)
+    ProjectCache.delete().where(ProjectCache.name == PROJECT_NAME).execute()
+    assert Cache.get_entity_data("project", PROJECT_NAME) is not None
+
+    with mock.patch.object(Cache, "get_cache_tables", return_value={}), mock.patch(
+        "calm.dsl.store.cache.Version"
+    ):
+        Cache.sync()
+
+    assert Cache.get_entity_data("project", PROJECT_NAME) is None
@@ -0,0 +1,170 @@
+import time
+import threading
+from unittest import mock
+
+import arrow
+import pytest
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.api import get_api_client
+from calm.dsl.store import Cache
+from calm.dsl.db.table_config import (
+    AhvImagesCache,
+    AhvNetworkFunctionChain,
+    CacheSyncTable,
+)
+
+ACCOUNT_UUIDS = ["account-{}".format(i) for i in range(12)]
+FAILING_ACCOUNT = "account-5"
+
+
+class StubAhvObj:
+    """Returns two images per account, sleeping to emulate server latency"""
+
+    def __init__(self):
+        self.max_active_calls = 0
+        self._active_calls = 0
+        self._lock = threading.Lock()
+
+    def images(self, account_uuid):
+        with self._lock:
+            self._active_calls += 1
+            self.max_active_calls = max(self.max_active_calls, self._active_calls)
+
+        time.sleep(0.05)
+        with self._lock:
+            self._active_calls -= 1
+
+        if account_uuid == FAILING_ACCOUNT:
+            raise Exception("[500] - Internal error")
+
+        return {
+            "entities": [
+                {
+                    "status": {
+                        "name": "{}-image-{}".format(account_uuid, i),
+                        "resources": {"image_type": "DISK_IMAGE"},
+                    },
+                    "metadata": {"uuid": "{}-{}".format(account_uuid, i)},
+                }
+                for i in range(2)
+            ]
+        }
+
+
+def test_images_fetched_concurrently_across_accounts():
+
+    client = mock.MagicMock()
+    client.account.get_name_uuid_map.return_value = {
+        "name-{}".format(uuid): uuid for uuid in ACCOUNT_UUIDS
+    }
+    AhvObj = StubAhvObj()
+    provider = mock.MagicMock()
+    provider.get_api_obj.return_value = AhvObj
+
+    with mock.patch(
+        "calm.dsl.db.table_config.get_api_client", return_value=client
+    ), mock.patch(
+        "calm.dsl.db.table_config.get_provider", return_value=provider
+    ), mock.patch(
+        "calm.dsl.db.table_config.LOG"
+    ) as LOG:
+        entries = AhvImagesCache.fetch_entries(max_workers=4)
+
+    # Failed account is skipped with a warning, others keep the account order
+    assert [e["account_uuid"] for e in entries] == [
+        uuid for uuid in ACCOUNT_UUIDS if uuid != FAILING_ACCOUNT for _ in range(2)
+    ]
+    LOG.warning.assert_called_once()
+    assert FAILING_ACCOUNT in LOG.warning.call_args[0][0]
+    assert 1 < AhvObj.max_active_calls <= 4
+
+
+class StubTable:
+    def __init__(self, name, written_tables, fail=False):
+        self.name = name
+        self.written_tables = written_tables
+        self.fail = fail
+
+    def fetch_entries(self, max_workers=None):
+        self.max_requests = get_api_client().connection.max_concurrent_requests
+        time.sleep(0.05)
+        if self.fail:
+            raise Exception("Failed to fetch {}".format(self.name))
+        return [{"name": self.name}]
+
+    def write_entries(self, entries):
+        self.written_tables.append(
+            (self.name, entries, threading.current_thread() is threading.main_thread())
+        )
+
+
+def _sync_stub_tables(tables):
+    with mock.patch.object(
+        Cache, "get_cache_tables", return_value={t.name: t for t in tables}
+    ), mock.patch("calm.dsl.store.cache.Version"):
+        Cache.sync(max_workers=4)
+
+
+def test_cache_sync_writes_tables_in_order():
+
+    written_tables = []
+    tables = [StubTable("table_{}".format(i), written_tables) for i in range(4)]
+
+    start = time.time()
+    _sync_stub_tables(tables)
+
+    # Fetches run concurrently, writes happen on calling thread in table order
+    assert time.time() - start < 0.05 * len(tables)
+    assert written_tables == [(t.name, [{"name": t.name}], True) for t in tables]
+
+    # Requests of all fetches are bounded by max_workers
+    assert all(t.max_requests == 4 for t in tables)
+    assert get_api_client().connection.max_concurrent_requests > 4
+
+
+def test_cache_sync_raises_table_failure():
+
+    written_tables = []
+    tables = [
+        StubTable("table_0", written_tables),
+        StubTable("table_1", written_tables, fail=True),
+    ]
+
+    with pytest.raises(Exception, match="Failed to fetch table_1"):
+        _sync_stub_tables(tables)
+
+    assert [t[0] for t in written_tables] == ["table_0"]
+
+
+def _nfc_entry(name, uuid, update_time):
+    return {"name": name, "uuid": uuid, "update_time": update_time}
+
+
+def _nfc_rows():
+    return sorted((row.name, row.uuid) for row in AhvNetworkFunctionChain.select())
+
+
+def test_incremental_write_applies_delta(tmp_cache_db):
+
+    AhvNetworkFunctionChain.write_entries(
+        [
+            _nfc_entry("nfc_0", "0", "2020-01-01T00:00:00Z"),
+            _nfc_entry("nfc_1", "1", "2020-01-02T00:00:00Z"),
+            _nfc_entry("nfc_2", "2", "2020-01-03T00:00:00Z"),
+        ]
+    )
+
+    # nfc_1 is renamed, nfc_2 is removed and nfc_3 is added at server
+    upserted, removed = AhvNetworkFunctionChain.write_entries_incremental(
+        [
+            _nfc_entry("nfc_0", "0", "2020-01-01T00:00:00Z"),
+            _nfc_entry("nfc_1_renamed", "1", "2020-01-05T00:00:00Z"),
+            _nfc_entry("nfc_3", "3", "2020-01-04T00:00:00Z"),
+        ]
+    )
+    assert (upserted, removed) == (2, 1)
+    assert _nfc_rows() == [("nfc_0", "0"), ("nfc_1_renamed", "1"), ("nfc_3", "3")]
+    assert CacheSyncTable.get_watermark(
+        AhvNetworkFunctionChain.__cache_type__
+    ) == arrow.get("2020-01-05T00:00:00Z")
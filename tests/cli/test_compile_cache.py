@@ -0,0 +1,184 @@
+import os
+import stat
+import importlib
+from unittest import mock
+
+import pytest
+from click.testing import CliRunner
+
+from calm.dsl.cli import main, compile_cache, runbooks
+from calm.dsl.cli.runbooks import compile_runbook
+from calm.dsl.tools.compile_deps import record_uncacheable
+
+RUNBOOK = """
+import os
+
+from calm.dsl.runbooks import runbook, read_file, read_env
+from calm.dsl.runbooks import RunbookTask as Task
+
+# Counts the executions of this module
+with open(os.path.join(os.path.dirname(__file__), "executions"), "a") as fd:
+    fd.write("x")
+
+NAME = read_env().get("DSL_COMPILE_CACHE_TASK", "Task1")
+SCRIPT = read_file("script.py")
+
+
+@runbook
+def DslCachedRunbook():
+    Task.Exec.escript(name=NAME, script=SCRIPT)
+"""
+
+
+@pytest.fixture
+def runbook_file(tmp_path, monkeypatch):
+
+    monkeypatch.setattr(
+        compile_cache, "get_default_cache_dir", lambda: str(tmp_path / "cache")
+    )
+    monkeypatch.delenv("DSL_COMPILE_CACHE_TASK", raising=False)
+    compile_cache.set_compile_cache(True)
+
+    (tmp_path / "script.py").write_text('print "Hello"')
+    runbook_file = tmp_path / "runbook.py"
+    runbook_file.write_text(RUNBOOK)
+    yield str(runbook_file)
+
+    compile_cache.set_compile_cache(False)
+
+
+def _get_executions(runbook_file):
+    with open(os.path.join(os.path.dirname(runbook_file), "executions")) as fd:
+        return len(fd.read())
+
+
+def _get_task(payload):
+    return payload["spec"]["resources"]["runbook"]["task_definition_list"][1]
+
+
+def test_compile_cache_hit(runbook_file, tmp_path):
+
+    payload = compile_runbook(runbook_file)
+    assert _get_executions(runbook_file) == 1
+    assert len(os.listdir(str(tmp_path / "cache" / "compile"))) == 1
+
+    # Payload is read from cache, without executing the dsl
+    assert compile_runbook(runbook_file) == payload
+    assert _get_executions(runbook_file) == 1
+
+    compile_cache.set_compile_cache(False)
+    assert compile_runbook(runbook_file) == payload
+    assert _get_executions(runbook_file) == 2
+
+
+def test_compile_cache_dependencies(runbook_file, tmp_path, monkeypatch):
+
+    payload = compile_runbook(runbook_file)
+    assert _get_task(payload)["attrs"]["script"] == 'print "Hello"'
+
+    # File read using read_file
+    (tmp_path / "script.py").write_text('print "Bye"')
+    payload = compile_runbook(runbook_file)
+    assert _get_executions(runbook_file) == 2
+    assert _get_task(payload)["attrs"]["script"] == 'print "Bye"'
+
+    # OS env read using read_env
+    monkeypatch.setenv("DSL_COMPILE_CACHE_TASK", "Task2")
+    payload = compile_runbook(runbook_file)
+    assert _get_executions(runbook_file) == 3
+    assert _get_task(payload)["name"] == "Task2"
+
+    # Env file read using read_env
+    (tmp_path / ".env").write_text("DSL_COMPILE_CACHE_TASK=Task3")
+    payload = compile_runbook(runbook_file)
+    assert _get_executions(runbook_file) == 4
+    assert _get_task(payload)["name"] == "Task3"
+
+    # DSL file itself
+    with open(runbook_file, "a") as fd:
+        fd.write("\n")
+    compile_runbook(runbook_file)
+    compile_runbook(runbook_file)
+    assert _get_executions(runbook_file) == 5
+
+
+def test_compile_cache_entry_mode(runbook_file, tmp_path):
+
+    compile_runbook(runbook_file)
+    for cache_file in (tmp_path / "cache" / "compile").iterdir():
+        assert stat.S_IMODE(cache_file.stat().st_mode) == 0o600
+
+
+def test_compile_cache_secrets(runbook_file, tmp_path):
+
+    # Runbook having a secret variable
+    with open(runbook_file, "w") as fd:
+        fd.write(
+            RUNBOOK.replace(
+                "def DslCachedRunbook():",
+                "def DslCachedRunbook():\n"
+                "    password = Variable.Simple.Secret('passwd')  # noqa",
+            ).replace(
+                "RunbookTask as Task",
+                "RunbookTask as Task, RunbookVariable as Variable",
+            )
+        )
+
+    payload = compile_runbook(runbook_file)
+    assert "passwd" in str(payload)
+
+    # Payload having secrets is not written to cache
+    assert compile_runbook(runbook_file) == payload
+    assert _get_executions(runbook_file) == 2
+    assert not (tmp_path / "cache" / "compile").exists()
+
+
+def test_compile_cache_invalid_entry(runbook_file, tmp_path):
+
+    payload = compile_runbook(runbook_file)
+    cache_dir = tmp_path / "cache" / "compile"
+    for cache_file in cache_dir.iterdir():
+        cache_file.write_text("{")
+
+    # Invalid entry is replaced
+    assert compile_runbook(runbook_file) == payload
+    assert compile_runbook(runbook_file) == payload
+    assert _get_executions(runbook_file) == 2
+
+
+def test_compile_cache_server_call(runbook_file, tmp_path):
+
+    _compile_runbook = runbooks._compile_runbook
+
+    def compile_with_server_call(runbook_file):
+        record_uncacheable("server call")
+        return _compile_runbook(runbook_file)
+
+    # Payload depending on server calls is not cached
+    with mock.patch.object(runbooks, "_compile_runbook", compile_with_server_call):
+        compile_runbook(runbook_file)
+        compile_runbook(runbook_file)
+
+    assert _get_executions(runbook_file) == 2
+    assert not (tmp_path / "cache" / "compile").exists()
+
+
+@pytest.mark.parametrize(
+    "args, enabled", [([], True), (["--no-compile-cache"], False)],
+)
+def test_no_compile_cache_option(args, enabled):
+
+    # calm.dsl.cli.main is shadowed by the main command
+    cli_module = importlib.import_module("calm.dsl.cli.main")
+
+    runner = CliRunner()
+    with mock.patch.object(cli_module, "validate_version"), mock.patch.object(
+        cli_module, "set_compile_cache"
+    ) as set_compile_cache:
+        result = runner.invoke(main, args + ["compile", "bp", "--help"])
+
+    assert result.exit_code == 0, result.output
+    assert set_compile_cache.call_args_list == [
+        mock.call(enabled),
+        mock.call(False),
+    ]
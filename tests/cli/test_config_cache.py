@@ -0,0 +1,103 @@
+import os
+from unittest import mock
+
+import pytest
+
+from calm.dsl.config import config as config_module
+from calm.dsl.config import (
+    get_config,
+    get_connection_config,
+    update_config_file_location,
+)
+
+CONFIG_TEMPLATE = """
+[SERVER]
+pc_ip = {pc_ip}
+pc_port = 9440
+pc_username = admin
+pc_password = passwd
+
+[PROJECT]
+name = default
+
+[LOG]
+level = INFO
+
+[CATEGORIES]
+"""
+
+
+@pytest.fixture
+def config_file(tmp_path):
+
+    config_file = str(tmp_path / "config.ini")
+    with open(config_file, "w") as fd:
+        fd.write(CONFIG_TEMPLATE.format(pc_ip="10.0.0.1"))
+
+    update_config_file_location(config_file)
+    yield config_file
+
+    config_module._CONFIG_FILE = None
+    config_module.invalidate_config_cache()
+
+
+def test_config_parsed_once(config_file):
+
+    with mock.patch.object(
+        config_module, "validate_config", wraps=config_module.validate_config
+    ) as validate_config:
+        config = get_config()
+        for _ in range(10):
+            assert get_config() is config
+
+    assert validate_config.call_count == 1
+    assert config["SERVER"]["pc_ip"] == "10.0.0.1"
+    assert dict(config.items("CATEGORIES")) == {}
+
+
+def test_config_is_read_only(config_file):
+
+    config = get_config()
+    with pytest.raises(TypeError):
+        config["SERVER"]["pc_ip"] = "10.0.0.2"
+
+    with pytest.raises(TypeError):
+        config["SERVER"] = {}
+
+
+def test_config_reparsed_on_file_change(config_file):
+
+    assert get_config()["SERVER"]["pc_ip"] == "10.0.0.1"
+
+    with open(config_file, "w") as fd:
+        fd.write(CONFIG_TEMPLATE.format(pc_ip="10.0.0.22"))
+    # Bump mtime explicitly, as file may be rewritten within mtime granularity
+    file_stat = os.stat(config_file)
+    os.utime(config_file, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+
+    assert get_config()["SERVER"]["pc_ip"] == "10.0.0.22"
+
+
+def test_connection_config(config_file):
+
+    assert get_connection_config() == config_module.DEFAULT_CONNECTION_CONFIG
+
+    with open(config_file, "a") as fd:
+        fd.write(
+            "[CONNECTION]\nretries_enabled = false\nretry_status_codes = 503, 504\n"
+        )
+    config_module.invalidate_config_cache()
+
+    connection_config = get_connection_config()
+    assert connection_config["retries_enabled"] is False
+    assert connection_config["retry_status_codes"] == (503, 504)
+    assert connection_config["retries"] == 3
+
+    # Rendered config keeps the connection settings
+    text = config_module._render_config_template(
+        "10.0.0.1", 9440, "admin", "passwd", "default", "INFO", connection_config
+    )
+    with open(config_file, "w") as fd:
+        fd.write(text)
+    config_module.invalidate_config_cache()
+    assert get_connection_config() == connection_config
@@ -0,0 +1,90 @@
+import os
+import sys
+import json
+import time
+import subprocess
+
+import click
+import pytest
+
+from calm.dsl.log import get_logging_handle
+
+LOG = get_logging_handle(__name__)
+
+# Budget(in seconds) for a cold `calm get bps --help`
+STARTUP_BUDGET = float(os.environ.get("CALM_DSL_STARTUP_BUDGET", "1.5"))
+
+CLI_RUNNER = """
+import sys
+import json
+from calm.dsl.cli import main
+
+try:
+    main(sys.argv[1:])
+except SystemExit:
+    pass
+
+modules = ["black", "click_repl", "calm.dsl.builtins", "calm.dsl.cli.bps"]
+print(json.dumps([m for m in modules if m in sys.modules]))
+"""
+
+
+def _run_cli(*args):
+    """runs the cli in a fresh interpreter, returns (time taken, heavy modules loaded)"""
+
+    start = time.time()
+    res = subprocess.run(
+        [sys.executable, "-c", CLI_RUNNER, *args],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+    )
+    return time.time() - start, json.loads(res.stdout.strip().splitlines()[-1])
+
+
+def test_get_apps_help_skips_unrelated_modules():
+
+    _, loaded_modules = _run_cli("get", "apps", "--help")
+    assert loaded_modules == []
+
+
+def test_get_bps_help_startup_budget():
+
+    # Best of three to keep system noise out
+    timings = []
+    for _ in range(3):
+        time_taken, loaded_modules = _run_cli("get", "bps", "--help")
+        timings.append(time_taken)
+
+    LOG.info("Cold `calm get bps --help` took {:.3f}s".format(min(timings)))
+    assert "black" not in loaded_modules
+    if min(timings) > STARTUP_BUDGET:
+        pytest.fail(
+            "`calm get bps --help` took {:.3f}s, budget is {}s".format(
+                min(timings), STARTUP_BUDGET
+            )
+        )
+
+
+def test_lazy_commands_map():
+    """Checks the lazy commands map against the commands registered by modules"""
+
+    from calm.dsl.cli import main, LAZY_COMMANDS, load_all_commands
+
+    load_all_commands()
+
+    registered_cmds = {}
+    for group_name, group in [("main", main), *main.commands.items()]:
+        # Groups defined outside main module are loaded along with their commands
+        if (
+            not isinstance(group, click.Group)
+            or group.callback.__module__ != main.callback.__module__
+        ):
+            continue
+
+        for cmd_name, cmd in group.commands.items():
+            module_name = cmd.callback.__module__.split(".")[-1]
+            if module_name != "main":
+                registered_cmds.setdefault(group_name, {})[cmd_name] = module_name
+
+    assert registered_cmds == LAZY_COMMANDS
@@ -0,0 +1,53 @@
+import configparser
+
+from peewee import SqliteDatabase
+
+from calm.dsl.cli import main  # noqa: F401, avoids circular import of store and db
+from calm.dsl.config.config import _render_init_template, DEFAULT_DB_PROFILE
+from calm.dsl.config.schema import validate_init_config
+from calm.dsl.db.handler import Database
+from calm.dsl.db.table_config import AhvSubnetsCache
+
+
+def test_init_template_with_db_profile():
+
+    db_profile = dict(DEFAULT_DB_PROFILE, busy_timeout=5000)
+    text = _render_init_template(
+        "/tmp/config.ini", "/tmp/dsl.db", "/tmp/.local", db_profile
+    )
+
+    init_config = configparser.ConfigParser()
+    init_config.optionxform = str
+    init_config.read_string(text)
+    assert validate_init_config(init_config)
+    assert init_config["DB"]["location"] == "/tmp/dsl.db"
+    assert init_config["DB"]["busy_timeout"] == "5000"
+    assert init_config["DB"]["journal_mode"] == "wal"
+
+
+def test_migrate_adds_missing_indexes(tmp_path):
+
+    db = SqliteDatabase(str(tmp_path / "dsl.db"))
+    # Table created by older versions, without secondary indexes
+    db.execute_sql(
+        "CREATE TABLE ahvsubnetscache (name VARCHAR(255), uuid VARCHAR(255), "
+        "cluster VARCHAR(255), account_uuid VARCHAR(255), "
+        "last_update_time DATETIME, PRIMARY KEY (name, uuid))"
+    )
+
+    db_handle = Database.__new__(Database)
+    db_handle.db = db
+    with db.bind_ctx([AhvSubnetsCache]):
+        db_handle.migrate(AhvSubnetsCache)
+        # Migrating again is a no-op
+        db_handle.migrate(AhvSubnetsCache)
+
+    index_names = {index.name for index in db.get_indexes("ahvsubnetscache")}
+    expected_indexes = {"ahvsubnetscache_name_account_uuid", "ahvsubnetscache_uuid"}
+    assert expected_indexes <= index_names
+
+    query_plan = db.execute_sql(
+        "EXPLAIN QUERY PLAN SELECT * FROM ahvsubnetscache WHERE uuid = 'x'"
+    ).fetchall()
+    assert "ahvsubnetscache_uuid" in str(query_plan)
+    db.close()
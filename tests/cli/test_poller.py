@@ -0,0 +1,62 @@
+from unittest import mock
+
+from calm.dsl.cli.utils import Poller
+
+
+class FakeClock:
+    """Clock advanced by sleep calls only"""
+
+    def __init__(self):
+        self.now = 0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, delay):
+        self.sleeps.append(delay)
+        self.now += delay
+
+
+def _poll(states, poller, clock):
+
+    responses = iter(states)
+
+    def poll_func():
+        res = mock.MagicMock()
+        res.json.return_value = {"state": next(responses)}
+        return res, None
+
+    def completion_func(response):
+        return (response["state"] == "SUCCESS", response["state"])
+
+    with mock.patch("calm.dsl.cli.utils.time", clock), mock.patch.object(
+        Poller, "JITTER", 0
+    ):
+        return poller.poll(poll_func, completion_func)
+
+
+def test_backoff_resets_on_state_change():
+
+    clock = FakeClock()
+    states = ["PENDING"] * 4 + ["RUNNING"] * 2 + ["SUCCESS"]
+    completed, msg = _poll(states, Poller(interval=2, max_interval=5), clock)
+
+    assert (completed, msg) == (True, "SUCCESS")
+    assert clock.sleeps == [2, 3, 4.5, 5, 2, 3]
+
+
+def test_completes_without_waiting():
+
+    clock = FakeClock()
+    assert _poll(["SUCCESS"], Poller(), clock) == (True, "SUCCESS")
+    assert clock.sleeps == []
+
+
+def test_deadline():
+
+    clock = FakeClock()
+    completed, _ = _poll(["RUNNING"] * 10, Poller(interval=2, timeout=10), clock)
+
+    assert completed is False
+    assert sum(clock.sleeps) == 10
@@ -0,0 +1,81 @@
+import threading
+from unittest import mock
+
+from calm.dsl.cli.runlog import RunlogTree
+
+RUNLOG_UUID = "action-runlog"
+TASK_COUNT = 50
+
+
+class StubRunbookAPI:
+    """Returns output of task runlogs, counting the calls"""
+
+    def __init__(self):
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def runlog_output(self, runlog_uuid, task_runlog_uuid):
+        with self.lock:
+            self.calls.append(task_runlog_uuid)
+
+        res = mock.MagicMock()
+        res.json.return_value = {
+            "status": {"output_list": [{"output": "{}\n".format(task_runlog_uuid)}]}
+        }
+        return res, None
+
+
+def _get_runlog(uuid, task_id, state, update_time, parent_uuid=RUNLOG_UUID):
+
+    return {
+        "metadata": {
+            "uuid": uuid,
+            "creation_time": "1",
+            "last_update_time": str(update_time),
+        },
+        "status": {
+            "type": "task_runlog",
+            "state": state,
+            "task_reference": {"uuid": task_id},
+            "root_reference": {"uuid": RUNLOG_UUID},
+            "parent_reference": {"uuid": parent_uuid},
+        },
+    }
+
+
+def _get_entities(states, update_times):
+
+    return [
+        _get_runlog("trl-{}".format(i), "task-{}".format(i), state, update_time)
+        for i, (state, update_time) in enumerate(zip(states, update_times))
+    ]
+
+
+def test_outputs_fetched_only_for_updated_runlogs():
+
+    client = mock.MagicMock()
+    client.connection.pool_maxsize = 20
+    client.runbook = StubRunbookAPI()
+    task_type_map = {"task-{}".format(i): "EXEC" for i in range(TASK_COUNT)}
+    tree = RunlogTree(RUNLOG_UUID, task_type_map)
+
+    states = ["SUCCESS"] * 40 + ["RUNNING"] * 10
+    update_times = [1] * TASK_COUNT
+    root = tree.update(_get_entities(states, update_times), client)
+    assert len(client.runbook.calls) == TASK_COUNT
+    assert [node.runlog["metadata"]["uuid"] for node in root.children] == [
+        "trl-{}".format(i) for i in range(TASK_COUNT)
+    ]
+
+    # Nothing changed, so no outputs are fetched
+    client.runbook.calls = []
+    root = tree.update(_get_entities(states, update_times), client)
+    assert client.runbook.calls == []
+    assert root.children[45].outputs == ["trl-45\n"]
+
+    # Only running runlogs that got updated are fetched again
+    update_times = [2] * TASK_COUNT
+    update_times[49] = 1
+    root = tree.update(_get_entities(states, update_times), client)
+    assert sorted(client.runbook.calls) == ["trl-{}".format(i) for i in range(40, 49)]
+    assert len(root.children) == TASK_COUNT
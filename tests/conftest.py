@@ -0,0 +1,41 @@
+import threading
+
+import pytest
+
+from tests.stub_server import StubServer
+
+
+@pytest.fixture
+def stub_server():
+    """returns a function starting stub servers, which are stopped on teardown"""
+
+    servers = []
+
+    def start(handler_class, **attrs):
+        server = StubServer(("127.0.0.1", 0), handler_class)
+        for name, value in attrs.items():
+            setattr(server, name, value)
+
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return server
+
+    yield start
+
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def local_files(monkeypatch):
+    """local files (keys, passwords etc.) used by dsl files are not present in
+    test setup, reads of them return placeholder contents"""
+
+    from calm.dsl import builtins, runbooks
+
+    def _read_local_file(filename):
+        return "local-file-{}".format(filename)
+
+    monkeypatch.setattr(builtins, "read_local_file", _read_local_file)
+    monkeypatch.setattr(runbooks, "read_local_file", _read_local_file)
@@ -0,0 +1,40 @@
+import os
+from unittest import mock
+
+from calm.dsl.decompile.render import get_template, render_template
+from calm.dsl.tools import template_cache
+
+
+def test_templates_compiled_once(tmp_path):
+
+    template_cache.get_template_env.cache_clear()
+    with mock.patch.object(
+        template_cache, "get_default_cache_dir", return_value=str(tmp_path)
+    ):
+        assert get_template("var_simple_string.py.jinja2") is get_template(
+            "var_simple_string.py.jinja2"
+        )
+        env = template_cache.get_template_env("calm.dsl.decompile.render", "schemas")
+        with mock.patch.object(env, "_compile", wraps=env._compile) as compile_func:
+            for _ in range(10):
+                render_template(
+                    "task_delay.py.jinja2", {"name": "task", "delay_seconds": 1}
+                )
+
+    assert compile_func.call_count == 1
+    # Compiled templates are persisted across runs
+    assert len(os.listdir(str(tmp_path / template_cache.BYTECODE_CACHE_DIR))) == 2
+
+    # Environment using the persisted bytecode does not compile templates
+    template_cache.get_template_env.cache_clear()
+    with mock.patch.object(
+        template_cache, "get_default_cache_dir", return_value=str(tmp_path)
+    ):
+        env = template_cache.get_template_env("calm.dsl.decompile.render", "schemas")
+        with mock.patch.object(env, "_compile", wraps=env._compile) as compile_func:
+            render_template(
+                "task_delay.py.jinja2", {"name": "task", "delay_seconds": 1}
+            )
+
+    assert compile_func.call_count == 0
+    template_cache.get_template_env.cache_clear()
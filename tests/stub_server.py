@@ -0,0 +1,59 @@
+import gzip
+import json
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from calm.dsl.api.connection import Connection, REQUEST
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local http server standing in for calm server in offline tests"""
+
+    daemon_threads = True
+
+    # Pages are fetched concurrently, over connection pool size connections
+    request_queue_size = 64
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Base request handler of stub servers, having body read/write helpers"""
+
+    protocol_version = "HTTP/1.1"
+
+    def read_body(self):
+        """returns the request body, decompressed if gzipped by client"""
+
+        body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+        if self.headers.get("Content-Encoding") == "gzip":
+            body = gzip.decompress(body)
+        return body
+
+    def read_json(self):
+        body = self.read_body()
+        return json.loads(body) if body else {}
+
+    def respond(self, body, status=200, headers=None):
+        """sends the body, json encoding it if it is not bytes"""
+
+        if not isinstance(body, bytes):
+            body = json.dumps(body).encode("utf-8")
+
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def get_connection(server, **kwargs):
+    """returns connection to stub server"""
+
+    connection = Connection(
+        "127.0.0.1", server.server_port, scheme=REQUEST.SCHEME.HTTP, auth=None, **kwargs
+    )
+    connection.connect()
+    return connection
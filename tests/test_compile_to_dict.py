@@ -0,0 +1,90 @@
+import glob
+import itertools
+import json
+import os
+import uuid
+from unittest import mock
+
+import pytest
+
+from calm.dsl.cli.bps import compile_blueprint
+from calm.dsl.cli.runbooks import compile_runbook
+from calm.dsl.builtins.models.entity import (
+    EntityType,
+    EntityJSONEncoder,
+    _compile_to_dict,
+)
+
+
+def _get_dsl_files():
+
+    dsl_files = []
+    files = glob.glob("examples/**/*.py", recursive=True) + glob.glob(
+        "tests/**/*.py", recursive=True
+    )
+    for dsl_file in sorted(files):
+        file_name = os.path.basename(dsl_file)
+        if file_name.startswith("test_") or file_name in ["__init__.py", "conftest.py"]:
+            continue
+
+        # Templates compiled by provider plugin tests, after writing their spec
+        if file_name.startswith("_test_"):
+            continue
+
+        with open(dsl_file) as fd:
+            src = fd.read()
+
+        if "Blueprint" in src or "runbook" in src:
+            dsl_files.append(dsl_file)
+
+    return dsl_files
+
+
+def _get_json_dict(cls):
+    """compile to dict via json round trip, as done earlier"""
+    return json.loads(json.dumps(cls, cls=EntityJSONEncoder))
+
+
+def _compile(dsl_file):
+
+    # Generated entity names use uuid4, make them same across compilations
+    uuids = (uuid.UUID(int=i) for i in itertools.count())
+    with mock.patch.object(uuid, "uuid4", lambda: next(uuids)):
+        payload = compile_blueprint(dsl_file)
+        if payload is None:
+            payload = compile_runbook(dsl_file)
+
+    return payload
+
+
+@pytest.mark.parametrize("dsl_file", _get_dsl_files())
+def test_compile_to_dict(dsl_file, monkeypatch, local_files):
+
+    # Modules imported by dsl file, ex: utils of runbook tests
+    dsl_dir = os.path.dirname(os.path.abspath(dsl_file))
+    monkeypatch.syspath_prepend(os.path.dirname(dsl_dir))
+    monkeypatch.syspath_prepend(dsl_dir)
+
+    with mock.patch.object(EntityType, "get_dict", _get_json_dict):
+        json_payload = _compile(dsl_file)
+
+    if json_payload is None:
+        pytest.skip("No blueprint or runbook compiled from {}".format(dsl_file))
+
+    payload = _compile(dsl_file)
+    assert payload == json_payload
+    assert json.dumps(payload) == json.dumps(json_payload)
+
+
+def test_compile_to_dict_values():
+
+    data = {
+        "list": (1, 2.5, True, None),
+        1: "int key",
+        None: {False: "bool key", 1.5: "float key"},
+        "nested": [{"a": [()]}],
+    }
+    assert _compile_to_dict(data) == json.loads(json.dumps(data))
+
+    with pytest.raises(TypeError):
+        _compile_to_dict({"set": {1, 2}})